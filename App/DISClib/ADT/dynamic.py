@@ -18,6 +18,59 @@ STRUCT_PGK_PATH: str = "DISClib.DataStructures"
 Ruta relativa del paquete principal para instanciar el ADT List.
 """
 
+# implementations with the trusted mode
+# :param TRUSTED_DSTRUCT_LT
+TRUSTED_DSTRUCT_LT: tuple = (
+    "ArrayList",
+    "SingleLinked",
+    "SeparateChaining",
+)
+"""
+Estructuras de datos que tienen modo confiable ('trusted'), es decir que pueden
+omitir la verificación de tipos y el manejo de errores en *add_last()*,
+*get_element()* y *put()*.
+"""
+
+# global trusted mode of the List() and Map() factories
+_trusted_mode: dict = {"enabled": False}
+
+
+def set_trusted_mode(enabled: bool = True) -> None:
+    """*set_trusted_mode()* enciende o apaga el modo confiable global. Las
+    estructuras de TRUSTED_DSTRUCT_LT que se crean con *List()* o *Map()* sin
+    el argumento 'trusted' usan este modo; las que ya existen no cambian.
+
+    Args:
+        enabled (bool, optional): True para encender el modo confiable. Por
+            defecto es True.
+    """
+    _trusted_mode["enabled"] = bool(enabled)
+
+
+def is_trusted_mode() -> bool:
+    """*is_trusted_mode()* revisa si el modo confiable global está encendido.
+
+    Returns:
+        bool: True si el modo confiable global está encendido.
+    """
+    return _trusted_mode["enabled"]
+
+
+def trusted_kwargs(dstruct: str, kwargs: dict) -> dict:
+    """*trusted_kwargs()* agrega el modo confiable global a los argumentos de
+    una estructura de TRUSTED_DSTRUCT_LT si no lo incluyen.
+
+    Args:
+        dstruct (str): tipo de estructura de datos a instanciar.
+        kwargs (dict): argumentos de la estructura de datos.
+
+    Returns:
+        dict: argumentos con el modo confiable.
+    """
+    if dstruct in TRUSTED_DSTRUCT_LT and "trusted" not in kwargs:
+        kwargs["trusted"] = _trusted_mode["enabled"]
+    return kwargs
+
 
 class DynamicImporter:
     """ **DynamicImporter** permite importar dinámicamente módulos y clases de módulos según la configuración de un archivo JSON y las especificaciones del usuario.
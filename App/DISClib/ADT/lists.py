@@ -13,6 +13,9 @@ import copy
 # node class for the linked list
 from .dynamic import DynamicImporter
 from .dynamic import STRUCT_PGK_PATH
+from .dynamic import set_trusted_mode
+from .dynamic import is_trusted_mode
+from .dynamic import trusted_kwargs
 
 # generic error handling and type checking
 from DISClib.Utils.default import T
@@ -20,6 +23,8 @@ from DISClib.Utils.default import T
 # checking costum modules and functions
 assert DynamicImporter
 assert T
+assert set_trusted_mode
+assert is_trusted_mode
 
 
 # posible implementations for the ADT
@@ -40,6 +45,9 @@ def List(dstruct: str = "ArrayList", **kwargs) -> T:
 
     Args:
         dstruct (str, optional): Tipo de estructura de datos a instanciar. Por defecto es "ArrayList". Puende ser "ArrayList", "SingleLinked" o "DoubleLinked".
+        trusted (bool, optional): modo confiable de la estructura (ver
+            *set_trusted_mode()*), solo para las estructuras de
+            TRUSTED_DSTRUCT_LT. Por defecto es el modo confiable global.
 
     Raises:
         ValueError: error si el tipo de estructura de datos seleccionada no es válida.
@@ -48,6 +56,7 @@ def List(dstruct: str = "ArrayList", **kwargs) -> T:
         T: instancia del ADT List que puede ser "ArrayList", "SingleLinked" o "DoubleLinked".
     """
     try:
+        kwargs = trusted_kwargs(dstruct, kwargs)
         package = f"{STRUCT_PGK_PATH}."
         package += f"{ADT_LT_MOD_DICT.get(dstruct)}"
         adt_list = DynamicImporter(dstruct, package, **kwargs)
@@ -17,11 +17,16 @@ from .dynamic import DynamicImporter
 # generic error handling and type checking
 from DISClib.Utils.default import T
 from .dynamic import STRUCT_PGK_PATH
+from .dynamic import set_trusted_mode
+from .dynamic import is_trusted_mode
+from .dynamic import trusted_kwargs
 
 
 # checking costum modules and functions
 assert DynamicImporter
 assert T
+assert set_trusted_mode
+assert is_trusted_mode
 
 # posible implementations for the ADT
 # :param ADT_HT_MOD_DICT
@@ -39,6 +44,9 @@ def Map(dstruct: str = "SeparateChaining", **kwargs) -> T:
 
     Args:
         dstruct (str, optional): Tipo de estructura de datos a instanciar. Por defecto es "SeparateChaining". Puende ser "SeparateChaining" o "LinearProbing".
+        trusted (bool, optional): modo confiable de la estructura (ver
+            *set_trusted_mode()*), solo para las estructuras de
+            TRUSTED_DSTRUCT_LT. Por defecto es el modo confiable global.
 
     Raises:
         ValueError: error si el tipo de estructura de datos seleccionada no es válida.
@@ -47,6 +55,7 @@ def Map(dstruct: str = "SeparateChaining", **kwargs) -> T:
         T: instancia del ADT Map que puede ser "SeparateChaining" o "LinearProbing".
     """
     try:
+        kwargs = trusted_kwargs(dstruct, kwargs)
         package = f"{STRUCT_PGK_PATH}."
         package += f"{ADT_HT_MOD_DICT.get(dstruct)}"
         adt_list = DynamicImporter(dstruct, package, **kwargs)
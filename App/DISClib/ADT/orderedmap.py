@@ -329,6 +329,22 @@ def values(map, keylo, keyhi):
     return map['datastructure'].values(map, keylo, keyhi)
 
 
+def firstValues(map, number):
+    """
+    Retorna los valores de las number llaves menores, en orden, sin
+    recorrer el resto del arbol
+
+    Args:
+        map: La tabla de simbolos
+        number: El número de valores
+    Returns:
+        Los valores de las number llaves menores
+    Raises:
+        Exception
+    """
+    return map['datastructure'].firstValues(map, number)
+
+
 """
 Selector dinamico de la estructua de datos solicitada
 """
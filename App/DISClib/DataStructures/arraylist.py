@@ -78,6 +78,17 @@ class ArrayList(Generic[T]):
     Nombre de la llave opcional que se utiliza para comparar los elementos del ArrayList, Por defecto es 'None' y el *__post_init__()* configura la llave por defecto la llave 'id' en *DEFAULT_DICT_KEY*.
     """
 
+    # trusted mode skips the type checks and the error handling
+    # :attr: trusted
+    trusted: bool = False
+    """
+    Modo confiable, por defecto es False. Si es True, *add_last()* y
+    *get_element()* no verifican el tipo de dato ni la posición ni procesan los
+    errores con *_handle_error()*, así son más rápidos en ciclos intensivos;
+    quien usa el ArrayList garantiza que los datos y las posiciones son
+    válidos.
+    """
+
     def __post_init__(self) -> None:
         """*__post_init__()* configura los valores por defecto para la llave ('key') y la función de comparación ('cmp_function'). Si el usuario incluye una lista nativa de python como argumento, se agrega a la lista de elementos del ArrayList.
         """
@@ -203,6 +214,11 @@ class ArrayList(Generic[T]):
         Raises:
             Exception: si la operación no se puede realizar, se invoca la función *_handle_error()* para manejar el error.
         """
+        # trusted mode, add the element without checks
+        if self.trusted:
+            self.elements.append(element)
+            self._size += 1
+            return
         try:
             # if the element type is valid, add it to the list
             if self._check_type(element):
@@ -281,6 +297,9 @@ class ArrayList(Generic[T]):
             T: el elemento en la posición dada del ArrayList.
         """
         # TODO change the method name to "get_elm()"?
+        # trusted mode, the position is valid
+        if self.trusted:
+            return self.elements[pos]
         try:
             if self.is_empty():
                 raise IndexError("Empty data structure")
@@ -447,6 +447,31 @@ def values(bst, keylo, keyhi):
         #FIXME Modificar nombre del error para que sea más claro.
         error.reraise(exp, 'BST:Values')
 
+
+def firstValues(bst, number):
+    """
+    Retorna los valores de las number llaves menores del arbol, en
+    orden. El recorrido en orden se detiene al completar number
+    valores, así cuesta O(log n + number) y no O(number log n) como
+    number llamados a select() y get()
+
+    Args:
+        bst: La tabla de simbolos
+        number: El número de valores
+    Returns:
+        Los valores de las number llaves menores
+    Raises:
+        Exception
+    """
+    try:
+        lstvalues = lt.List(dstruct='SingleLinked',
+                            cmp_function=bst['cmpfunction'])
+        lstvalues = firstValuesTree(bst['root'], number, lstvalues)
+        return lstvalues
+    except Exception as exp:
+        error.error_handler('BST', 'firstValues', exp)
+
+
 # _____________________________________________________________________
 #            Funciones Helper
 # _____________________________________________________________________
@@ -913,6 +938,31 @@ def valuesRange(root, keylo, keyhi, lstvalues, cmpfunction):
         #FIXME Modificar nombre del error para que sea más claro.
         error.reraise(exp, 'BST:valuesrange')
 
+
+def firstValuesTree(root, number, lstvalues):
+    """
+    Agrega a lstvalues los valores del subarbol en orden, hasta que
+    la lista tenga number valores
+    Args:
+        root: La raiz del subarbol
+        number: El número de valores
+        lstvalues: La lista de valores
+    Returns:
+        La lista de valores
+    Raises:
+        Exception
+    """
+    try:
+        if (root is not None) and (lstvalues.size() < number):
+            firstValuesTree(root['left'], number, lstvalues)
+            if (lstvalues.size() < number):
+                lstvalues.add_last(root['value'])
+                firstValuesTree(root['right'], number, lstvalues)
+        return lstvalues
+    except Exception as exp:
+        error.error_handler('BST', 'firstValuesTree', exp)
+
+
 #FIXME Documentar de manera correcta
 def defaultfunction(key1, key2):
     if key1 == key2:
@@ -188,6 +188,16 @@ class SeparateChaining(Generic[T]):
     Nombre de la llave opcional que se utiliza para comparar los elementos del SeparateChaining, Por defecto es 'None' y el __post_init__ configura la llave por defecto la llave 'id' en DEFAULT_DICT_KEY.
     """
 
+    # trusted mode skips the checks and the error handling
+    # :attr: trusted
+    trusted: bool = False
+    """
+    Modo confiable, por defecto es False. Si es True, *put()* no verifica el
+    rango del código hash ni procesa los errores con *_handle_error()*, y los
+    'Buckets' y el indice de la tabla de hash también se crean en modo
+    confiable.
+    """
+
     def __post_init__(self) -> None:
         """__post_init__ _summary_
         """
@@ -209,12 +219,13 @@ class SeparateChaining(Generic[T]):
                 self._limit_alpha = self.alpha
 
             # initializing the hash table
-            self.hash_table = ArrayList()
+            self.hash_table = ArrayList(trusted=self.trusted)
             i = 0
             # bulding buckets in the hash table
             while i < self.capacity:
                 bucket = Bucket(cmp_function=self.cmp_function,
-                                key=self.key)
+                                key=self.key,
+                                trusted=self.trusted)
                 self.hash_table.add_last(bucket)
                 i += 1
 
@@ -353,6 +364,10 @@ class SeparateChaining(Generic[T]):
         Raises:
             Exception: _description_
         """
+        # trusted mode, put the entry without checks
+        if self.trusted:
+            self._trusted_put(key, value)
+            return
         try:
             # create a new entry for the element
             new_entry = MapEntry(key, value)
@@ -370,10 +385,10 @@ class SeparateChaining(Generic[T]):
             # checking the bucket
             bucket = self.hash_table.get_element(hkey)
             idx = bucket.find(key)
-            # the entry is not in the bucket, add it and a collision
-            if idx > 0:
+            # the entry is already in the bucket, update it
+            if idx > -1:
                 bucket.change_info(new_entry, idx)
-            # otherwise, update the existing entry
+            # otherwise, add it and count a collision
             else:
                 if not bucket.is_empty():
                     self._collisions += 1
@@ -386,6 +401,41 @@ class SeparateChaining(Generic[T]):
         except Exception as err:
             self._handle_error(err)
 
+    def _trusted_put(self, key: T, value: T) -> None:
+        """*_trusted_put()* función privada que agrega o actualiza una entrada
+        como *put()*, sin verificar el rango del código hash ni procesar los
+        errores. Recorre el 'Bucket' una sola vez con su función de comparación
+        en vez de usar *find()* y *change_info()*. La usa *put()* en modo
+        confiable.
+
+        Args:
+            key (T): llave de la entrada.
+            value (T): valor de la entrada.
+        """
+        new_entry = MapEntry(key, value)
+        hkey = hash_compress(key,
+                             self._scale,
+                             self._shift,
+                             self.prime,
+                             self.capacity)
+        bucket = self.hash_table.get_element(hkey)
+        # look for the key in the bucket
+        cmp_function = bucket.cmp_function
+        node = bucket.first
+        while node is not None and cmp_function(key, node.info) != 0:
+            node = node._next
+        # the entry is already in the bucket, update it
+        if node is not None:
+            node.info = new_entry
+        else:
+            if not bucket.is_empty():
+                self._collisions += 1
+            bucket.add_last(new_entry)
+            self._size += 1
+            self._cur_alpha = self._size / self.capacity
+        if self._cur_alpha >= self._limit_alpha:
+            self.rehash()
+
     def get(self, key: T) -> Optional[T]:
         """get _summary_
 
@@ -445,7 +495,7 @@ class SeparateChaining(Generic[T]):
 
                     idx = bucket.find(key)
                     if idx > -1:
-                        bucket.delete_element(idx)
+                        bucket.remove_element(idx)
                         self._size -= 1
                         self._cur_alpha = self._size / self.capacity
         except Exception as err:
@@ -461,10 +511,8 @@ class SeparateChaining(Generic[T]):
             keys_lt = ArrayList(cmp_function=self.cmp_function,
                                    key=self.key)
             for bucket in self.hash_table:
-                print(bucket)
                 if not bucket.is_empty():
                     for entry in bucket:
-                        print(entry)
                         keys_lt.add_last(entry.get_key())
             return keys_lt
         except Exception as err:
@@ -512,7 +560,8 @@ class SeparateChaining(Generic[T]):
             if self.rehashable:
                 # create a new hash table
                 new_table = ArrayList(cmp_function=self.cmp_function,
-                                      key=self.key)
+                                      key=self.key,
+                                      trusted=self.trusted)
                 # keep the old table
                 old_table = self.hash_table
                 # find the new capacity
@@ -528,7 +577,8 @@ class SeparateChaining(Generic[T]):
                 i = 0
                 while i < new_capacity:
                     bucket = Bucket(cmp_function=self.cmp_function,
-                                    key=self.key)
+                                    key=self.key,
+                                    trusted=self.trusted)
                     new_table.add_last(bucket)
                     i += 1
                 # replace the old table with the new one
@@ -539,11 +589,62 @@ class SeparateChaining(Generic[T]):
                         for entry in bucket:
                             key = entry.get_key()
                             value = entry.get_value()
-                            print(key, value)
                             self.put(key, value)
         except Exception as err:
             self._handle_error(err)
 
+    def __getstate__(self) -> dict:
+        """*__getstate__()* función nativa de Python intervenida para
+        serializar el SeparateChaining con pickle. El código hash de las llaves
+        tipo 'str' cambia entre procesos de Python, por eso se guardan los
+        registros (MapEntry) en una lista nativa y no los 'Buckets' de la tabla
+        de hash.
+
+        Returns:
+            dict: estado del SeparateChaining con los registros en 'iodata'.
+        """
+        state = self.__dict__.copy()
+        state["iodata"] = list(self.entries())
+        state["hash_table"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """*__setstate__()* función nativa de Python intervenida para
+        reconstruir el SeparateChaining a partir del estado creado por
+        *__getstate__()*. Los registros se ubican de nuevo en los 'Buckets' con
+        el código hash del proceso actual, sin crear registros nuevos ni volver
+        a buscar las llaves.
+
+        Args:
+            state (dict): estado del SeparateChaining con los registros en
+                'iodata'.
+        """
+        try:
+            self.__dict__.update(state)
+            entries = self.iodata
+            self.iodata = None
+            self._collisions = 0
+            self.hash_table = ArrayList(trusted=self.trusted)
+            i = 0
+            while i < self.capacity:
+                bucket = Bucket(cmp_function=self.cmp_function,
+                                key=self.key,
+                                trusted=self.trusted)
+                self.hash_table.add_last(bucket)
+                i += 1
+            for entry in entries:
+                hkey = hash_compress(entry.get_key(),
+                                     self._scale,
+                                     self._shift,
+                                     self.prime,
+                                     self.capacity)
+                bucket = self.hash_table.get_element(hkey)
+                if not bucket.is_empty():
+                    self._collisions += 1
+                bucket.add_last(entry)
+        except Exception as err:
+            self._handle_error(err)
+
 # GENERAL
 #FIXME Cambiar todas las funciones y variables al formato snake_case
 #TODO Explicar más a profundidad que tipo de excepciones y errores puede generar cada función
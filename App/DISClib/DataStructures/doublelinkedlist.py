@@ -706,3 +706,39 @@ class DoubleLinked(Generic[T]):
             int: tamaño del DoubleLinked.
         """
         return self.size()
+
+    def __getstate__(self) -> dict:
+        """*__getstate__()* función nativa de Python intervenida para
+        serializar el DoubleLinked con pickle. Los elementos se guardan en una
+        lista nativa de Python en vez de la cadena de nodos, así pickle no
+        recorre los nodos de forma recursiva y no excede el límite de recursión
+        con listas grandes.
+
+        Returns:
+            dict: estado del DoubleLinked con los elementos en 'iodata'.
+        """
+        state = self.__dict__.copy()
+        state["iodata"] = list(self)
+        state["_header"] = None
+        state["_trailer"] = None
+        state["_size"] = -1
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """*__setstate__()* función nativa de Python intervenida para
+        reconstruir el DoubleLinked a partir del estado creado por
+        *__getstate__()*.
+
+        Args:
+            state (dict): estado del DoubleLinked con los elementos en
+                'iodata'.
+        """
+        self.__dict__.update(state)
+        self._header = DoubleNode()
+        self._trailer = DoubleNode()
+        self._header._next = self._trailer
+        self._trailer._prev = self._header
+        iodata = self.iodata
+        self.iodata = None
+        for elm in iodata:
+            self.add_last(elm)
@@ -25,8 +25,8 @@
  """
 
 # import config
-from DISClib.ADT import lists as lt
-from DISClib.Utils import error as error
+from DISClib.ADT.lists import List
+from DISClib.Utils.error import error_handler
 # assert config
 
 """
@@ -57,11 +57,12 @@ def newHeap(cmpfunction):
                 'cmpfunction': cmpfunction
                 }
 
-        heap['elements'] = lt.newList(datastructure='ARRAY_LIST',
-                                      cmpfunction=cmpfunction)
+        # el elemento de la posición pos del heap está en pos - 1
+        heap['elements'] = List(dstruct='ArrayList',
+                                cmp_function=cmpfunction)
         return heap
     except Exception as exp:
-        error.reraise(exp, 'newHeap')
+        error_handler("heap", "newHeap", exp)
 
 
 def size(heap):
@@ -78,7 +79,7 @@ def size(heap):
     try:
         return (heap['size'])
     except Exception as exp:
-        error.reraise(exp, 'heap:size')
+        error_handler("heap", "size", exp)
 
 
 def isEmpty(heap):
@@ -95,7 +96,7 @@ def isEmpty(heap):
     try:
         return (heap['size'] == 0)
     except Exception as exp:
-        error.reraise(exp, 'heap:isEmpty')
+        error_handler("heap", "isEmpty", exp)
 
 
 def min(heap):
@@ -111,10 +112,10 @@ def min(heap):
     """
     try:
         if (heap['size'] > 0):
-            return lt.getElement(heap['elements'], 1)
+            return heap['elements'].get_element(0)
         return None
     except Exception as exp:
-        error.reraise(exp, 'heap:min')
+        error_handler("heap", "min", exp)
 
 
 def insert(heap, element):
@@ -132,11 +133,11 @@ def insert(heap, element):
     """
     try:
         heap['size'] += 1
-        lt.insertElement(heap['elements'], element, heap['size'])
+        heap['elements'].add_last(element)
         swim(heap, heap['size'])
         return heap
     except Exception as exp:
-        error.reraise(exp, 'heap:insert')
+        error_handler("heap", "insert", exp)
 
 
 def delMin(heap):
@@ -154,16 +155,16 @@ def delMin(heap):
     """
     try:
         if (heap['size'] > 0):
-            min = lt.getElement(heap['elements'], 1)
-            last = lt.getElement(heap['elements'], heap['size'])
-            lt.changeInfo(heap['elements'], 1, last)
-            lt.changeInfo(heap['elements'], heap['size'], None)
+            min = heap['elements'].get_element(0)
+            last = heap['elements'].remove_last()
             heap['size'] -= 1
-            sink(heap, 1)
+            if (heap['size'] > 0):
+                heap['elements'].change_info(last, 0)
+                sink(heap, 1)
             return min
         return None
     except Exception as exp:
-        error.reraise(exp, 'heap:delMin')
+        error_handler("heap", "delMin", exp)
 
 
 # _____________________________________________________________________________
@@ -187,13 +188,13 @@ def swim(heap, pos):
     """
     try:
         while (pos > 1):
-            parent = lt.getElement(heap['elements'], int((pos/2)))
-            element = lt.getElement(heap['elements'], int(pos))
+            parent = heap['elements'].get_element(pos//2 - 1)
+            element = heap['elements'].get_element(pos - 1)
             if greater(heap, parent, element):
-                exchange(heap, pos, int(pos/2))
+                exchange(heap, pos, pos//2)
             pos = pos//2
     except Exception as exp:
-        error.reraise(exp, 'heap:swim')
+        error_handler("heap", "swim", exp)
 
 
 def sink(heap, pos):
@@ -214,16 +215,16 @@ def sink(heap, pos):
         while ((2*pos <= size)):
             j = 2*pos
             if (j < size):
-                if greater(heap, lt.getElement(heap['elements'], j),
-                           lt.getElement(heap['elements'], (j+1))):
+                if greater(heap, heap['elements'].get_element(j - 1),
+                           heap['elements'].get_element(j)):
                     j += 1
-            if (not greater(heap, lt.getElement(heap['elements'], pos),
-                            lt.getElement(heap['elements'], j))):
+            if (not greater(heap, heap['elements'].get_element(pos - 1),
+                            heap['elements'].get_element(j - 1))):
                 break
             exchange(heap, pos, j)
             pos = j
     except Exception as exp:
-        error.reraise(exp, 'heap:sink')
+        error_handler("heap", "sink", exp)
 
 
 def greater(heap, element1, element2):
@@ -236,7 +237,7 @@ def greater(heap, element1, element2):
             return True
         return False
     except Exception as exp:
-        error.reraise(exp, 'heap:greater')
+        error_handler("heap", "greater", exp)
 
 
 def exchange(heap, posa, posb):
@@ -244,6 +245,6 @@ def exchange(heap, posa, posb):
     Intercambia los elementos en las posiciones posa y posb del heap
     """
     try:
-        lt.exchange(heap['elements'], posa, posb)
+        heap['elements'].exchange(posa - 1, posb - 1)
     except Exception as exp:
-        error.reraise(exp, 'heap:exchange')
+        error_handler("heap", "exchange", exp)
@@ -22,13 +22,9 @@
  """
 
 # TODO crear consistencia en para importar modulos
-# from DISClib.ADT import maps as map
-# from DISClib.ADT import lists as lt
-# from DISClib.Utils import error as error
-import DISClib.ADT.maps as map
-# from DISClib.ADT.maps import Map as map
-from DISClib.ADT.lists import List as lt
-from DISClib.Utils import error as error
+from DISClib.ADT.maps import Map
+from DISClib.ADT.lists import List
+from DISClib.Utils.error import error_handler
 
 
 
@@ -58,19 +54,15 @@ def newIndexHeap(cmpfunction):
                      'qpMap': None,
                      'size': 0,
                      'cmpfunction': cmpfunction}
-        # FIXME ajustar comportamiento segun actualizaciones del ADT List
         # TODO dejar variables por defecto como constantes del modulo
-        indexheap['elements'] = lt.newList(datastructure='ARRAY_LIST',
-                                           cmpfunction=cmpfunction)
-        # FIXME ajustar comportamiento segun actualizaciones del ADT map
-        indexheap['qpMap'] = map.newMap(
-                                        maptype='PROBING',
-                                        cmpfunction=cmpfunction
-                                        )
+        # el elemento de la posición pos del heap está en pos - 1
+        indexheap['elements'] = List(dstruct='ArrayList',
+                                     cmp_function=cmpfunction)
+        # llave -> posición de la llave en el heap
+        indexheap['qpMap'] = Map(dstruct='SeparateChaining')
         return indexheap
     except Exception as exp:
-        # FIXME ajustar mensaje segun actualizaciones del modulo error
-        error.reraise(exp, 'indexheap:newindexheap')
+        error_handler("indexheap", "newindexheap", exp)
 
 
 def insert(iheap, key, index):
@@ -86,17 +78,15 @@ def insert(iheap, key, index):
     """
     # TODO revisar si es necesario el return
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
-        if not map.contains(iheap['qpMap'], key):
+        if not iheap['qpMap'].contains(key):
             iheap['size'] += 1
-            lt.insertElement(iheap['elements'], {'key': key, 'index': index},
-                             iheap['size'])
-            map.put(iheap['qpMap'], key, iheap['size'])
+            iheap['elements'].add_last({'key': key, 'index': index})
+            iheap['qpMap'].put(key, iheap['size'])
             swim(iheap, iheap['size'])
         return iheap
     except Exception as exp:
-        error.reraise(exp, 'indexheap:newindexheap')
+        error_handler("indexheap", "insert", exp)
 
 
 def isEmpty(iheap):
@@ -111,11 +101,10 @@ def isEmpty(iheap):
         Exception
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
         return iheap['size'] == 0
     except Exception as exp:
-        error.reraise(exp, 'indexheap:isEmpty')
+        error_handler("indexheap", "isEmpty", exp)
 
 
 def size(iheap):
@@ -130,11 +119,10 @@ def size(iheap):
         Exception
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
         return iheap['size']
     except Exception as exp:
-        error.reraise(exp, 'indexheap:size')
+        error_handler("indexheap", "size", exp)
 
 
 def contains(iheap, key):
@@ -149,11 +137,10 @@ def contains(iheap, key):
         Exception
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
-        return map.contains(iheap['qpMap'], key)
+        return iheap['qpMap'].contains(key)
     except Exception as exp:
-        error.reraise(exp, 'indexheap:contains')
+        error_handler("indexheap", "contains", exp)
 
 
 def min(iheap):
@@ -168,14 +155,13 @@ def min(iheap):
         Exception
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
         if(iheap['size'] > 0):
-            minIdx = lt.getElement(iheap['elements'], 1)
+            minIdx = iheap['elements'].get_element(0)
             return minIdx['key']
         return None
     except Exception as exp:
-        error.reraise(exp, 'indexheap:min')
+        error_handler("indexheap", "min", exp)
 
 
 def delMin(iheap):
@@ -192,18 +178,18 @@ def delMin(iheap):
     """
     # TODO revisar si es necesario el return
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
         if (iheap['size'] > 0):
-            minIdx = lt.getElement(iheap['elements'], 1)
+            minIdx = iheap['elements'].get_element(0)
             exchange(iheap, 1, iheap['size'])
+            iheap['elements'].remove_last()
             iheap['size'] -= 1
             sink(iheap, 1)
-            map.remove(iheap['qpMap'], minIdx['key'])
+            iheap['qpMap'].remove(minIdx['key'])
             return minIdx['key']
         return None
     except Exception as exp:
-        error.reraise(exp, 'indexheap:delMin')
+        error_handler("indexheap", "delMin", exp)
 
 
 def decreaseKey(iheap, key, newindex):
@@ -220,16 +206,15 @@ def decreaseKey(iheap, key, newindex):
         Exception
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
-        val = map.get(iheap['qpMap'], key)
-        elem = lt.getElement(iheap['elements'], val['value'])
+        pos = iheap['qpMap'].get(key).get_value()
+        elem = iheap['elements'].get_element(pos - 1)
         elem['index'] = newindex
-        lt.changeInfo(iheap['elements'], val['value'], elem)
-        swim(iheap, val['value'])
+        iheap['elements'].change_info(elem, pos - 1)
+        swim(iheap, pos)
         return iheap
     except Exception as exp:
-        error.reraise(exp, 'indexheap:decreaseKey')
+        error_handler("indexheap", "decreaseKey", exp)
 
 
 def increaseKey(iheap, key, newindex):
@@ -246,16 +231,15 @@ def increaseKey(iheap, key, newindex):
         Exception
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
-        val = map.get(iheap['qpMap'], key)
-        elem = lt.getElement(iheap['elements'], val['value'])
+        pos = iheap['qpMap'].get(key).get_value()
+        elem = iheap['elements'].get_element(pos - 1)
         elem['index'] = newindex
-        lt.changeInfo(iheap['elements'], val['value'], elem)
-        sink(iheap, val['value'])
+        iheap['elements'].change_info(elem, pos - 1)
+        sink(iheap, pos)
         return iheap
     except Exception as exp:
-        error.reraise(exp, 'indexheap:increaseKey')
+        error_handler("indexheap", "increaseKey", exp)
 
 
 #  ---------------------------------------------------------
@@ -268,16 +252,15 @@ def exchange(iheap, i, j):
     Intercambia los elementos en las posiciones i y j del heap
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
-        element_i = lt.getElement(iheap['elements'], i)
-        element_j = lt.getElement(iheap['elements'], j)
-        lt.changeInfo(iheap['elements'], i, element_j)
-        map.put(iheap['qpMap'], element_i['key'], j)
-        lt.changeInfo(iheap['elements'], j, element_i)
-        map.put(iheap['qpMap'], element_j['key'], i)
+        element_i = iheap['elements'].get_element(i - 1)
+        element_j = iheap['elements'].get_element(j - 1)
+        iheap['elements'].change_info(element_j, i - 1)
+        iheap['qpMap'].put(element_i['key'], j)
+        iheap['elements'].change_info(element_i, j - 1)
+        iheap['qpMap'].put(element_j['key'], i)
     except Exception as exp:
-        error.reraise(exp, 'indexheap:exchange')
+        error_handler("indexheap", "exchange", exp)
 
 
 def greater(iheap, parent, element):
@@ -286,11 +269,10 @@ def greater(iheap, parent, element):
     que index de element
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
         return parent['index'] > element['index']
     except Exception as exp:
-        error.reraise(exp, 'indexheap:greater')
+        error_handler("indexheap", "greater", exp)
 
 
 def swim(iheap, pos):
@@ -308,18 +290,17 @@ def swim(iheap, pos):
         Exception
     """
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
         while (pos > 1):
             posparent = int((pos/2))
             poselement = int(pos)
-            parent = lt.getElement(iheap['elements'], posparent)
-            element = lt.getElement(iheap['elements'], poselement)
+            parent = iheap['elements'].get_element(posparent - 1)
+            element = iheap['elements'].get_element(poselement - 1)
             if greater(iheap, parent, element):
                 exchange(iheap, posparent, poselement)
             pos = (pos//2)
     except Exception as exp:
-        error.reraise(exp, 'indexheap:swim')
+        error_handler("indexheap", "swim", exp)
 
 
 def sink(iheap, pos):
@@ -337,19 +318,18 @@ def sink(iheap, pos):
     """
     # FIXME revisar si es necesario el break
     # TODO agregar tipos de datos para input y output
-    # FIXME ajustar mensaje segun actualizaciones del modulo error
     try:
         size = iheap['size']
         while ((2*pos <= size)):
             j = 2*pos
             if (j < size):
-                if greater(iheap, lt.getElement(iheap['elements'], j),
-                           lt.getElement(iheap['elements'], (j+1))):
+                if greater(iheap, iheap['elements'].get_element(j - 1),
+                           iheap['elements'].get_element(j)):
                     j += 1
-            if (not greater(iheap, lt.getElement(iheap['elements'], pos),
-                            lt.getElement(iheap['elements'], j))):
+            if (not greater(iheap, iheap['elements'].get_element(pos - 1),
+                            iheap['elements'].get_element(j - 1))):
                 break
             exchange(iheap, pos, j)
             pos = j
     except Exception as exp:
-        error.reraise(exp, 'indexheap:sink')
+        error_handler("indexheap", "sink", exp)
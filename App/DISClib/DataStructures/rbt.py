@@ -217,7 +217,8 @@ def keySet(rbt):
         Exception
     """
     try:
-        klist = lt.newList('SINGLE_LINKED', rbt['cmpfunction'])
+        klist = lt.List(dstruct='SingleLinked',
+                        cmp_function=rbt['cmpfunction'])
         klist = keySetTree(rbt['root'], klist)
         return klist
     except Exception as exp:
@@ -237,7 +238,8 @@ def valueSet(rbt):
         Exception
     """
     try:
-        vlist = lt.newList('SINGLE_LINKED', rbt['cmpfunction'])
+        vlist = lt.List(dstruct='SingleLinked',
+                        cmp_function=rbt['cmpfunction'])
         vlist = valueSetTree(rbt['root'], vlist)
         return vlist
     except Exception as exp:
@@ -454,7 +456,8 @@ def keys(rbt, keylo, keyhi):
         Exception
     """
     try:
-        lstkeys = lt.newList('SINGLE_LINKED', rbt['cmpfunction'])
+        lstkeys = lt.List(dstruct='SingleLinked',
+                          cmp_function=rbt['cmpfunction'])
         lstkeys = keysRange(rbt['root'], keylo, keyhi, lstkeys,
                             rbt['cmpfunction'])
         return lstkeys
@@ -480,7 +483,8 @@ def values(rbt, keylo, keyhi):
         Exception
     """
     try:
-        lstvalues = lt.newList('SINGLE_LINKED', rbt['cmpfunction'])
+        lstvalues = lt.List(dstruct='SingleLinked',
+                            cmp_function=rbt['cmpfunction'])
         lstvalues = valuesRange(rbt['root'], keylo, keyhi, lstvalues,
                                 rbt['cmpfunction'])
         return lstvalues
@@ -489,6 +493,30 @@ def values(rbt, keylo, keyhi):
         error.reraise(exp, 'RBT:Values')
 
 
+def firstValues(rbt, number):
+    """
+    Retorna los valores de las number llaves menores del arbol, en
+    orden. El recorrido en orden se detiene al completar number
+    valores, así cuesta O(log n + number) y no O(number log n) como
+    number llamados a select() y get()
+
+    Args:
+        rbt: La tabla de simbolos
+        number: El número de valores
+    Returns:
+        Los valores de las number llaves menores
+    Raises:
+        Exception
+    """
+    try:
+        lstvalues = lt.List(dstruct='SingleLinked',
+                            cmp_function=rbt['cmpfunction'])
+        lstvalues = firstValuesTree(rbt['root'], number, lstvalues)
+        return lstvalues
+    except Exception as exp:
+        error.error_handler('RBT', 'firstValues', exp)
+
+
 # _____________________________________________________________________________
 #       Funciones Helper
 # _____________________________________________________________________________
@@ -508,7 +536,7 @@ def valueSetTree(root, klist):
     try:
         if (root is not None):
             valueSetTree(root['left'], klist)
-            lt.addLast(klist, root['value'])
+            klist.add_last(root['value'])
             valueSetTree(root['right'], klist)
         return klist
     except Exception as exp:
@@ -530,7 +558,7 @@ def keySetTree(root, klist):
     try:
         if (root is not None):
             keySetTree(root['left'], klist)
-            lt.addLast(klist, root['key'])
+            klist.add_last(root['key'])
             keySetTree(root['right'], klist)
         return klist
     except Exception as exp:
@@ -931,7 +959,7 @@ def keysRange(root, keylo, keyhi, lstkeys, cmpfunction):
             if (complo < 0):
                 keysRange(root['left'], keylo, keyhi, lstkeys, cmpfunction)
             if ((complo <= 0) and (comphi >= 0)):
-                lt.addLast(lstkeys, root['key'])
+                lstkeys.add_last(root['key'])
             if (comphi > 0):
                 keysRange(root['right'], keylo, keyhi, lstkeys, cmpfunction)
         return lstkeys
@@ -965,7 +993,7 @@ def valuesRange(root, keylo, keyhi, lstvalues, cmpfunction):
                 valuesRange(root['left'], keylo, keyhi, lstvalues,
                             cmpfunction)
             if ((complo <= 0) and (comphi >= 0)):
-                lt.addLast(lstvalues, root['value'])
+                lstvalues.add_last(root['value'])
             if (comphi > 0):
                 valuesRange(root['right'], keylo, keyhi, lstvalues,
                             cmpfunction)
@@ -975,6 +1003,30 @@ def valuesRange(root, keylo, keyhi, lstvalues, cmpfunction):
         error.reraise(exp, 'BST:valuesrange')
 
 
+def firstValuesTree(root, number, lstvalues):
+    """
+    Agrega a lstvalues los valores del subarbol en orden, hasta que
+    la lista tenga number valores
+    Args:
+        root: La raiz del subarbol
+        number: El número de valores
+        lstvalues: La lista de valores
+    Returns:
+        La lista de valores
+    Raises:
+        Exception
+    """
+    try:
+        if (root is not None) and (lstvalues.size() < number):
+            firstValuesTree(root['left'], number, lstvalues)
+            if (lstvalues.size() < number):
+                lstvalues.add_last(root['value'])
+                firstValuesTree(root['right'], number, lstvalues)
+        return lstvalues
+    except Exception as exp:
+        error.error_handler('RBT', 'firstValuesTree', exp)
+
+
 # FIXME Modificar documentación de retorno
 def selectKey(root, key):
     """
@@ -1123,7 +1175,7 @@ def balance(root):
             root = rotateRight(root)
 
         if (isRed(root['left']) and isRed(root['right'])):
-            flipNodeColor(root)
+            flipColors(root)
 
         lsize = sizeTree(root['left'])
         rsize = sizeTree(root['right'])
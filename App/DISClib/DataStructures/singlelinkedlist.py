@@ -86,6 +86,17 @@ class SingleLinked(Generic[T]):
     Nombre de la llave opcional que se utiliza para comparar los elementos del ArrayList, Por defecto es None y el *__post_init__()* configura la llave por defecto la llave 'id' en *DEFAULT_DICT_KEY*.
     """
 
+    # trusted mode skips the type checks and the error handling
+    # :attr: trusted
+    trusted: bool = False
+    """
+    Modo confiable, por defecto es False. Si es True, *add_last()* y
+    *get_element()* no verifican el tipo de dato ni la posición ni procesan los
+    errores con *_handle_error()*, así son más rápidos en ciclos intensivos;
+    quien usa el SingleLinked garantiza que los datos y las posiciones son
+    válidos.
+    """
+
     def __post_init__(self) -> None:
         """*__post_init__()* configura los valores por defecto para la llave ('key') y la función de comparación ('cmp_function'). Si el usuario incluye una lista nativa de python como argumento, se agrega a la lista de elementos del SingleLinked.
         """
@@ -221,6 +232,16 @@ class SingleLinked(Generic[T]):
         Raises:
             Exception: si la operación no se puede realizar, se invoca la función *_handle_error()* para manejar el error.
         """
+        # trusted mode, add the element without checks
+        if self.trusted:
+            new_node = SingleNode(element)
+            if self._size == 0:
+                self.first = new_node
+            else:
+                self.last._next = new_node
+            self.last = new_node
+            self._size += 1
+            return
         try:
             # if the element type is valid, add it to the list
             if self._check_type(element):
@@ -334,6 +355,12 @@ class SingleLinked(Generic[T]):
              Optional[T]: el elemento en la posición dada del SingleLinked.
         """
         # TODO change the method name to "get_elm()"?
+        # trusted mode, the position is valid
+        if self.trusted:
+            current = self.first
+            for _ in range(pos):
+                current = current._next
+            return current.info
         try:
             info = None
             if self.is_empty():
@@ -435,6 +462,8 @@ class SingleLinked(Generic[T]):
             if pos == 0:
                 info = self.first.get_info()
                 self.first = self.first.next()
+                if self.first is None:
+                    self.last = None
             elif pos >= 1:
                 # TODO check algorithm with "while i != pos:"
                 while i != pos:
@@ -442,6 +471,9 @@ class SingleLinked(Generic[T]):
                     current = current.next()
                     i += 1
                 prev._next = current.next()
+                # the removed node was the last one, move the tail back
+                if current is self.last:
+                    self.last = prev
                 info = current.get_info()
             self._size -= 1
             return info
@@ -649,3 +681,35 @@ class SingleLinked(Generic[T]):
             int: tamaño del SingleLinked.
         """
         return self.size()
+
+    def __getstate__(self) -> dict:
+        """*__getstate__()* función nativa de Python intervenida para
+        serializar el SingleLinked con pickle. Los elementos se guardan en una
+        lista nativa de Python en vez de la cadena de nodos, así pickle no
+        recorre los nodos de forma recursiva y no excede el límite de recursión
+        con listas grandes.
+
+        Returns:
+            dict: estado del SingleLinked con los elementos en 'iodata'.
+        """
+        state = self.__dict__.copy()
+        state["iodata"] = list(self)
+        state["first"] = None
+        state["last"] = None
+        state["_size"] = 0
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """*__setstate__()* función nativa de Python intervenida para
+        reconstruir el SingleLinked a partir del estado creado por
+        *__getstate__()*.
+
+        Args:
+            state (dict): estado del SingleLinked con los elementos en
+                'iodata'.
+        """
+        self.__dict__.update(state)
+        iodata = self.iodata
+        self.iodata = None
+        for elm in iodata:
+            self.add_last(elm)
@@ -0,0 +1,229 @@
+"""
+Módulo para medir la memoria que ocupan las estructuras de datos de *DISClib* y
+los catálogos que las usan. Recorre todos los objetos alcanzables desde una
+estructura (nodos, MapEntry, buckets, listas, diccionarios de registros,
+arreglos y sus valores) y suma su tamaño con *sys.getsizeof()*, contando cada
+objeto una sola vez aunque esté referenciado desde varios lugares.
+
+El diccionario de atributos de un objeto (nodos y clases de *DISClib*) se suma
+al tamaño del objeto. Las funciones, clases y módulos (p.ej. la función de
+comparación o el módulo de un RBT) son compartidos y no se cuentan.
+
+Uso:
+    >>> from DISClib.Utils import footprint
+    >>> footprint.footprint(structure)["bytes"]
+    >>> print(footprint.format_footprints(footprint.footprints(catalog)))
+"""
+
+# native python modules
+# import sys for the size of each object
+import sys
+# import types for the shared objects that are not counted
+import types
+
+# containers whose items are walked
+_ITEM_CONTAINERS: tuple = (list, tuple, set, frozenset)
+
+# leaf objects, their size includes all their data
+_LEAF_TYPES: tuple = (str, bytes, bytearray, int, float, complex, bool,
+                      type(None), memoryview, range)
+
+
+def _is_shared(obj) -> bool:
+    """*_is_shared()* función privada que revisa si un objeto es compartido
+    (funciones, clases, módulos o las funciones de comparación envueltas por la
+    instrumentación) y no se cuenta.
+
+    Args:
+        obj (any): objeto a revisar.
+
+    Returns:
+        bool: True si el objeto no se cuenta.
+    """
+    return isinstance(obj, types.ModuleType) or callable(obj)
+
+
+def _referents(obj, seen: set) -> tuple:
+    """*_referents()* función privada que retorna el tamaño propio de un objeto
+    y los objetos que referencia. El diccionario de atributos del objeto se
+    suma a su tamaño y se marca como visto.
+
+    Args:
+        obj (any): objeto a medir.
+        seen (set): identificadores de los objetos ya contados.
+
+    Returns:
+        tuple: tamaño en bytes y lista de objetos referenciados.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _LEAF_TYPES):
+        return size, []
+    if isinstance(obj, dict):
+        return size, list(obj.keys()) + list(obj.values())
+    if isinstance(obj, _ITEM_CONTAINERS):
+        return size, list(obj)
+    children = []
+    attrs = getattr(obj, "__dict__", None)
+    if isinstance(attrs, dict) and id(attrs) not in seen:
+        seen.add(id(attrs))
+        size += sys.getsizeof(attrs)
+        # attribute names are interned, only the values are walked
+        children.extend(attrs.values())
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ("__dict__", "__weakref__") and \
+                    hasattr(obj, name):
+                children.append(getattr(obj, name))
+    return size, children
+
+
+def deep_sizeof(obj, seen: set = None, types_stats: dict = None) -> int:
+    """*deep_sizeof()* retorna el tamaño en bytes de un objeto y de todos los
+    objetos alcanzables desde él que no están en *seen*. El recorrido es
+    iterativo, así no falla con listas encadenadas o árboles muy profundos.
+
+    Args:
+        obj (any): objeto a medir.
+        seen (set, optional): identificadores de los objetos ya contados, se
+            actualiza con los objetos recorridos. Sirve para medir varias
+            estructuras sin contar dos veces lo que comparten. Por defecto es
+            un conjunto vacío.
+        types_stats (dict, optional): si se entrega, se llena con el número de
+            objetos y los bytes por nombre de tipo. Por defecto es None.
+
+    Returns:
+        int: tamaño en bytes.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or _is_shared(current):
+            continue
+        seen.add(id(current))
+        size, children = _referents(current, seen)
+        total += size
+        if types_stats is not None:
+            stats = types_stats.setdefault(type(current).__name__,
+                                           {"count": 0, "bytes": 0})
+            stats["count"] += 1
+            stats["bytes"] += size
+        stack.extend(children)
+    return total
+
+
+def _is_ordered_map(structure) -> bool:
+    """*_is_ordered_map()* función privada que revisa si una estructura es un
+    mapa ordenado funcional de *DISClib* (RBT o BST).
+
+    Args:
+        structure (any): estructura a revisar.
+
+    Returns:
+        bool: True si es un mapa ordenado.
+    """
+    return isinstance(structure, dict) and "root" in structure and \
+        "cmpfunction" in structure
+
+
+def elements(structure) -> int:
+    """*elements()* retorna el número de elementos de una estructura: *size()*
+    en las clases de *DISClib* y el almacén de libros, el tamaño de la raíz en
+    los mapas ordenados (RBT y BST) y *len()* en los demás contenedores.
+
+    Args:
+        structure (any): estructura a contar.
+
+    Returns:
+        int: número de elementos, o None si el objeto no es un contenedor.
+    """
+    if callable(getattr(structure, "size", None)):
+        return structure.size()
+    if _is_ordered_map(structure):
+        root = structure["root"]
+        return root["size"] if root is not None else 0
+    if hasattr(structure, "__len__") and not isinstance(structure, str):
+        return len(structure)
+    return None
+
+
+def footprint(structure, seen: set = None) -> dict:
+    """*footprint()* mide la memoria de una estructura.
+
+    Args:
+        structure (any): estructura de *DISClib* o cualquier objeto de python.
+        seen (set, optional): identificadores de los objetos ya contados (ver
+            *deep_sizeof()*). Por defecto es un conjunto vacío.
+
+    Returns:
+        dict: tipo de la estructura ("structure"), bytes totales ("bytes"),
+            número de elementos ("elements"), bytes por elemento
+            ("bytes_per_element", None si no tiene elementos) y número de
+            objetos y bytes por tipo ("types").
+    """
+    types_stats = {}
+    size = deep_sizeof(structure, seen, types_stats)
+    count = elements(structure)
+    label = type(structure).__name__
+    if _is_ordered_map(structure):
+        label = structure.get("type") or label
+    result = {
+        "structure": label,
+        "bytes": size,
+        "elements": count,
+        "bytes_per_element": size / count if count else None,
+        "types": dict(sorted(types_stats.items(),
+                             key=lambda item: -item[1]["bytes"])),
+    }
+    return result
+
+
+def footprints(structures: dict) -> dict:
+    """*footprints()* mide la memoria de cada estructura de un diccionario
+    (p.ej. un catálogo), en orden. Los objetos compartidos se cuentan una sola
+    vez, en la primera estructura que los alcanza.
+
+    Args:
+        structures (dict): nombre -> estructura.
+
+    Returns:
+        dict: nombre -> resultado de *footprint()*.
+    """
+    seen = {id(structures)}
+    return {name: footprint(structure, seen)
+            for name, structure in structures.items()}
+
+
+def format_footprints(results: dict, types_number: int = 3) -> str:
+    """*format_footprints()* retorna el resultado de *footprints()* como una
+    tabla de texto, con los tipos que más ocupan en cada estructura y el total
+    al final.
+
+    Args:
+        results (dict): nombre -> resultado de *footprint()*.
+        types_number (int, optional): número de tipos por estructura. Por
+            defecto es 3.
+
+    Returns:
+        str: tabla de la memoria.
+    """
+    lines = ["{:<24} {:<18} {:>10} {:>12} {:>10}  {}".format(
+        "name", "structure", "elements", "bytes", "B/elem", "top types")]
+    for name, result in results.items():
+        count = result["elements"]
+        per_element = result["bytes_per_element"]
+        top = ", ".join(f"{label} {stats['count']}x {stats['bytes']}B"
+                        for label, stats in
+                        list(result["types"].items())[:types_number])
+        lines.append("{:<24} {:<18} {:>10} {:>12} {:>10}  {}".format(
+            name, result["structure"], "-" if count is None else count,
+            result["bytes"],
+            "-" if per_element is None else f"{per_element:.1f}", top))
+    total = sum(result["bytes"] for result in results.values())
+    lines.append(f"total: {total} bytes ({total / 2 ** 20:.2f} MB)")
+    return "\n".join(lines)
@@ -0,0 +1,522 @@
+"""
+Módulo de instrumentación opcional para las estructuras de datos de *DISClib*.
+Cuenta por cada método (o función en los módulos funcionales) el número de
+llamados, las comparaciones hechas con la función de comparación
+(*cmp_function* o *cmpfunction*), los nodos creados y el tiempo acumulado,
+total y propio (sin los llamados anidados).
+
+Las estructuras instrumentadas son ArrayList, SingleLinked, DoubleLinked y
+SeparateChaining (clases), los heaps (heap e indexheap) y los mapas ordenados
+(RBT y BST). Los nodos que se cuentan son SingleNode, DoubleNode, MapEntry y
+los nodos de RBT y BST.
+
+La instrumentación no cuesta nada cuando está apagada: *enable()* reemplaza los
+métodos y funciones por envolturas que miden y *disable()* restaura los
+originales, así con la instrumentación apagada se ejecuta exactamente el código
+original.
+
+Uso:
+    >>> from DISClib.Utils import instrument
+    >>> instrument.enable()
+    >>> ...                     # código a medir
+    >>> instrument.disable()
+    >>> print(instrument.format_report())
+    >>> instrument.export_folded("stacks.txt")  # flamegraph o speedscope
+"""
+
+# native python modules
+# import functools to keep the name and docstring of the wrapped functions
+import functools
+# import importlib to load the data structures only when enabled
+import importlib
+# import inspect to find the functions of the functional modules
+import inspect
+# import threading for the per-thread call stacks and the stats lock
+import threading
+# import time for measuring the cumulative time
+import time
+
+# instrumented classes: label -> (module, class)
+# :data: CLASS_TARGETS
+CLASS_TARGETS: dict = {
+    "ArrayList": ("DISClib.DataStructures.arraylist", "ArrayList"),
+    "SingleLinked": ("DISClib.DataStructures.singlelinkedlist",
+                     "SingleLinked"),
+    "DoubleLinked": ("DISClib.DataStructures.doublelinkedlist",
+                     "DoubleLinked"),
+    "SeparateChaining": ("DISClib.DataStructures.chaininghashtable",
+                         "SeparateChaining"),
+}
+"""
+Clases de *DISClib* cuyos métodos se instrumentan.
+"""
+
+# instrumented functional modules: label -> module
+# :data: MODULE_TARGETS
+MODULE_TARGETS: dict = {
+    "Heap": "DISClib.DataStructures.heap",
+    "IndexHeap": "DISClib.DataStructures.indexheap",
+    "RBT": "DISClib.DataStructures.rbt",
+    "BST": "DISClib.DataStructures.bst",
+}
+"""
+Módulos funcionales de *DISClib* (heaps y mapas ordenados) cuyas funciones se
+instrumentan.
+"""
+
+# node constructors counted as allocations: label -> (module, name)
+# :data: NODE_TARGETS
+NODE_TARGETS: dict = {
+    "SingleNode": ("DISClib.DataStructures.listnode", "SingleNode"),
+    "DoubleNode": ("DISClib.DataStructures.listnode", "DoubleNode"),
+    "MapEntry": ("DISClib.DataStructures.mapentry", "MapEntry"),
+    "RBTNode": ("DISClib.DataStructures.rbtnode", "newNode"),
+    "BSTNode": ("DISClib.DataStructures.bstnode", "newNode"),
+}
+"""
+Constructores de nodos que se cuentan como nodos creados.
+"""
+
+# dunder methods that are also instrumented
+_DUNDER_METHODS: tuple = ("__post_init__", "__iter__", "__len__")
+
+# label of the calls made outside any instrumented method
+_ROOT: str = "<root>"
+
+# instrumentation state, only changes in enable(), disable() and reset()
+_state: dict = {
+    "enabled": False,
+    # (owner, name, original) of every replaced attribute
+    "patches": [],
+    # (structure dict, original cmpfunction) of the watched structures
+    "watched": [],
+    # label -> [calls, comparisons, allocations, total_time, self_time]
+    "stats": {},
+    # call stack tuple -> self time
+    "stacks": {},
+    # node label -> number of nodes created
+    "nodes": {},
+}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _call_stack() -> list:
+    """*_call_stack()* función privada que retorna la pila de llamados
+    instrumentados del hilo actual. Cada elemento es [label, tiempo de los
+    llamados anidados].
+
+    Returns:
+        list: pila de llamados del hilo.
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = []
+        _local.stack = stack
+    return stack
+
+
+def _method_stats(label: str) -> list:
+    """*_method_stats()* función privada que retorna los contadores de un
+    método, y los crea si no existen. Se llama con el candado tomado.
+
+    Args:
+        label (str): nombre del método, p.ej. "ArrayList.add_last".
+
+    Returns:
+        list: [llamados, comparaciones, nodos, tiempo total, tiempo propio].
+    """
+    stats = _state["stats"].get(label)
+    if stats is None:
+        stats = [0, 0, 0, 0.0, 0.0]
+        _state["stats"][label] = stats
+    return stats
+
+
+def _current_label() -> str:
+    """*_current_label()* función privada que retorna el método instrumentado
+    que se está ejecutando en el hilo actual.
+
+    Returns:
+        str: nombre del método, o "<root>" si no hay ninguno.
+    """
+    stack = _call_stack()
+    return stack[-1][0] if stack else _ROOT
+
+
+def _timed(label: str, func):
+    """*_timed()* función privada que envuelve una función o método para contar
+    sus llamados y medir su tiempo total y propio, y el tiempo de cada pila de
+    llamados.
+
+    Args:
+        label (str): nombre del método.
+        func (function): función original.
+
+    Returns:
+        function: función envuelta.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = _call_stack()
+        frame = [label, 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            path = tuple(item[0] for item in stack)
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            own = elapsed - frame[1]
+            with _lock:
+                stats = _method_stats(label)
+                stats[0] += 1
+                stats[3] += elapsed
+                stats[4] += own
+                stacks = _state["stacks"]
+                stacks[path] = stacks.get(path, 0.0) + own
+    return wrapper
+
+
+def _counted_node(label: str, func):
+    """*_counted_node()* función privada que envuelve el constructor de un nodo
+    para contar los nodos creados, por tipo de nodo y por el método
+    instrumentado que los crea.
+
+    Args:
+        label (str): tipo de nodo.
+        func (function): constructor original.
+
+    Returns:
+        function: constructor envuelto.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        owner = _current_label()
+        with _lock:
+            _method_stats(owner)[2] += 1
+            nodes = _state["nodes"]
+            nodes[label] = nodes.get(label, 0) + 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class _CountedCmp:
+    """**_CountedCmp** clase privada que envuelve una función de comparación
+    para contar las comparaciones del método instrumentado que la usa. Al
+    copiarla o serializarla (pickle) se entrega la función original, así un
+    snapshot tomado con la instrumentación encendida no depende de este módulo.
+
+    Args:
+        func (function): función de comparación.
+    """
+    __slots__ = ("__wrapped__",)
+
+    def __init__(self, func) -> None:
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        owner = _current_label()
+        with _lock:
+            _method_stats(owner)[1] += 1
+        return self.__wrapped__(*args, **kwargs)
+
+    def __reduce__(self):
+        return _original, (self.__wrapped__,)
+
+
+def _original(func):
+    """*_original()* función privada que retorna la función original de un
+    *_CountedCmp* copiado o serializado.
+
+    Args:
+        func (function): función de comparación.
+
+    Returns:
+        function: la misma función.
+    """
+    return func
+
+
+def _counted_cmp(func):
+    """*_counted_cmp()* función privada que envuelve una función de comparación
+    en un *_CountedCmp*. Si la función ya está envuelta la retorna igual.
+
+    Args:
+        func (function): función de comparación.
+
+    Returns:
+        _CountedCmp: función de comparación envuelta.
+    """
+    if func is None or isinstance(func, _CountedCmp):
+        return func
+    return _CountedCmp(func)
+
+
+def _cmp_property():
+    """*_cmp_property()* función privada que crea la propiedad que reemplaza el
+    atributo *cmp_function* de una clase mientras la instrumentación está
+    encendida. Guarda la función original en el diccionario de la instancia y
+    al leerla la entrega envuelta, así también se cuentan las comparaciones de
+    las estructuras creadas antes de *enable()*.
+
+    Returns:
+        property: propiedad de la función de comparación.
+    """
+    def getter(self):
+        return _counted_cmp(self.__dict__.get("cmp_function"))
+
+    def setter(self, value):
+        # never store a wrapper, it would outlive disable()
+        if isinstance(value, _CountedCmp):
+            value = value.__wrapped__
+        self.__dict__["cmp_function"] = value
+    return property(getter, setter)
+
+
+def _patch(owner, name: str, value) -> None:
+    """*_patch()* función privada que reemplaza un atributo de una clase o
+    módulo y guarda el original para restaurarlo.
+
+    Args:
+        owner (class | module): clase o módulo.
+        name (str): nombre del atributo.
+        value (any): nuevo valor.
+    """
+    _state["patches"].append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, value)
+
+
+def _watching_new(label: str, func):
+    """*_watching_new()* función privada que envuelve la función que crea un
+    heap o mapa ordenado (newMap, newHeap, ...) para contar las comparaciones
+    de las estructuras creadas mientras la instrumentación está encendida.
+
+    Args:
+        label (str): nombre de la función.
+        func (function): función original.
+
+    Returns:
+        function: función envuelta.
+    """
+    timed = _timed(label, func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        structure = timed(*args, **kwargs)
+        watch(structure)
+        return structure
+    return wrapper
+
+
+def watch(structure) -> None:
+    """*watch()* cuenta las comparaciones de un heap o mapa ordenado (RBT, BST)
+    que ya existía antes de *enable()*, envolviendo su función de comparación.
+    *disable()* restaura la función original. Las estructuras creadas con la
+    instrumentación encendida se vigilan solas, y las clases (ArrayList,
+    SeparateChaining, ...) no lo necesitan.
+
+    Args:
+        structure (dict): heap o mapa ordenado de *DISClib*.
+    """
+    if not _state["enabled"] or not isinstance(structure, dict):
+        return
+    cmp = structure.get("cmpfunction")
+    if cmp is None or isinstance(cmp, _CountedCmp):
+        return
+    _state["watched"].append((structure, cmp))
+    structure["cmpfunction"] = _counted_cmp(cmp)
+
+
+def enable() -> None:
+    """*enable()* enciende la instrumentación: reemplaza los métodos de las
+    clases de CLASS_TARGETS, las funciones de los módulos de MODULE_TARGETS y
+    los constructores de NODE_TARGETS por sus versiones instrumentadas. Los
+    contadores no se borran (ver *reset()*).
+    """
+    if _state["enabled"]:
+        return
+    for label, (module_name, class_name) in CLASS_TARGETS.items():
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for name, member in list(cls.__dict__.items()):
+            if not inspect.isfunction(member):
+                continue
+            if name.startswith("__") and name not in _DUNDER_METHODS:
+                continue
+            _patch(cls, name, _timed(f"{label}.{name}", member))
+        _patch(cls, "cmp_function", _cmp_property())
+    for label, module_name in MODULE_TARGETS.items():
+        module = importlib.import_module(module_name)
+        for name, member in list(vars(module).items()):
+            if not inspect.isfunction(member):
+                continue
+            if member.__module__ != module.__name__:
+                continue
+            if name.startswith("new"):
+                _patch(module, name, _watching_new(f"{label}.{name}",
+                                                   member))
+            else:
+                _patch(module, name, _timed(f"{label}.{name}", member))
+    for label, (module_name, name) in NODE_TARGETS.items():
+        owner = importlib.import_module(module_name)
+        target = getattr(owner, name)
+        if inspect.isclass(target):
+            owner, name = target, "__init__"
+            target = owner.__dict__[name]
+        _patch(owner, name, _counted_node(label, target))
+    _state["enabled"] = True
+
+
+def disable() -> None:
+    """*disable()* apaga la instrumentación y restaura los métodos, funciones y
+    funciones de comparación originales, así las estructuras vuelven a costar
+    lo mismo que sin instrumentación. Los contadores se conservan para el
+    reporte.
+    """
+    if not _state["enabled"]:
+        return
+    for owner, name, original in reversed(_state["patches"]):
+        setattr(owner, name, original)
+    for structure, cmp in _state["watched"]:
+        structure["cmpfunction"] = cmp
+    _state["patches"] = []
+    _state["watched"] = []
+    _state["enabled"] = False
+
+
+def is_enabled() -> bool:
+    """*is_enabled()* revisa si la instrumentación está encendida.
+
+    Returns:
+        bool: True si está encendida.
+    """
+    return _state["enabled"]
+
+
+def reset() -> None:
+    """*reset()* borra todos los contadores.
+    """
+    with _lock:
+        _state["stats"] = {}
+        _state["stacks"] = {}
+        _state["nodes"] = {}
+
+
+class instrumented:
+    """**instrumented** administrador de contexto que enciende la
+    instrumentación dentro de un bloque *with* y la apaga al salir.
+
+    Args:
+        reset_stats (bool, optional): si es True borra los contadores al
+            entrar. Por defecto es True.
+    """
+
+    def __init__(self, reset_stats: bool = True) -> None:
+        self.reset_stats = reset_stats
+
+    def __enter__(self):
+        if self.reset_stats:
+            reset()
+        enable()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        disable()
+        return False
+
+
+def report(sort_by: str = "total_ms", number: int = None) -> list:
+    """*report()* retorna los contadores de cada método instrumentado.
+
+    Args:
+        sort_by (str, optional): campo para ordenar de mayor a menor. Por
+            defecto es "total_ms".
+        number (int, optional): número de métodos. Por defecto todos.
+
+    Returns:
+        list: diccionarios {"method", "calls", "comparisons", "allocations",
+            "total_ms", "self_ms"}.
+    """
+    with _lock:
+        items = [(label, list(stats))
+                 for label, stats in _state["stats"].items()]
+    rows = [{
+        "method": label,
+        "calls": stats[0],
+        "comparisons": stats[1],
+        "allocations": stats[2],
+        "total_ms": 1000.0 * stats[3],
+        "self_ms": 1000.0 * stats[4],
+    } for label, stats in items]
+    rows.sort(key=lambda row: (-row[sort_by], row["method"]))
+    return rows[:number] if number is not None else rows
+
+
+def node_counts() -> dict:
+    """*node_counts()* retorna el número de nodos creados por tipo de nodo.
+
+    Returns:
+        dict: tipo de nodo -> nodos creados.
+    """
+    with _lock:
+        return dict(_state["nodes"])
+
+
+def format_report(sort_by: str = "total_ms", number: int = 30) -> str:
+    """*format_report()* retorna el reporte de *report()* como una tabla de
+    texto, con los nodos creados por tipo al final.
+
+    Args:
+        sort_by (str, optional): campo para ordenar de mayor a menor. Por
+            defecto es "total_ms".
+        number (int, optional): número de métodos. Por defecto es 30.
+
+    Returns:
+        str: tabla del reporte.
+    """
+    lines = ["{:<40} {:>10} {:>12} {:>10} {:>11} {:>11}".format(
+        "method", "calls", "comparisons", "nodes", "total_ms", "self_ms")]
+    for row in report(sort_by, number):
+        lines.append("{:<40} {:>10} {:>12} {:>10} {:>11.3f} {:>11.3f}".format(
+            row["method"], row["calls"], row["comparisons"],
+            row["allocations"], row["total_ms"], row["self_ms"]))
+    for label, count in sorted(node_counts().items()):
+        lines.append(f"nodes {label}: {count}")
+    return "\n".join(lines)
+
+
+def folded_stacks() -> list:
+    """*folded_stacks()* retorna el tiempo propio de cada pila de llamados
+    instrumentados en formato "folded" (una línea "A;B;C microsegundos" por
+    pila), el que leen flamegraph.pl, speedscope e inferno.
+
+    Returns:
+        list: líneas del formato folded, ordenadas por pila.
+    """
+    with _lock:
+        stacks = dict(_state["stacks"])
+    lines = []
+    for path in sorted(stacks):
+        micros = int(round(stacks[path] * 1e6))
+        if micros > 0:
+            lines.append(f"{';'.join(path)} {micros}")
+    return lines
+
+
+def export_folded(filename: str) -> int:
+    """*export_folded()* escribe las pilas de *folded_stacks()* en un archivo.
+
+    Args:
+        filename (str): ruta del archivo.
+
+    Returns:
+        int: número de pilas escritas.
+    """
+    lines = folded_stacks()
+    with open(filename, "w", encoding="utf-8") as file:
+        for line in lines:
+            file.write(line + "\n")
+    return len(lines)
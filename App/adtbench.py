@@ -0,0 +1,206 @@
+# Purpose: Benchmark del modo confiable (trusted) de las estructuras
+import config as cf
+import sys
+import argparse
+import json
+import random
+import time
+from DISClib.ADT.lists import List
+from DISClib.ADT.maps import Map
+assert cf
+
+
+"""
+Compara el modo verificado y el modo confiable (trusted) de ArrayList,
+SingleLinked y SeparateChaining en las operaciones que el modo
+confiable acelera: add_last, get_element y put. Cada operación se
+ejecuta en los dos modos con los mismos datos, se revisa que los
+resultados sean iguales y se reporta el mejor tiempo de cada modo y la
+aceleración.
+
+Uso:
+    python App/adtbench.py --size 100000 --repeat 5
+"""
+
+# número de elementos por defecto de cada operación
+SIZE = 100000
+
+# veces que se ejecuta cada operación, se reporta el mejor tiempo
+REPEAT = 5
+
+# las posiciones de SingleLinked.get_element se recorren desde el
+# inicio, la lista es más corta para que la operación no sea cuadrática
+LINKED_SIZE = 2000
+
+
+def arrayAddLast(trusted, data):
+    """
+    Agrega los elementos al final de un ArrayList
+    """
+    lst = List(dstruct='ArrayList', trusted=trusted)
+    for elm in data['values']:
+        lst.add_last(elm)
+    return lst.size()
+
+
+def arrayGetElement(trusted, data):
+    """
+    Lee todas las posiciones de un ArrayList
+    """
+    lst = data['lists']['ArrayList', trusted]
+    return sum(lst.get_element(pos) for pos in range(lst.size()))
+
+
+def linkedAddLast(trusted, data):
+    """
+    Agrega los elementos al final de un SingleLinked
+    """
+    lst = List(dstruct='SingleLinked', trusted=trusted)
+    for elm in data['values']:
+        lst.add_last(elm)
+    return lst.size()
+
+
+def linkedGetElement(trusted, data):
+    """
+    Lee posiciones al azar de un SingleLinked corto
+    """
+    lst = data['lists']['SingleLinked', trusted]
+    return sum(lst.get_element(pos) for pos in data['linked_positions'])
+
+
+def mapPut(trusted, data):
+    """
+    Agrega las llaves, con repetidas, a un SeparateChaining
+    """
+    table = Map(dstruct='SeparateChaining', trusted=trusted)
+    for key in data['keys']:
+        table.put(key, len(key))
+    return table
+
+
+# operaciones del benchmark: nombre -> función(trusted, data)
+WORKLOADS = {
+    'ArrayList.add_last': arrayAddLast,
+    'ArrayList.get_element': arrayGetElement,
+    'SingleLinked.add_last': linkedAddLast,
+    'SingleLinked.get_element': linkedGetElement,
+    'SeparateChaining.put': mapPut,
+}
+
+
+def buildData(size, seed):
+    """
+    Crea los datos de las operaciones y las listas llenas que usan las
+    lecturas, una por cada modo
+    """
+    rng = random.Random(seed)
+    data = {
+        'values': list(range(size)),
+        'keys': ['key-' + str(rng.randrange(size // 2 or 1))
+                 for _ in range(size)],
+        'linked_positions': [rng.randrange(LINKED_SIZE)
+                             for _ in range(size // 10 or 1)],
+        'lists': {},
+    }
+    for trusted in (False, True):
+        lst = List(dstruct='ArrayList', trusted=trusted)
+        linked = List(dstruct='SingleLinked', trusted=trusted)
+        for elm in data['values']:
+            lst.add_last(elm)
+        for elm in data['values'][:LINKED_SIZE]:
+            linked.add_last(elm)
+        data['lists']['ArrayList', trusted] = lst
+        data['lists']['SingleLinked', trusted] = linked
+    return data
+
+
+def resultSignature(result):
+    """
+    Valor comparable del resultado de una operación: las parejas llave,
+    valor ordenadas si es un mapa, o el resultado mismo
+    """
+    if hasattr(result, 'entries'):
+        return sorted((entry.get_key(), entry.get_value())
+                      for entry in result.entries())
+    return result
+
+
+def timeWorkload(workload, trusted, data, repeat):
+    """
+    Ejecuta una operación repeat veces. Retorna el mejor tiempo en
+    segundos y el resultado
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = workload(trusted, data)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def runBenchmark(size=SIZE, repeat=REPEAT, seed=0):
+    """
+    Mide cada operación en modo verificado y en modo confiable.
+    Retorna un diccionario nombre -> tiempos, aceleración y si los
+    resultados de los dos modos son iguales
+    """
+    data = buildData(size, seed)
+    results = {}
+    for name, workload in WORKLOADS.items():
+        checked_s, checked = timeWorkload(workload, False, data, repeat)
+        trusted_s, trusted = timeWorkload(workload, True, data, repeat)
+        results[name] = {
+            'checked_ms': checked_s * 1000.0,
+            'trusted_ms': trusted_s * 1000.0,
+            'speedup': checked_s / trusted_s,
+            'same_result': (resultSignature(checked) ==
+                            resultSignature(trusted)),
+        }
+    return results
+
+
+def printResults(results):
+    """
+    Imprime la tabla de tiempos y aceleraciones
+    """
+    print('{:<28} {:>12} {:>12} {:>8}  {}'.format(
+        'operación', 'checked_ms', 'trusted_ms', 'speedup', 'resultado'))
+    for name, result in results.items():
+        same = 'igual' if result['same_result'] else 'DISTINTO'
+        print('{:<28} {:>12.2f} {:>12.2f} {:>7.2f}x  {}'.format(
+            name, result['checked_ms'], result['trusted_ms'],
+            result['speedup'], same))
+
+
+def parseArgs(argv):
+    """
+    Lee los argumentos de la línea de comandos
+    """
+    parser = argparse.ArgumentParser(
+        description='Modo verificado contra modo confiable de DISClib')
+    parser.add_argument('--size', type=int, default=SIZE,
+                        help='elementos de cada operación')
+    parser.add_argument('--repeat', type=int, default=REPEAT,
+                        help='ejecuciones de cada operación')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None,
+                        help='archivo JSON con los resultados')
+    return parser.parse_args(argv)
+
+
+# main del benchmark del modo confiable
+if __name__ == "__main__":
+
+    args = parseArgs(sys.argv[1:])
+    results = runBenchmark(args.size, args.repeat, args.seed)
+    printResults(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+    # los dos modos deben dar los mismos resultados
+    sys.exit(0 if all(result['same_result']
+                      for result in results.values()) else 1)
@@ -0,0 +1,335 @@
+# Purpose: Benchmark del catálogo con comparación contra una línea base
+import config as cf
+import sys
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+import controller
+import metrics
+import model
+assert cf
+
+
+"""
+Mide de punta a punta la carga del catálogo (loadData) y las consultas
+getBestBooks, getBooksByAuthor y countBooksByTag sobre los archivos
+incluidos en Data/GoodReads, escribe los resultados en JSON y los
+compara contra una línea base guardada. Termina con código 1 si alguna
+métrica empeora más que el umbral.
+
+Por cada conjunto de datos registra:
+    load     latencia de cada carga, registros por segundo y memoria
+             pico (tracemalloc) de una carga aparte
+    queries  latencia de cada consulta, consultas por segundo y
+             memoria pico de sus ejecuciones
+
+Las consultas se miden con el cache de consultas apagado, cada una
+con argumentos distintos tomados del catálogo cargado con una semilla
+fija. Los tiempos dependen de la máquina: Data/Bench/baseline.json
+se grabó con el código actual en la máquina de desarrollo y solo sirve
+de referencia. Antes de comparar hay que grabar la línea base en la
+máquina local (--update-baseline) con el código de partida, y volver a
+grabarla cuando un cambio mejora las métricas a propósito.
+
+Uso:
+    python App/benchmark.py                   compara con la línea base
+    python App/benchmark.py --update-baseline guarda la línea base
+"""
+
+# conjuntos de datos: archivos de libros, tags y asociaciones dentro de
+# cf.data_dir. El repositorio no incluye el book_tags.csv completo, los
+# dos conjuntos usan la muestra de asociaciones
+DATASETS = {
+    'bundled': ('GoodReads/books.csv', 'GoodReads/tags.csv',
+                'GoodReads/book_tags-small.csv'),
+    'small': ('GoodReads/books-small.csv', 'GoodReads/tags.csv',
+              'GoodReads/book_tags-small.csv'),
+}
+
+# línea base por defecto, dentro de cf.data_dir
+BASELINE_FILE = 'Bench/baseline.json'
+
+# veces que se carga cada conjunto de datos
+LOAD_REPEAT = 3
+
+# veces que se ejecuta cada consulta
+QUERY_REPEAT = 200
+
+# número de libros de getBestBooks
+TOP = 10
+
+# empeoramiento máximo de una métrica frente a la línea base (25%)
+THRESHOLD = 0.25
+
+# diferencias mínimas para contar una regresión, por debajo son ruido:
+# las consultas de microsegundos varían mucho de una ejecución a otra
+MIN_DELTA_MS = 0.05
+MIN_DELTA_MB = 0.1
+
+# métricas que se comparan: (sección, campo, True si más es mejor)
+COMPARED = (
+    ('load', 'p50_ms', False),
+    ('load', 'rows_per_second', True),
+    ('load', 'peak_mb', False),
+    ('queries', 'p50_ms', False),
+    ('queries', 'p95_ms', False),
+    ('queries', 'ops_per_second', True),
+    ('queries', 'peak_mb', False),
+)
+
+
+def dataFiles(name):
+    """
+    Rutas de los archivos de un conjunto de datos
+    """
+    return [cf.data_dir + filename for filename in DATASETS[name]]
+
+
+def newControl():
+    """
+    Controlador con el cache de consultas apagado
+    """
+    control = controller.newController()
+    control['cache'] = controller.newQueryCache(0)
+    return control
+
+
+def loadCatalog(files):
+    """
+    Carga un catálogo nuevo sin snapshot. Retorna el controlador y el
+    número de registros leídos
+    """
+    control = newControl()
+    controller.loadData(control, False, *files)
+    stats = controller.getLoadStats(control)
+    return control, sum(stat['rows'] for stat in stats.values())
+
+
+def peakMemory(function, *args):
+    """
+    Ejecuta function(*args) con tracemalloc y retorna su resultado y
+    la memoria pico en MB
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak / 2 ** 20
+
+
+def benchLoad(files, repeat):
+    """
+    Mide la carga de un conjunto de datos. La memoria se mide en una
+    carga aparte porque tracemalloc hace más lenta la carga
+    """
+    recorder = metrics.new_recorder()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        control, rows = loadCatalog(files)
+        metrics.record(recorder, 'load', time.perf_counter() - start)
+    _, peak_mb = peakMemory(loadCatalog, files)
+    result = metrics.summary(recorder)['load']
+    result['rows'] = rows
+    result['rows_per_second'] = rows * 1000.0 / result['mean_ms']
+    result['peak_mb'] = peak_mb
+    return control, result
+
+
+def queryArguments(control, repeat, seed):
+    """
+    Argumentos de cada consulta, escogidos del catálogo cargado con
+    una semilla fija
+    """
+    rng = random.Random(seed)
+    catalog = control['model']
+    authors = [author['name'] for author in model.get_authors(catalog)]
+    # tags con libros asociados, más algunos sin libros
+    tags = [model.get_map_value(catalog['tag_ids'], tag_id)['name']
+            for tag_id in catalog['tag_books'].keys()]
+    tags += [tag['name'] for tag in catalog['tags']][:len(tags) or 1]
+    queries = {
+        'getBestBooks': [(rng.randint(1, TOP),) for _ in range(repeat)],
+        'getBooksByAuthor': [(rng.choice(authors),)
+                             for _ in range(repeat)],
+        'countBooksByTag': [(rng.choice(tags),) for _ in range(repeat)],
+    }
+    return queries
+
+
+def runQueries(control, queries):
+    """
+    Ejecuta las consultas y retorna sus latencias
+    """
+    recorder = metrics.new_recorder()
+    for name, args_lt in queries.items():
+        query = getattr(controller, name)
+        for args in args_lt:
+            start = time.perf_counter()
+            query(control, *args)
+            metrics.record(recorder, name, time.perf_counter() - start)
+    return recorder
+
+
+def benchQueries(control, repeat, seed):
+    """
+    Mide las consultas sobre un catálogo cargado
+    """
+    queries = queryArguments(control, repeat, seed)
+    results = metrics.summary(runQueries(control, queries))
+    for name, result in results.items():
+        result['ops_per_second'] = 1000.0 / result['mean_ms']
+        _, result['peak_mb'] = peakMemory(runQueries, control,
+                                          {name: queries[name]})
+    return results
+
+
+def runBenchmark(datasets=tuple(DATASETS), load_repeat=LOAD_REPEAT,
+                 query_repeat=QUERY_REPEAT, seed=0):
+    """
+    Mide la carga y las consultas de cada conjunto de datos. Retorna
+    el reporte que se escribe en JSON
+    """
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'load_repeat': load_repeat,
+            'query_repeat': query_repeat,
+            'seed': seed,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'datasets': {},
+    }
+    for name in datasets:
+        control, load = benchLoad(dataFiles(name), load_repeat)
+        report['datasets'][name] = {
+            'load': {'loadData': load},
+            'queries': benchQueries(control, query_repeat, seed),
+        }
+    return report
+
+
+def compareReports(report, baseline, threshold=THRESHOLD):
+    """
+    Compara las métricas de COMPARED del reporte con las de la línea
+    base. Retorna la lista de comparaciones, cada una con el valor
+    actual, el de la línea base, el cambio relativo y si es una
+    regresión. Las métricas que no están en la línea base se ignoran
+    """
+    comparisons = []
+    for dataset, sections in report['datasets'].items():
+        base_sections = baseline.get('datasets', {}).get(dataset, {})
+        for section, field, higher_is_better in COMPARED:
+            for name, result in sections.get(section, {}).items():
+                base = base_sections.get(section, {}).get(name, {})
+                if field not in base or not base[field]:
+                    continue
+                value = result[field]
+                change = (value - base[field]) / base[field]
+                worse = -change if higher_is_better else change
+                regression = (worse > threshold and
+                              not isNoise(field, value, base[field]))
+                comparisons.append({
+                    'metric': '/'.join((dataset, name, field)),
+                    'value': value,
+                    'baseline': base[field],
+                    'change': change,
+                    'regression': regression,
+                })
+    return comparisons
+
+
+def isNoise(field, value, base):
+    """
+    Revisa si la diferencia entre el valor y la línea base es menor
+    que el ruido de la medición: MIN_DELTA_MS en las latencias y en la
+    latencia promedio que implica un throughput de consultas, y
+    MIN_DELTA_MB en la memoria
+    """
+    if field.endswith('_ms'):
+        return value - base <= MIN_DELTA_MS
+    if field == 'ops_per_second':
+        return 1000.0 / value - 1000.0 / base <= MIN_DELTA_MS
+    if field == 'peak_mb':
+        return value - base <= MIN_DELTA_MB
+    return False
+
+
+def printComparisons(comparisons, threshold):
+    """
+    Imprime la comparación contra la línea base
+    """
+    for item in comparisons:
+        mark = 'REGRESIÓN' if item['regression'] else 'ok'
+        print('{:<48} {:>12.3f} {:>12.3f} {:>+8.1%}  {}'.format(
+            item['metric'], item['value'], item['baseline'],
+            item['change'], mark))
+    regressions = sum(item['regression'] for item in comparisons)
+    print(str(regressions) + ' regresiones de más de ' +
+          '{:.0%}'.format(threshold) + ' en ' + str(len(comparisons)) +
+          ' métricas')
+
+
+def writeJson(filename, data):
+    """
+    Escribe data en un archivo JSON, creando su carpeta
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as output:
+        json.dump(data, output, indent=2)
+        output.write('\n')
+
+
+def parseArgs(argv):
+    """
+    Lee los argumentos de la línea de comandos
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark del catálogo contra una línea base')
+    parser.add_argument('--datasets', nargs='+', choices=tuple(DATASETS),
+                        default=tuple(DATASETS))
+    parser.add_argument('--load-repeat', type=int, default=LOAD_REPEAT)
+    parser.add_argument('--query-repeat', type=int, default=QUERY_REPEAT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None,
+                        help='archivo JSON con los resultados')
+    parser.add_argument('--baseline', default=None,
+                        help='línea base, por defecto Data/' + BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='empeoramiento máximo, p.ej. 0.25 = 25%%')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='guarda los resultados como línea base')
+    return parser.parse_args(argv)
+
+
+# main del benchmark
+if __name__ == "__main__":
+
+    args = parseArgs(sys.argv[1:])
+    baseline_file = args.baseline or cf.data_dir + BASELINE_FILE
+    report = runBenchmark(args.datasets, args.load_repeat,
+                          args.query_repeat, args.seed)
+    if args.output:
+        writeJson(args.output, report)
+    if args.update_baseline:
+        writeJson(baseline_file, report)
+        print('Línea base guardada en ' + baseline_file)
+        sys.exit(0)
+    if not os.path.exists(baseline_file):
+        print(json.dumps(report, indent=2))
+        print('No hay línea base en ' + baseline_file +
+              ', use --update-baseline')
+        sys.exit(0)
+    with open(baseline_file, encoding='utf-8') as file:
+        baseline = json.load(file)
+    comparisons = compareReports(report, baseline, args.threshold)
+    printComparisons(comparisons, args.threshold)
+    sys.exit(1 if any(item['regression'] for item in comparisons) else 0)
@@ -0,0 +1,483 @@
+"""
+Este módulo implementa el almacén columnar de libros del catálogo (BookStore).
+En vez de guardar cada libro como el diccionario de textos que entrega el
+archivo CSV, cada columna numérica se guarda en un arreglo tipado (array) y
+cada columna de texto se codifica con un diccionario de valores distintos, así
+el costo en memoria por libro es mucho menor y los campos numéricos no se
+convierten en cada comparación.
+
+Los libros se consultan con vistas livianas (BookView) que se comportan como un
+diccionario de solo lectura sobre una posición del almacén.
+"""
+
+# native python modules
+# import array for the typed numeric columns
+from array import array
+# import Mapping to give the book views a dict-like interface
+from collections.abc import Mapping
+
+# numeric columns stored as 64-bit integers
+# :data: INT_COLUMNS
+INT_COLUMNS: tuple = (
+    "book_id",
+    "goodreads_book_id",
+    "best_book_id",
+    "work_id",
+    "books_count",
+    "ratings_count",
+    "work_ratings_count",
+    "work_text_reviews_count",
+    "ratings_1",
+    "ratings_2",
+    "ratings_3",
+    "ratings_4",
+    "ratings_5",
+)
+"""
+Columnas enteras del archivo de libros, se guardan en arreglos de enteros de 64
+bits.
+"""
+
+# big integer columns written in scientific notation in the file
+# :data: BIG_INT_COLUMNS
+BIG_INT_COLUMNS: tuple = (
+    "isbn13",
+)
+"""
+Columnas enteras grandes que el archivo escribe en notación científica (p.ej.
+9.78043902348e+12), pueden estar vacías.
+"""
+
+# numeric columns stored as doubles
+# :data: FLOAT_COLUMNS
+FLOAT_COLUMNS: tuple = (
+    "average_rating",
+)
+"""
+Columnas reales del archivo de libros, se guardan en arreglos de números de 64
+bits.
+"""
+
+# text columns stored with dictionary encoding
+# :data: STR_COLUMNS
+STR_COLUMNS: tuple = (
+    "authors",
+    "original_title",
+    "title",
+    "isbn",
+    "original_publication_year",
+    "language_code",
+    "image_url",
+    "small_image_url",
+)
+"""
+Columnas de texto del archivo de libros, se codifican con un diccionario de
+valores distintos.
+"""
+
+# sentinel for empty values in the integer columns
+# :data: MISSING_INT
+MISSING_INT: int = -1
+"""
+Valor con el que se guarda un entero vacío, la vista lo retorna como None.
+"""
+
+# all the columns, in the order of the positional records
+# :data: BOOK_COLUMNS
+BOOK_COLUMNS: tuple = (INT_COLUMNS + BIG_INT_COLUMNS + FLOAT_COLUMNS +
+                       STR_COLUMNS)
+"""
+Columnas del almacén en el orden en que se guardan. Un registro
+posicional (tupla o lista) trae los valores en este orden.
+"""
+
+
+def _parse_int(text: str) -> int:
+    """*_parse_int()* función privada que convierte el texto de una columna
+    entera, vacío es MISSING_INT.
+
+    Args:
+        text (str): texto del archivo.
+
+    Returns:
+        int: valor de la columna.
+    """
+    return int(text) if text != "" else MISSING_INT
+
+
+def _parse_big_int(text: str) -> int:
+    """*_parse_big_int()* función privada que convierte el texto en
+    notación científica de una columna entera grande, vacío es
+    MISSING_INT.
+
+    Args:
+        text (str): texto del archivo.
+
+    Returns:
+        int: valor de la columna.
+    """
+    return int(float(text)) if text != "" else MISSING_INT
+
+
+def _parse_text(text: str) -> str:
+    """*_parse_text()* función privada para las columnas de texto, que se
+    guardan sin convertir.
+
+    Args:
+        text (str): texto del archivo.
+
+    Returns:
+        str: el mismo texto.
+    """
+    return text
+
+
+# parser of each column, in BOOK_COLUMNS order
+_PARSERS: tuple = ((_parse_int,) * len(INT_COLUMNS) +
+                   (_parse_big_int,) * len(BIG_INT_COLUMNS) +
+                   (float,) * len(FLOAT_COLUMNS) +
+                   (_parse_text,) * len(STR_COLUMNS))
+
+
+class BookView(Mapping):
+    """**BookView** vista de solo lectura sobre un libro del BookStore. Se usa
+    igual que el diccionario del libro (book["title"], book.get("isbn"),
+    dict(book)) pero solo guarda la referencia al almacén y la posición del
+    libro.
+
+    Args:
+        Mapping: interfaz de diccionario de solo lectura de Python.
+    """
+    __slots__ = ("_store", "_pos")
+
+    def __init__(self, store: "BookStore", pos: int) -> None:
+        """*__init__()* crea la vista del libro en la posición pos del almacén.
+
+        Args:
+            store (BookStore): almacén columnar de los libros.
+            pos (int): posición del libro dentro del almacén.
+        """
+        self._store = store
+        self._pos = pos
+
+    @property
+    def pos(self) -> int:
+        """*pos* posición del libro dentro del almacén.
+
+        Returns:
+            int: posición del libro.
+        """
+        return self._pos
+
+    def __getitem__(self, column: str):
+        """*__getitem__()* retorna el valor tipado de una columna del libro.
+
+        Args:
+            column (str): nombre de la columna.
+
+        Raises:
+            KeyError: error si la columna no existe.
+
+        Returns:
+            any: valor de la columna, int, float, str o None si está vacío.
+        """
+        return self._store.value(self._pos, column)
+
+    def __iter__(self):
+        """*__iter__()* recorre los nombres de las columnas del libro.
+
+        Returns:
+            iterator: iterador sobre las columnas.
+        """
+        return iter(self._store.columns)
+
+    def __len__(self) -> int:
+        """*__len__()* número de columnas del libro.
+
+        Returns:
+            int: número de columnas.
+        """
+        return len(self._store.columns)
+
+    def __eq__(self, other) -> bool:
+        """*__eq__()* dos vistas son iguales si apuntan al mismo libro del
+        mismo almacén.
+
+        Args:
+            other (any): objeto a comparar.
+
+        Returns:
+            bool: True si son el mismo libro.
+        """
+        if isinstance(other, BookView):
+            return self._store is other._store and self._pos == other._pos
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """*__hash__()* código hash de la vista según la posición del libro.
+
+        Returns:
+            int: código hash.
+        """
+        return hash((id(self._store), self._pos))
+
+    def __repr__(self) -> str:
+        """*__repr__()* representación del libro como diccionario.
+
+        Returns:
+            str: representación del libro.
+        """
+        return f"BookView({dict(self)!r})"
+
+
+class BookStore:
+    """**BookStore** almacén columnar de los libros del catálogo. Tiene la
+    misma interfaz de consulta que el ArrayList de libros (size(),
+    get_element(), add_last() e iteración) y entrega vistas BookView en vez de
+    diccionarios.
+    """
+
+    def __init__(self) -> None:
+        """*__init__()* crea el almacén vacío con una columna por cada campo
+        del archivo de libros.
+        """
+        self.columns = BOOK_COLUMNS
+        self._size = 0
+        self._numbers = {}
+        for column in INT_COLUMNS + BIG_INT_COLUMNS:
+            self._numbers[column] = array("q")
+        for column in FLOAT_COLUMNS:
+            self._numbers[column] = array("d")
+        # dictionary encoding: codes per row, values and value -> code
+        self._codes = {}
+        self._values = {}
+        self._lookup = {}
+        for column in STR_COLUMNS:
+            self._codes[column] = array("l")
+            self._values[column] = []
+            self._lookup[column] = {}
+
+    def _encode(self, column: str, value: str) -> int:
+        """*_encode()* función privada que retorna el código de un texto en el
+        diccionario de su columna, y lo agrega si es nuevo.
+
+        Args:
+            column (str): nombre de la columna de texto.
+            value (str): texto a codificar.
+
+        Returns:
+            int: código del texto.
+        """
+        lookup = self._lookup[column]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self._values[column])
+            self._values[column].append(value)
+            lookup[value] = code
+        return code
+
+    @staticmethod
+    def _parse_row(record):
+        """*_parse_row()* función privada que convierte los textos numéricos de
+        un registro del archivo a su tipo, los textos quedan iguales.
+
+        Args:
+            record (dict | tuple): registro del archivo de libros, o
+                registro posicional con los valores en el orden de
+                BOOK_COLUMNS.
+
+        Returns:
+            iterator: parejas (columna, valor) en el orden de las columnas.
+        """
+        if isinstance(record, Mapping):
+            record = [record[column] for column in BOOK_COLUMNS]
+        for column, parse, text in zip(BOOK_COLUMNS, _PARSERS, record):
+            yield column, parse(text)
+
+    def _set_row(self, pos: int, record: dict) -> None:
+        """*_set_row()* función privada que convierte los textos de un registro
+        del archivo y los escribe en la posición pos de cada columna.
+
+        Args:
+            pos (int): posición del libro, igual a size() para un libro nuevo.
+            record (dict | tuple): registro del archivo de libros.
+        """
+        for column, value in self._parse_row(record):
+            if column in self._numbers:
+                self._put(self._numbers[column], pos, value)
+            else:
+                code = self._encode(column, value)
+                self._put(self._codes[column], pos, code)
+
+    @staticmethod
+    def _put(data: array, pos: int, value) -> None:
+        """*_put()* función privada que escribe un valor en un arreglo, al
+        final si pos es igual a su tamaño.
+
+        Args:
+            data (array): arreglo de la columna.
+            pos (int): posición a escribir.
+            value (any): valor a escribir.
+        """
+        if pos == len(data):
+            data.append(value)
+        else:
+            data[pos] = value
+
+    def add_last(self, record: dict) -> BookView:
+        """*add_last()* agrega un libro al final del almacén a partir de un
+        registro del archivo de libros.
+
+        Args:
+            record (dict | tuple): registro con todas las columnas del
+                archivo de libros, por nombre o en el orden de BOOK_COLUMNS.
+
+        Returns:
+            BookView: vista del libro agregado.
+        """
+        pos = self._size
+        self._set_row(pos, record)
+        self._size += 1
+        return BookView(self, pos)
+
+    def update(self, pos: int, record: dict) -> BookView:
+        """*update()* reemplaza en su misma posición los valores de un libro
+        que ya está en el almacén.
+
+        Args:
+            pos (int): posición del libro.
+            record (dict | tuple): registro con todas las columnas del
+                archivo de libros, por nombre o en el orden de BOOK_COLUMNS.
+
+        Raises:
+            IndexError: error si la posición es inválida.
+
+        Returns:
+            BookView: vista del libro actualizado.
+        """
+        if pos < 0 or pos > self._size - 1:
+            raise IndexError(f"Index {pos} is out of range")
+        self._set_row(pos, record)
+        return BookView(self, pos)
+
+    def matches(self, pos: int, record: dict) -> bool:
+        """*matches()* revisa si un registro del archivo tiene los mismos
+        valores que el libro guardado en una posición.
+
+        Args:
+            pos (int): posición del libro.
+            record (dict | tuple): registro con todas las columnas del
+                archivo de libros, por nombre o en el orden de BOOK_COLUMNS.
+
+        Returns:
+            bool: True si todos los valores son iguales.
+        """
+        for column, value in self._parse_row(record):
+            data = self._numbers.get(column)
+            if data is not None:
+                if data[pos] != value:
+                    return False
+            elif self._values[column][self._codes[column][pos]] != value:
+                return False
+        return True
+
+    def value(self, pos: int, column: str):
+        """*value()* retorna el valor tipado de una columna en una posición.
+
+        Args:
+            pos (int): posición del libro.
+            column (str): nombre de la columna.
+
+        Raises:
+            KeyError: error si la columna no existe.
+
+        Returns:
+            any: valor de la columna, int, float, str o None si está vacío.
+        """
+        data = self._numbers.get(column)
+        if data is not None:
+            value = data[pos]
+            if value == MISSING_INT and data.typecode == "q":
+                return None
+            return value
+        return self._values[column][self._codes[column][pos]]
+
+    def column(self, column: str) -> array:
+        """*column()* retorna el arreglo tipado de una columna numérica, para
+        recorrerla u ordenarla sin convertir textos.
+
+        Args:
+            column (str): nombre de la columna numérica.
+
+        Raises:
+            KeyError: error si la columna no es numérica.
+
+        Returns:
+            array: arreglo con los valores de la columna.
+        """
+        return self._numbers[column]
+
+    def codes(self, column: str) -> tuple:
+        """*codes()* retorna la codificación de una columna de texto: el
+        arreglo con el código de cada libro y la lista de valores distintos,
+        donde values[codes[pos]] es el texto del libro en pos. Sirve para
+        agrupar libros por la columna sin comparar textos.
+
+        Args:
+            column (str): nombre de la columna de texto.
+
+        Raises:
+            KeyError: error si la columna no es de texto.
+
+        Returns:
+            tuple: (codes, values), un array y una lista.
+        """
+        return self._codes[column], self._values[column]
+
+    def is_empty(self) -> bool:
+        """*is_empty()* revisa si el almacén está vacío.
+
+        Returns:
+            bool: True si no hay libros.
+        """
+        return self._size == 0
+
+    def size(self) -> int:
+        """*size()* número de libros en el almacén.
+
+        Returns:
+            int: número de libros.
+        """
+        return self._size
+
+    def get_element(self, pos: int) -> BookView:
+        """*get_element()* retorna la vista del libro en una posición.
+
+        Args:
+            pos (int): posición del libro.
+
+        Raises:
+            IndexError: error si la posición es inválida.
+
+        Returns:
+            BookView: vista del libro.
+        """
+        if pos < 0 or pos > self._size - 1:
+            raise IndexError(f"Index {pos} is out of range")
+        return BookView(self, pos)
+
+    def __iter__(self):
+        """*__iter__()* recorre las vistas de los libros en orden de carga.
+
+        Returns:
+            iterator: iterador sobre las vistas de los libros.
+        """
+        return (BookView(self, pos) for pos in range(self._size))
+
+    def __len__(self) -> int:
+        """*__len__()* número de libros en el almacén.
+
+        Returns:
+            int: número de libros.
+        """
+        return self._size
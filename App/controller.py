@@ -1,136 +1,686 @@
 
 import config as cf
 import model
+import bookstore
 import csv
+import concurrent.futures
+import copyreg
+import hashlib
+import importlib
+import io
+import operator
+import os
+import pickle
+import threading
+import time
+import types
+from collections import OrderedDict, deque
+from DISClib.Utils import footprint
 
 """
 El controlador se encarga de mediar entre la vista y el modelo.
 """
 
+# archivos de datos dentro de cf.data_dir
+BOOKS_FILE = 'GoodReads/books.csv'
+TAGS_FILE = 'GoodReads/tags.csv'
+BOOK_TAGS_FILE = 'GoodReads/book_tags.csv'
 
-def newController():
+# snapshot binario del catálogo ya construido
+SNAPSHOT_FILE = 'GoodReads/catalog.snapshot'
+# cambia cuando cambia la estructura del catálogo en el modelo
+SNAPSHOT_VERSION = 17
+
+# tamaño del buffer con el que se leen los archivos CSV
+CSV_BUFFER_SIZE = 1 << 20
+
+# filas de cada bloque y número máximo de procesos de la carga en
+# paralelo
+PARALLEL_CHUNK_ROWS = 10000
+PARALLEL_WORKERS = 4
+
+# número máximo de resultados en el cache de consultas
+QUERY_CACHE_SIZE = 256
+
+# columnas que se leen de cada archivo, None para todas. Los libros y
+# las asociaciones se leen como tuplas en este orden
+BOOKS_COLUMNS = bookstore.BOOK_COLUMNS
+TAGS_COLUMNS = ('tag_id', 'tag_name')
+BOOK_TAGS_COLUMNS = ('goodreads_book_id', 'tag_id', 'count')
+
+
+def newController(trusted=False):
     """
-    Crea una instancia del modelo
+    Crea una instancia del modelo. Si trusted es True las estructuras
+    del catálogo se crean en modo confiable (ver model.new_catalog)
     """
     control = {
         'model': None
     }
     # control['model'] = model.newCatalog()
-    control['model'] = model.new_catalog()
+    control['model'] = model.new_catalog(trusted=trusted)
+    control['cache'] = newQueryCache()
     return control
 
 
+# Funciones del cache de consultas
+
+def newQueryCache(capacity=QUERY_CACHE_SIZE):
+    """
+    Crea un cache LRU vacío para los resultados de las consultas, con
+    capacidad para capacity resultados (0 lo deshabilita)
+    """
+    cache = {
+        'entries': OrderedDict(),
+        'capacity': capacity,
+        'catalog': None,
+        'version': None,
+        'hits': 0,
+        'misses': 0,
+        'evictions': 0,
+        'invalidations': 0,
+        'lock': threading.Lock()
+    }
+    return cache
+
+
+def cachedQuery(control, name, query, *args):
+    """
+    Retorna el resultado de query(catalog, *args) desde el cache de
+    consultas, y lo calcula y guarda si no está. Todo el cache se
+    invalida cuando cambia el catálogo o su versión (ver
+    model.touch_catalog). Los resultados se comparten entre llamadas y
+    no se deben modificar
+    """
+    cache = control['cache']
+    catalog = control['model']
+    key = (name,) + args
+    with cache['lock']:
+        version = model.catalog_version(catalog)
+        if cache['catalog'] is not catalog or cache['version'] != version:
+            if cache['entries']:
+                cache['invalidations'] += 1
+                cache['entries'].clear()
+            cache['catalog'] = catalog
+            cache['version'] = version
+        entries = cache['entries']
+        if key in entries:
+            cache['hits'] += 1
+            entries.move_to_end(key)
+            return entries[key]
+        cache['misses'] += 1
+    result = query(catalog, *args)
+    with cache['lock']:
+        # solo se guarda si el catálogo no cambió mientras se calculaba
+        if (cache['catalog'] is catalog and cache['capacity'] > 0
+                and cache['version'] == model.catalog_version(catalog)):
+            entries = cache['entries']
+            entries[key] = result
+            entries.move_to_end(key)
+            while len(entries) > cache['capacity']:
+                entries.popitem(last=False)
+                cache['evictions'] += 1
+    return result
+
+
+def getCacheStats(control):
+    """
+    Retorna los contadores del cache de consultas: aciertos, fallos,
+    desalojos, invalidaciones, tamaño y capacidad
+    """
+    cache = control['cache']
+    with cache['lock']:
+        lookups = cache['hits'] + cache['misses']
+        return {'hits': cache['hits'],
+                'misses': cache['misses'],
+                'hit_rate': cache['hits'] / lookups if lookups else 0.0,
+                'evictions': cache['evictions'],
+                'invalidations': cache['invalidations'],
+                'size': len(cache['entries']),
+                'capacity': cache['capacity']}
+
+
+def clearCache(control):
+    """
+    Vacía el cache de consultas y reinicia sus contadores
+    """
+    capacity = control['cache']['capacity']
+    control['cache'] = newQueryCache(capacity)
+
+
 # Funciones para la carga de datos
 
 
-def loadData(control):
+def loadData(control, snapshot=True, booksfile=None, tagsfile=None,
+             booktagsfile=None, parallel=False, workers=None):
     """
     Carga los datos de los archivos y cargar los datos en la
-    estructura de datos
+    estructura de datos. Si snapshot es True y existe un snapshot
+    vigente de los archivos, el catálogo se lee del snapshot; si no,
+    se cargan los archivos y se escribe el snapshot para la próxima vez.
+    El snapshot solo se usa si el catálogo está vacío. Si parallel es
+    True los archivos se leen en un pool de procesos (ver
+    loadDataParallel). Los tiempos de carga de cada archivo quedan en
+    getLoadStats()
     """
+    files = dataFiles(booksfile, tagsfile, booktagsfile)
+    stats = {}
+    control['load_stats'] = stats
+    start = time.perf_counter()
+    # el snapshot solo reemplaza o describe un catálogo vacío
+    snapshot = snapshot and not any(catalogSizes(control['model']))
+    if snapshot and loadSnapshot(control, files=files):
+        sizes = catalogSizes(control['model'])
+        recordLoadStats(stats, 'snapshot', sum(sizes), start)
+        return sizes
     catalog = control['model']
-    books, authors = loadBooks(catalog)
-    tags = loadTags(catalog)
-    booktags = loadBooksTags(catalog)
+    if parallel:
+        sizes = loadDataParallel(catalog, files, stats, workers)
+        books, authors, tags, booktags = sizes
+    else:
+        counters = [{}, {}, {}]
+        books, authors = loadBooks(catalog, files[0], counters[0])
+        start = recordLoadStats(stats, 'books', books, start,
+                                counters[0]['malformed'])
+        tags = loadTags(catalog, files[1], counters[1])
+        start = recordLoadStats(stats, 'tags', tags, start,
+                                counters[1]['malformed'])
+        booktags = loadBooksTags(catalog, files[2], counters[2])
+        recordLoadStats(stats, 'book_tags', booktags, start,
+                        counters[2]['malformed'])
     # sortBooks(catalog)
+    if snapshot:
+        saveSnapshot(control, files=files)
+    return books, authors, tags, booktags
+
+
+def loadDataParallel(catalog, files, stats, workers=None):
+    """
+    Carga los archivos de libros, tags y asociaciones tag-libro
+    leyendo cada uno por bloques de PARALLEL_CHUNK_ROWS filas que se
+    convierten en registros en un pool de procesos, mientras el
+    proceso principal agrega al catálogo los registros de los bloques
+    anteriores (ver streamRows). Los registros se agregan siempre en
+    el orden libros, tags, asociaciones y en el orden de cada archivo,
+    así el catálogo es idéntico al de la carga secuencial
+    """
+    columns = [BOOKS_COLUMNS, TAGS_COLUMNS, BOOK_TAGS_COLUMNS]
+    records = [False, True, False]
+    adders = [addBooks, addTags, addBooksTags]
+    names = ['books', 'tags', 'book_tags']
+    if workers is None:
+        workers = min(PARALLEL_WORKERS, os.cpu_count() or 1)
+    sizes = []
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        start = time.perf_counter()
+        for idx in range(len(files)):
+            counters = {}
+            rows = streamRows(pool, files[idx], columns[idx], counters,
+                              records[idx], 2 * workers)
+            size = adders[idx](catalog, rows)
+            sizes.append(size)
+            rows = size[0] if isinstance(size, tuple) else size
+            start = recordLoadStats(stats, names[idx], rows, start,
+                                    counters['malformed'])
+            stats[names[idx]]['parse_seconds'] = counters['parse_seconds']
+    (books, authors), tags, booktags = sizes
     return books, authors, tags, booktags
 
 
-def loadBooks(catalog):
+def readChunks(filename, chunk_rows=None):
+    """
+    Lee un archivo CSV como un flujo de bloques de texto. El primer
+    bloque es la línea del encabezado y los demás tienen al menos
+    chunk_rows líneas. Un bloque solo se corta donde el número de
+    comillas leídas es par, así un campo entre comillas con saltos de
+    línea no queda partido entre dos bloques
+    """
+    if chunk_rows is None:
+        chunk_rows = PARALLEL_CHUNK_ROWS
+    with open(filename, encoding='utf-8', newline='',
+              buffering=CSV_BUFFER_SIZE) as data:
+        header = data.readline()
+        if not header:
+            return
+        yield header
+        lines = []
+        quotes = 0
+        for line in data:
+            lines.append(line)
+            quotes += line.count('"')
+            if len(lines) >= chunk_rows and quotes % 2 == 0:
+                yield ''.join(lines)
+                lines = []
+                quotes = 0
+        if lines:
+            yield ''.join(lines)
+
+
+def parseChunk(text, header, columns=None, records=True):
+    """
+    Convierte un bloque de texto de readChunks en registros. Se
+    ejecuta dentro de un proceso del pool de loadDataParallel y
+    retorna los registros junto con el número de filas ignoradas y el
+    tiempo que tomó convertirlos
+    """
+    start = time.perf_counter()
+    counters = {}
+    reader = csv.reader(io.StringIO(text, newline=''))
+    rows = list(parseRows(reader, header, columns, counters, records))
+    return rows, counters['malformed'], time.perf_counter() - start
+
+
+def streamRows(pool, filename, columns=None, counters=None, records=True,
+               window=None):
+    """
+    Lee un archivo CSV como un flujo de registros convertidos en el
+    pool de procesos. Hay a lo sumo window bloques enviados al pool
+    que no se han recorrido, así la memoria no depende del tamaño del
+    archivo. Los registros salen en el orden del archivo; las filas
+    ignoradas y el tiempo de conversión de los procesos quedan en
+    counters['malformed'] y counters['parse_seconds']
+    """
+    if counters is None:
+        counters = {}
+    counters.setdefault('malformed', 0)
+    counters.setdefault('parse_seconds', 0.0)
+    if window is None:
+        window = 2 * PARALLEL_WORKERS
+    chunks = readChunks(filename)
+    header = next(chunks, None)
+    if header is None:
+        return
+    header = next(csv.reader([header]))
+    if columns is not None:
+        # el encabezado se revisa antes de enviar los bloques
+        missing = [col for col in columns if col not in header]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in {filename}")
+    pending = deque()
+    try:
+        for text in chunks:
+            pending.append(pool.submit(parseChunk, text, header, columns,
+                                       records))
+            if len(pending) >= window:
+                yield from collectChunk(pending.popleft(), counters)
+        while pending:
+            yield from collectChunk(pending.popleft(), counters)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def collectChunk(future, counters):
+    """
+    Espera el resultado de un bloque enviado al pool, suma sus
+    contadores y retorna sus registros
+    """
+    rows, malformed, seconds = future.result()
+    counters['malformed'] += malformed
+    counters['parse_seconds'] += seconds
+    return rows
+
+
+def dataFiles(booksfile=None, tagsfile=None, booktagsfile=None):
+    """
+    Retorna las rutas de los archivos de libros, tags y asociaciones
+    tag-libro, usando los archivos por defecto de cf.data_dir para
+    los que no se indiquen
+    """
+    if booksfile is None:
+        booksfile = cf.data_dir + BOOKS_FILE
+    if tagsfile is None:
+        tagsfile = cf.data_dir + TAGS_FILE
+    if booktagsfile is None:
+        booktagsfile = cf.data_dir + BOOK_TAGS_FILE
+    return [booksfile, tagsfile, booktagsfile]
+
+
+def recordLoadStats(stats, name, rows, start, malformed=0):
+    """
+    Registra cuántos registros se cargaron de un archivo, en cuánto
+    tiempo, a qué velocidad (registros/segundo) y cuántas filas se
+    ignoraron por tener un número distinto de campos que el
+    encabezado. Retorna el instante en que termina, para medir el
+    siguiente archivo
+    """
+    end = time.perf_counter()
+    seconds = end - start
+    stats[name] = {
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else 0.0,
+        'malformed': malformed,
+    }
+    return end
+
+
+def getFootprint(control):
+    """
+    Retorna la memoria de cada estructura del catálogo: bytes, número
+    de elementos, bytes por elemento y objetos por tipo. Lo que
+    comparten varias estructuras se cuenta en la primera
+    """
+    return footprint.footprints(control['model'])
+
+
+def getLoadStats(control):
+    """
+    Retorna los tiempos y velocidades de la última carga de datos
+    """
+    return control.get('load_stats', {})
+
+
+def catalogSizes(catalog):
+    """
+    Retorna el número de libros, autores, tags y asociaciones
+    tag-libro del catálogo
+    """
+    return (model.books_size(catalog),
+            model.authors_size(catalog),
+            model.tags_size(catalog),
+            model.book_tags_size(catalog))
+
+
+# Funciones para el snapshot del catálogo
+
+def fileFingerprint(filename, digest=True):
+    """
+    Retorna el tamaño, la fecha de modificación y (si digest es True)
+    el hash sha1 del contenido de un archivo
+    """
+    stat = os.stat(filename)
+    fingerprint = {
+        'file': filename,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'sha1': None,
+    }
+    if digest:
+        sha1 = hashlib.sha1()
+        with open(filename, 'rb') as data:
+            for chunk in iter(lambda: data.read(1 << 20), b''):
+                sha1.update(chunk)
+        fingerprint['sha1'] = sha1.hexdigest()
+    return fingerprint
+
+
+def isFreshFingerprint(fingerprint):
+    """
+    Revisa si un archivo no ha cambiado desde que se tomó su huella.
+    Si el tamaño y la fecha coinciden no se lee el archivo, si solo
+    cambió la fecha se compara el hash del contenido
+    """
+    filename = fingerprint['file']
+    if not os.path.exists(filename):
+        return False
+    current = fileFingerprint(filename, digest=False)
+    if current['size'] != fingerprint['size']:
+        return False
+    if current['mtime'] == fingerprint['mtime']:
+        return True
+    current = fileFingerprint(filename)
+    return current['sha1'] == fingerprint['sha1']
+
+
+def _reduceModule(module):
+    """
+    Serializa un módulo (p.ej. el 'datastructure' de los mapas
+    ordenados) por su nombre, para importarlo de nuevo al cargar
+    """
+    return importlib.import_module, (module.__name__,)
+
+
+def saveSnapshot(control, filename=None, files=None):
+    """
+    Escribe el catálogo del controlador en un snapshot binario junto
+    con la huella de los archivos de datos con los que se construyó
+    """
+    if filename is None:
+        filename = cf.data_dir + SNAPSHOT_FILE
+    if files is None:
+        files = dataFiles()
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'trusted': control['model']['trusted'],
+        'sources': [fileFingerprint(f) for f in files],
+    }
+    tmpfile = filename + '.tmp'
+    with open(tmpfile, 'wb') as output:
+        pickler = pickle.Pickler(output, pickle.HIGHEST_PROTOCOL)
+        pickler.dispatch_table = copyreg.dispatch_table.copy()
+        pickler.dispatch_table[types.ModuleType] = _reduceModule
+        pickler.dump(header)
+        # el catálogo se lee por separado del encabezado
+        pickler.clear_memo()
+        pickler.dump(control['model'])
+    os.replace(tmpfile, filename)
+    return filename
+
+
+def loadSnapshot(control, filename=None, files=None):
+    """
+    Carga el catálogo desde el snapshot si existe, es de la versión
+    actual, tiene el modo confiable del catálogo del controlador y los
+    archivos de datos no han cambiado. Retorna True si el catálogo se
+    cargó desde el snapshot
+    """
+    if filename is None:
+        filename = cf.data_dir + SNAPSHOT_FILE
+    if files is None:
+        files = dataFiles()
+    if not os.path.exists(filename):
+        return False
+    with open(filename, 'rb') as input_file:
+        try:
+            header = pickle.load(input_file)
+            if header.get('version') != SNAPSHOT_VERSION:
+                return False
+            # el catálogo conserva el modo confiable del controlador
+            if header.get('trusted') != control['model']['trusted']:
+                return False
+            sources = [f['file'] for f in header['sources']]
+            if sources != files:
+                return False
+            for fingerprint in header['sources']:
+                if not isFreshFingerprint(fingerprint):
+                    return False
+            control['model'] = pickle.load(input_file)
+        except (pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, KeyError, TypeError):
+            # snapshot dañado o de otra versión del código
+            return False
+    return True
+
+
+def readRows(filename, columns=None, counters=None, records=True):
+    """
+    Lee un archivo CSV como un flujo de registros. El archivo se lee
+    por bloques de CSV_BUFFER_SIZE bytes y las posiciones de las
+    columnas se calculan una sola vez desde el encabezado (ver
+    parseRows). El archivo se cierra al terminar el recorrido
+    """
+    if counters is not None:
+        counters.setdefault('malformed', 0)
+    with open(filename, encoding='utf-8', newline='',
+              buffering=CSV_BUFFER_SIZE) as data:
+        reader = csv.reader(data)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield from parseRows(reader, header, columns, counters, records,
+                             filename)
+
+
+def parseRows(reader, header, columns=None, counters=None, records=True,
+              filename=None):
+    """
+    Convierte las filas de un csv.reader en registros. Cada registro
+    es un diccionario con solo las columnas pedidas (todas si columns
+    es None) o, si records es False, una tupla con sus valores en el
+    orden de columns. Las filas vacías o con un número distinto de
+    campos que el encabezado se ignoran y se cuentan en
+    counters['malformed'] si se entrega el diccionario counters
+    """
+    if columns is None:
+        columns = header
+    missing = [col for col in columns if col not in header]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in {filename}")
+    positions = [header.index(col) for col in columns]
+    width = len(header)
+    if not records:
+        if positions == list(range(width)):
+            # todas las columnas en orden, la fila es el registro
+            def record(row):
+                return row
+        elif len(positions) == 1:
+            def record(row):
+                return (row[positions[0]],)
+        else:
+            record = operator.itemgetter(*positions)
+    elif positions == list(range(width)):
+        # todas las columnas en orden, zip evita indexar cada campo
+        def record(row):
+            return dict(zip(columns, row))
+    else:
+        fields = list(zip(columns, positions))
+
+        def record(row):
+            return {col: row[pos] for col, pos in fields}
+    malformed = 0
+    try:
+        for row in reader:
+            if len(row) == width:
+                yield record(row)
+            else:
+                malformed += 1
+    finally:
+        if counters is not None:
+            counters['malformed'] = counters.get('malformed', 0) + malformed
+
+
+def loadBooks(catalog, booksfile=None, counters=None):
     """
     Carga los libros del archivo.  Por cada libro se toman sus autores y por
     cada uno de ellos, se crea en la lista de autores, a dicho autor y una
     referencia al libro que se esta procesando.
     """
-    booksfile = cf.data_dir + 'GoodReads/books.csv'
-    input_file = csv.DictReader(open(booksfile, encoding='utf-8'))
-    for book in input_file:
+    if booksfile is None:
+        booksfile = cf.data_dir + BOOKS_FILE
+    rows = readRows(booksfile, BOOKS_COLUMNS, counters, records=False)
+    return addBooks(catalog, rows)
+
+
+def addBooks(catalog, books):
+    """
+    Agrega al catálogo los libros de un iterable de registros, cada
+    uno con los valores de BOOKS_COLUMNS en orden
+    """
+    for book in books:
         # model.addBook(catalog, book)
         # print(book, type(book))
         # book = format_book(book)
         model.add_book(catalog, book)
+    model.build_author_prefix_index(catalog)
     # return model.bookSize(catalog), model.authorSize(catalog)
     return model.books_size(catalog), model.authors_size(catalog)
 
 
-def format_book(book):
-    int_key_lt = [
-        "book_id",
-        "goodreads_book_id",
-        "best_book_id",
-        "work_id",
-        "books_count",
-        "ratings_count",
-        "work_ratings_count",
-        "work_text_reviews_count",
-        "ratings_1",
-        "ratings_2",
-        "ratings_3",
-        "ratings_4",
-        "ratings_5",
-    ]
-
-    big_int_key_lt = [
-        "isbn13",
-    ]
-
-    float_key_lt = [
-        "average_rating",
-    ]
-
-    str_key_lt = [
-        "authors",
-        "original_title",
-        "title",
-        "isbn",
-        "isbn13",
-        "original_publication_year",
-        "language_code",
-        "image_url",
-        "small_image_url",
-    ]
-
-    for key in int_key_lt:
-        book[key] = int(book[key])
-
-    for key in big_int_key_lt:
-        book[key] = int(float(book[key]))
-
-    for key in float_key_lt:
-        book[key] = float(book[key])
-  
-    for key in str_key_lt:
-        book[key] = str(book[key])
-
-    return book
-
-
-def loadTags(catalog):
+def loadTags(catalog, tagsfile=None, counters=None):
     """
     Carga todos los tags del archivo y los agrega a la lista de tags
     """
-    tagsfile = cf.data_dir + 'GoodReads/tags.csv'
-    input_file = csv.DictReader(open(tagsfile, encoding='utf-8'))
-    for tag in input_file:
+    if tagsfile is None:
+        tagsfile = cf.data_dir + TAGS_FILE
+    return addTags(catalog, readRows(tagsfile, TAGS_COLUMNS, counters))
+
+
+def addTags(catalog, tags):
+    """
+    Agrega al catálogo los tags de un iterable de registros
+    """
+    for tag in tags:
         # model.addTag(catalog, tag)
         model.add_tag(catalog, tag)
     # return model.tagSize(catalog)
     return model.tags_size(catalog)
 
 
-def loadBooksTags(catalog):
+def loadBooksTags(catalog, booktagsfile=None, counters=None):
     """
     Carga la información que asocia tags con libros.
     """
-    booktagsfile = cf.data_dir + 'GoodReads/book_tags.csv'
-    input_file = csv.DictReader(open(booktagsfile, encoding='utf-8'))
-    for booktag in input_file:
+    if booktagsfile is None:
+        booktagsfile = cf.data_dir + BOOK_TAGS_FILE
+    rows = readRows(booktagsfile, BOOK_TAGS_COLUMNS, counters,
+                    records=False)
+    return addBooksTags(catalog, rows)
+
+
+def addBooksTags(catalog, booktags):
+    """
+    Agrega al catálogo las asociaciones tag-libro de un iterable de
+    registros, cada uno con los valores de BOOK_TAGS_COLUMNS en orden
+    """
+    for booktag in booktags:
         # model.addBookTag(catalog, booktag)
-        model.add_book_tag(catalog, booktag)
+        model.add_book_tag_values(catalog, *booktag)
     # return model.bookTagSize(catalog)
     return model.book_tags_size(catalog)
 
 
+# Funciones para la carga incremental
+
+def loadDelta(control, booksfile=None, tagsfile=None, booktagsfile=None):
+    """
+    Carga sobre el catálogo ya construido un fragmento de cada archivo
+    (con el mismo encabezado que el original), sin recargar todo.
+    Los libros con un book_id nuevo se agregan, los que ya existen se
+    actualizan en su lugar si cambió alguno de sus valores; lo mismo
+    pasa con los tags (por tag_id) y con las asociaciones tag-libro,
+    cuyo conteo se reemplaza por el del fragmento. Retorna cuántos
+    registros se agregaron, actualizaron o ya estaban iguales, cuántas
+    asociaciones no tienen libro en el catálogo y cuántas filas se
+    ignoraron por tener un número distinto de campos
+    """
+    catalog = control['model']
+    delta = {
+        'books_added': 0,
+        'books_updated': 0,
+        'books_unchanged': 0,
+        'tags_added': 0,
+        'tags_updated': 0,
+        'tags_unchanged': 0,
+        'book_tags_added': 0,
+        'book_tags_updated': 0,
+        'book_tags_unchanged': 0,
+        'book_tags_unmatched': 0,
+        'rows_touched': 0,
+        'rows_malformed': 0,
+    }
+    counters = {}
+    if booksfile is not None:
+        for book in readRows(booksfile, BOOKS_COLUMNS, counters):
+            status = model.update_book(catalog, book)
+            delta['books_' + (status or 'unchanged')] += 1
+    if tagsfile is not None:
+        for tag in readRows(tagsfile, TAGS_COLUMNS, counters):
+            status = model.update_tag(catalog, tag)
+            delta['tags_' + (status or 'unchanged')] += 1
+    if booktagsfile is not None:
+        for booktag in readRows(booktagsfile, BOOK_TAGS_COLUMNS, counters,
+                                records=False):
+            status = model.update_book_tag(catalog, *booktag)
+            delta['book_tags_' + (status or 'unchanged')] += 1
+    delta['rows_touched'] = (delta['books_added'] + delta['books_updated']
+                             + delta['tags_added'] + delta['tags_updated']
+                             + delta['book_tags_added']
+                             + delta['book_tags_updated'])
+    delta['rows_malformed'] = counters.get('malformed', 0)
+    return delta
+
+
 # Funciones de ordenamiento
 def sortBooks(catalog):
     """
@@ -147,22 +697,153 @@ def getBooksByAuthor(control, authorname):
     Retrona los libros de un autor
     """
     # author = model.getBooksByAuthor(control['model'], authorname)
-    author = model.get_books_by_author(control['model'], authorname)
+    author = cachedQuery(control, 'author', model.get_books_by_author,
+                         authorname)
     return author
 
 
-def getBestBooks(control, number):
+def getBestBooks(control, number, rank_by='average_rating'):
     """
-    Retorna los mejores libros
+    Retorna los mejores libros por average_rating o por rating
+    ponderado (rank_by='weighted_rating')
     """
     # bestbooks = model.getBestBooks(control['model'], number)
-    bestbooks = model.get_best_books(control['model'], number)
+    bestbooks = cachedQuery(control, 'best', model.get_best_books, number,
+                            rank_by)
     return bestbooks
 
 
+def getBestAuthors(control, number, min_books=1):
+    """
+    Retorna los autores con mejor promedio de rating, entre los que
+    tienen al menos min_books libros
+    """
+    return cachedQuery(control, 'best_authors', model.get_best_authors,
+                       number, min_books)
+
+
+def getAuthorsByPrefix(control, prefix, number=10):
+    """
+    Retorna los primeros number autores cuyo nombre empieza por prefix
+    """
+    return cachedQuery(control, 'prefix', model.get_authors_by_prefix,
+                       prefix, number)
+
+
+def searchBooksByTitle(control, query, mode='and',
+                       rank_by='average_rating', number=10):
+    """
+    Retorna los libros con las palabras de query en el título, todas
+    (mode='and') o alguna (mode='or'), ordenados por rank_by
+    """
+    return cachedQuery(control, 'title', model.search_books_by_title,
+                       query, mode, rank_by, number)
+
+
+def filterBooks(control, year_from=None, year_to=None, language=None,
+                number=None):
+    """
+    Retorna los libros publicados entre year_from y year_to en el
+    idioma language, los filtros en None no se aplican
+    """
+    return cachedQuery(control, 'filter', model.filter_books,
+                       year_from, year_to, language, number)
+
+
+def getBook(control, column, key):
+    """
+    Retorna el libro con la llave key en la columna column: book_id,
+    goodreads_book_id, isbn o isbn13
+    """
+    return model.get_book_by_key(control['model'], column, key)
+
+
+def getDuplicateKeys(control):
+    """
+    Retorna las llaves de libros repetidas que se encontraron en la
+    carga
+    """
+    return model.get_duplicate_keys(control['model'])
+
+
+def getBooksByTag(control, tag, number=None):
+    """
+    Retorna los libros marcados con el tag
+    """
+    return cachedQuery(control, 'tag_books', model.get_books_by_tag,
+                       tag, number)
+
+
+def getBookTags(control, book_id):
+    """
+    Retorna los tags de un libro con el número de veces que fue
+    marcado con cada uno
+    """
+    return cachedQuery(control, 'book_tags', model.get_book_tags, book_id)
+
+
 def countBooksByTag(control, tag):
     """
     Retorna los libros que fueron etiquetados con el tag
     """
     # return model.countBooksByTag(control['model'], tag)
-    return model.count_books_by_tag(control['model'], tag)
+    return cachedQuery(control, 'tag', model.count_books_by_tag, tag)
+
+
+def getRatingStats(control):
+    """
+    Retorna el histograma de calificaciones por estrella de todo el
+    catálogo y los percentiles de average_rating y ratings_count
+    """
+    return cachedQuery(control, 'rating_stats', ratingStats)
+
+
+def ratingStats(catalog):
+    """
+    Calcula las estadísticas globales de calificaciones del catálogo
+    """
+    # ratings usa NumPy, solo se importa al pedir estas estadísticas
+    import ratings
+    return {'histogram': ratings.rating_histogram(catalog),
+            'average_rating': ratings.rating_percentiles(catalog),
+            'ratings_count': ratings.rating_percentiles(catalog,
+                                                        'ratings_count')}
+
+
+def getRatingsByAuthor(control, number=10, min_books=1):
+    """
+    Retorna los autores con mejor rating bayesiano sobre las
+    calificaciones de todos sus libros, entre los que tienen al menos
+    min_books libros
+    """
+    return cachedQuery(control, 'ratings_author', topRatings,
+                       'ratings_by_author', number, min_books)
+
+
+def getRatingsByLanguage(control, number=10, min_books=1):
+    """
+    Retorna los idiomas con mejor rating bayesiano sobre las
+    calificaciones de todos sus libros
+    """
+    return cachedQuery(control, 'ratings_language', topRatings,
+                       'ratings_by_language', number, min_books)
+
+
+def topRatings(catalog, grouping, number, min_books):
+    """
+    Agrupa las calificaciones del catálogo con la función grouping del
+    módulo ratings (p.ej. 'ratings_by_author') y retorna los mejores
+    grupos
+    """
+    # ratings usa NumPy, solo se importa al pedir estas estadísticas
+    import ratings
+    grouped = getattr(ratings, grouping)(catalog)
+    return ratings.top_groups(grouped, number,
+                              min_books=min_books)
+
+
+def getWeightedRating(control, book):
+    """
+    Retorna el rating ponderado de un libro
+    """
+    return model.get_weighted_rating(control['model'], book)
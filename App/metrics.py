@@ -0,0 +1,99 @@
+"""
+Este módulo registra las latencias de las operaciones sobre el catálogo y
+calcula sus percentiles. Lo usan el modo por lotes de la vista y las
+herramientas de medición.
+"""
+
+# native python modules
+import math
+import threading
+
+# percentiles reported for every operation
+# :data: PERCENTILES
+PERCENTILES: tuple = (50, 90, 95, 99)
+"""
+Percentiles que se reportan para cada operación.
+"""
+
+
+def new_recorder() -> dict:
+    """new_recorder crea un registro vacío de latencias.
+
+    Returns:
+        dict: registro con las muestras por operación y un candado para usarlo
+            desde varios hilos.
+    """
+    recorder = {
+        "samples": {},
+        "lock": threading.Lock(),
+    }
+    return recorder
+
+
+def record(recorder: dict, name: str, seconds: float) -> None:
+    """record agrega una muestra de latencia de una operación.
+
+    Args:
+        recorder (dict): registro de latencias.
+        name (str): nombre de la operación.
+        seconds (float): duración de la operación en segundos.
+    """
+    with recorder["lock"]:
+        recorder["samples"].setdefault(name, []).append(seconds)
+
+
+def percentile(samples: list, pct: float) -> float:
+    """percentile calcula un percentil de una lista ordenada de muestras con
+    interpolación lineal entre los rangos vecinos.
+
+    Args:
+        samples (list): muestras ordenadas de menor a mayor.
+        pct (float): percentil entre 0 y 100.
+
+    Returns:
+        float: el valor del percentil, 0.0 si no hay muestras.
+    """
+    if not samples:
+        return 0.0
+    rank = (len(samples) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return samples[low]
+    return samples[low] + (samples[high] - samples[low]) * (rank - low)
+
+
+def summarize(samples: list) -> dict:
+    """summarize resume una lista de latencias en milisegundos: número de
+    muestras, promedio, máximo y percentiles.
+
+    Args:
+        samples (list): latencias en segundos.
+
+    Returns:
+        dict: resumen de las latencias en milisegundos.
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+    summary = {
+        "count": count,
+        "mean_ms": 1000.0 * sum(ordered) / count if count else 0.0,
+        "max_ms": 1000.0 * ordered[-1] if count else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = 1000.0 * percentile(ordered, pct)
+    return summary
+
+
+def summary(recorder: dict) -> dict:
+    """summary resume las latencias de todas las operaciones del registro.
+
+    Args:
+        recorder (dict): registro de latencias.
+
+    Returns:
+        dict: resumen de latencias por operación.
+    """
+    with recorder["lock"]:
+        samples = {name: list(lt) for name, lt in recorder["samples"].items()}
+    return {name: summarize(lt) for name, lt in samples.items()}
@@ -1,10 +1,19 @@
 # nueva implementacion
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+from array import array
 from DISClib.ADT.lists import List
 from DISClib.ADT.lists import clone
 from DISClib.ADT.lists import translate
 # from DISClib.ADT.queue import Queue
 # from DISClib.ADT.stack import Stack
-# from DISClib.ADT.maps import Map
+from DISClib.ADT.maps import Map
+from DISClib.DataStructures.chaininghashtable import SeparateChaining
+from DISClib.ADT import orderedmap as om
+from bookstore import BookStore
 
 # antigua implementacion
 # import config as cf
@@ -18,14 +27,83 @@ El catálogo tendrá tres listas, una para libros, otra para autores
 y otra para géneros
 """
 
+# estructuras de datos validas para el indice de autores
+AUTHOR_MAP_DSTRUCT_LT = (
+    "SeparateChaining",
+)
+
+# modo confiable (trusted) por defecto de las estructuras del catálogo. Se
+# enciende por catálogo con new_catalog(trusted=True) cuando los loaders ya
+# validan sus datos, así las estructuras omiten sus verificaciones
+CATALOG_TRUSTED = False
+
+# columnas que identifican un libro, cada una con un indice único
+BOOK_KEY_COLUMNS = (
+    "book_id",
+    "goodreads_book_id",
+    "isbn",
+)
+
+# columnas de llaves que se repiten entre libros, cada una con un indice
+# de llave -> posiciones. El archivo redondea isbn13 a 12 cifras
+# significativas, así varios libros comparten el mismo valor
+BOOK_MULTI_KEY_COLUMNS = (
+    "isbn13",
+)
+
+# columnas de texto que se indexan para la búsqueda por palabras
+TITLE_COLUMNS = (
+    "title",
+    "original_title",
+)
+
+# columnas por las que se pueden ordenar los resultados de la búsqueda
+TITLE_RANK_COLUMNS = (
+    "average_rating",
+    "ratings_count",
+)
+
+# prior del rating ponderado: average_rating promedio de los libros y
+# número de calificaciones que pesa ese promedio. Son fijos para que el
+# puntaje de un libro solo dependa de sus columnas y se actualice solo
+WEIGHTED_RATING_MEAN = 4.0
+WEIGHTED_RATING_WEIGHT = 10000
+
+# modos de get_best_books y el indice ordenado de cada uno
+BEST_BOOKS_RANKINGS = {
+    "average_rating": "rating_idx",
+    "weighted_rating": "weighted_idx",
+}
+
+# palabras de un título: secuencias de letras y dígitos
+TITLE_TOKEN_RE = re.compile(r"\w+")
+
 # Construccion de modelos
 
 
-def new_catalog() -> dict:
-    """newCatalog _summary_
+def new_catalog(author_dstruct: str = "SeparateChaining",
+                prior_mean: float = WEIGHTED_RATING_MEAN,
+                prior_weight: float = WEIGHTED_RATING_WEIGHT,
+                trusted: bool = CATALOG_TRUSTED) -> dict:
+    """new_catalog crea el catálogo vacío de libros, autores y tags.
+
+    Args:
+        author_dstruct (str, optional): estructura para los autores. Con
+            "SeparateChaining" los autores viven en un Map indexado por el
+            nombre normalizado del autor, con "SingleLinked" en una lista que
+            se recorre con cmp_authors. Por defecto es "SeparateChaining".
+        prior_mean (float, optional): rating hacia el que se acerca el rating
+            ponderado de los libros con pocas calificaciones. Por defecto
+            WEIGHTED_RATING_MEAN.
+        prior_weight (float, optional): número de calificaciones que pesa
+            prior_mean en el rating ponderado. Por defecto
+            WEIGHTED_RATING_WEIGHT.
+        trusted (bool, optional): crea las listas y mapas del catálogo en modo
+            confiable, sin verificar tipos ni posiciones. Por defecto
+            CATALOG_TRUSTED.
 
     Returns:
-        dict: _description_
+        dict: el catálogo vacío.
     """
     catalog = {
         "books": None,
@@ -34,29 +112,82 @@ def new_catalog() -> dict:
         "book_tags": None
     }
 
-    catalog["books"] = List(dstruct="ArrayList")
-    catalog["authors"] = List(dstruct="SingleLinked",
-                              cmp_function=cmp_authors)
+    # modo confiable de las estructuras, lo heredan los autores nuevos
+    catalog["trusted"] = trusted
+    # almacén columnar, cada libro es una vista BookView
+    catalog["books"] = BookStore()
+    if author_dstruct in AUTHOR_MAP_DSTRUCT_LT:
+        catalog["authors"] = Map(dstruct=author_dstruct, trusted=trusted)
+    else:
+        catalog["authors"] = List(dstruct=author_dstruct,
+                                  cmp_function=cmp_authors,
+                                  trusted=trusted)
     catalog["tags"] = List(dstruct="SingleLinked",
-                           cmp_function=cmp_tag_names)
-    catalog["book_tags"] = List()
+                           cmp_function=cmp_tag_names,
+                           trusted=trusted)
+    # las asociaciones tag-libro no se guardan, solo se cuentan y se
+    # cruzan con los libros (ver add_book_tag)
+    catalog["book_tags"] = 0
+    catalog["book_tags_unmatched"] = 0
+    # indices de tags: tag_name -> tag, tag_id -> tag y tag_id -> libros
+    catalog["tag_names"] = Map(dstruct="SeparateChaining", trusted=trusted)
+    catalog["tag_ids"] = Map(dstruct="SeparateChaining", trusted=trusted)
+    catalog["tag_books"] = Map(dstruct="SeparateChaining", trusted=trusted)
+    # tags de cada libro: posición en el almacén -> tags y conteos
+    catalog["book_tag_counts"] = Map(dstruct="SeparateChaining",
+                                     trusted=trusted)
+    # indices únicos por cada llave del libro -> posición en el almacén
+    catalog["book_keys"] = {}
+    for column in BOOK_KEY_COLUMNS:
+        catalog["book_keys"][column] = Map(dstruct="SeparateChaining",
+                                           trusted=trusted)
+    # indices no únicos por llave del libro -> posiciones en el almacén
+    catalog["book_multi_keys"] = {}
+    for column in BOOK_MULTI_KEY_COLUMNS:
+        catalog["book_multi_keys"][column] = Map(dstruct="SeparateChaining",
+                                                 trusted=trusted)
+    # llaves repetidas que se encontraron al agregar libros:
+    # (columna, llave) -> repeticiones en orden
+    catalog["duplicate_keys"] = Map(dstruct="SeparateChaining",
+                                    trusted=trusted)
+    # indice ordenado (RBT) de los libros por average_rating
+    catalog["rating_idx"] = om.newMap(omaptype="RBT")
+    # rating ponderado de cada libro por posición y su indice ordenado
+    catalog["weighted_prior"] = (prior_mean, prior_weight)
+    catalog["weighted_ratings"] = array("d")
+    catalog["weighted_idx"] = om.newMap(omaptype="RBT")
+    # indice ordenado (RBT) por año de publicación y facet de idioma
+    catalog["year_idx"] = om.newMap(omaptype="RBT")
+    catalog["language_idx"] = Map(dstruct="SeparateChaining", trusted=trusted)
+    # indice invertido de palabras de los títulos -> posiciones de libros
+    catalog["title_idx"] = Map(dstruct="SeparateChaining", trusted=trusted)
+    # indice de prefijos: llaves de autores ordenadas y sus autores
+    catalog["author_prefix"] = new_author_prefix_index()
+    # versión del catálogo, cambia con cada libro, tag o asociación
+    catalog["version"] = 0
     return catalog
 
 
 # funciones para comparar elementos dentro de las listas
-def cmp_authors(author_name1: str, author2: dict) -> int:
-    """cmp_authors _summary_
+def cmp_authors(author_key1, author2: dict) -> int:
+    """cmp_authors compara la llave canónica de un autor con la de un autor de
+    la lista. Las llaves se calculan una sola vez con normalize_author_name,
+    así la comparación no normaliza los nombres en cada llamada.
 
     Args:
-        author1 (dict): _description_
-        author2 (dict): _description_
+        author_key1 (str | dict): llave canónica del autor buscado, o el autor
+            mismo.
+        author2 (dict): autor de la lista.
 
     Returns:
-        int: _description_
+        int: 0 si son iguales, 1 si el primero es mayor, -1 si es menor.
     """
-    if author_name1.lower() == author2["name"].lower():
+    if isinstance(author_key1, dict):
+        author_key1 = author_key1["key"]
+    author_key2 = author2["key"]
+    if author_key1 == author_key2:
         return 0
-    elif author_name1.lower() > author2["name"].lower():
+    elif author_key1 > author_key2:
         return 1
     return -1
 
@@ -71,7 +202,6 @@ def cmp_tag_names(tag_name1: str, tag2: dict) -> int:
     Returns:
         int: _description_
     """
-    print(tag_name1, tag2)
     if tag_name1 == tag2["name"]:
         return 0
     elif tag_name1 > tag2["name"]:
@@ -92,12 +222,427 @@ def add_book(catalog: dict, book: dict) -> dict:
     """
     # TODO add docstring
     books_lt = catalog["books"]
-    books_lt.add_last(book)
+    book = books_lt.add_last(book)
+    touch_catalog(catalog)
+    add_book_keys(catalog, book)
+    add_book_indexes(catalog, book)
+    return catalog
+
+
+def add_book_keys(catalog: dict, book: dict) -> dict:
+    """add_book_keys agrega un libro a los indices únicos de book_id,
+    goodreads_book_id e isbn, y al indice no único de isbn13. Las llaves
+    vacías no se indexan. Si una llave única ya pertenece a otro libro,
+    el indice conserva el primero y la repetición queda registrada en
+    catalog["duplicate_keys"].
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro del almacén de libros.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    for column in BOOK_KEY_COLUMNS:
+        key = normalize_book_key(column, book[column])
+        if key is None:
+            continue
+        keys_idx = catalog["book_keys"][column]
+        pos = get_map_value(keys_idx, key)
+        if pos is None:
+            keys_idx.put(key, book.pos)
+        elif pos != book.pos:
+            add_duplicate_key(catalog, column, key, book.pos, pos)
+    for column in BOOK_MULTI_KEY_COLUMNS:
+        key = normalize_book_key(column, book[column])
+        if key is not None:
+            add_posting(catalog["book_multi_keys"][column], key, book.pos)
+    return catalog
+
+
+def remove_book_keys(catalog: dict, book: dict,
+                     restore: bool = True) -> dict:
+    """remove_book_keys retira las llaves de un libro de los indices. Si
+    el libro tenía una llave única que otro libro repetía, la llave pasa
+    al primer libro que la repitió (ver restore_book_key); si el libro
+    era el que la repetía, la repetición sale de
+    catalog["duplicate_keys"].
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro del almacén de libros.
+        restore (bool, optional): entrega las llaves libres a los libros
+            que las repetían. update_book lo hace después de volver a
+            agregar las llaves, así un libro que no cambia una llave no
+            la pierde. Por defecto True.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    for column in BOOK_KEY_COLUMNS:
+        key = normalize_book_key(column, book[column])
+        if key is None:
+            continue
+        keys_idx = catalog["book_keys"][column]
+        if get_map_value(keys_idx, key) == book.pos:
+            keys_idx.remove(key)
+            if restore:
+                restore_book_key(catalog, column, key)
+        else:
+            remove_duplicate_key(catalog, column, key, book.pos)
+    for column in BOOK_MULTI_KEY_COLUMNS:
+        key = normalize_book_key(column, book[column])
+        if key is not None:
+            remove_posting(catalog["book_multi_keys"][column], key,
+                           book.pos)
+    return catalog
+
+
+def add_duplicate_key(catalog: dict, column: str, key, pos: int,
+                      first_pos: int) -> None:
+    """add_duplicate_key registra en catalog["duplicate_keys"] que el libro
+    de una posición repite una llave única, al final de las repeticiones de
+    esa (columna, llave).
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str): columna de la llave.
+        key (any): llave normalizada.
+        pos (int): posición del libro que repite la llave.
+        first_pos (int): posición del libro dueño de la llave.
+    """
+    duplicates_idx = catalog["duplicate_keys"]
+    duplicates = get_map_value(duplicates_idx, (column, key))
+    if duplicates is None:
+        duplicates = List(trusted=catalog["trusted"])
+        duplicates_idx.put((column, key), duplicates)
+    duplicates.add_last({"column": column,
+                         "key": key,
+                         "pos": pos,
+                         "first_pos": first_pos})
+
+
+def restore_book_key(catalog: dict, column: str, key) -> None:
+    """restore_book_key entrega una llave única que quedó libre al primer
+    libro que la repetía, si hay alguno. Esa repetición sale de
+    catalog["duplicate_keys"] y las demás repeticiones de la llave
+    apuntan al nuevo dueño. Solo revisa las repeticiones de la llave.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str): columna de la llave.
+        key (any): llave normalizada.
+    """
+    duplicates_idx = catalog["duplicate_keys"]
+    duplicates = get_map_value(duplicates_idx, (column, key))
+    if duplicates is None:
+        return
+    holder = duplicates.remove_first()
+    catalog["book_keys"][column].put(key, holder["pos"])
+    for duplicate in duplicates:
+        duplicate["first_pos"] = holder["pos"]
+    if duplicates.is_empty():
+        duplicates_idx.remove((column, key))
+
+
+def remove_duplicate_key(catalog: dict, column: str, key, pos: int) -> None:
+    """remove_duplicate_key retira de catalog["duplicate_keys"] la
+    repetición de una llave única por el libro de una posición.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str): columna de la llave.
+        key (any): llave normalizada.
+        pos (int): posición del libro que repetía la llave.
+    """
+    duplicates_idx = catalog["duplicate_keys"]
+    duplicates = get_map_value(duplicates_idx, (column, key))
+    if duplicates is None:
+        return
+    for idx, duplicate in enumerate(duplicates):
+        if duplicate["pos"] == pos:
+            duplicates.remove_element(idx)
+            break
+    if duplicates.is_empty():
+        duplicates_idx.remove((column, key))
+
+
+def normalize_book_key(column: str, value):
+    """normalize_book_key convierte el valor de una llave de libro al tipo con
+    el que se guarda en su indice: entero para los ids e isbn13, texto para
+    isbn. El archivo escribe isbn13 en notación científica con 12 cifras
+    significativas (p.ej. 9.78043902348e+12), así que el valor se redondea a
+    esa misma precisión para que una búsqueda con el isbn13 completo encuentre
+    el libro.
+
+    Args:
+        column (str): columna de la llave.
+        value (any): valor de la llave, del libro o de la búsqueda.
+
+    Returns:
+        any: la llave normalizada o None si está vacía.
+    """
+    if value is None or value == "":
+        return None
+    if column == "isbn":
+        return str(value).strip()
+    if column == "isbn13":
+        return int(float(f"{float(value):.12g}"))
+    return int(value)
+
+
+def add_book_indexes(catalog: dict, book: dict) -> dict:
+    """add_book_indexes agrega un libro que ya está en el almacén a los indices
+    de rating, título, año, idioma y autores.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro del almacén de libros.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    add_book_rating(catalog, book)
+    add_book_title(catalog, book)
+    add_book_facets(catalog, book)
     book_author_lt = book["authors"].split(",")
     for author in book_author_lt:
         add_book_author(catalog, author.strip(), book)
     return catalog
 
+
+def update_book(catalog: dict, book: dict) -> str:
+    """update_book agrega un libro nuevo o actualiza en su misma posición un
+    libro que ya existe con el mismo book_id. Para actualizarlo lo retira de
+    los indices con sus valores anteriores y lo vuelve a agregar con los
+    nuevos, así el costo depende del libro y no del tamaño del catálogo.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (dict): registro con todas las columnas del archivo de libros.
+
+    Returns:
+        str: "added" si el libro es nuevo, "updated" si cambió o None si ya
+            estaba igual.
+    """
+    books_lt = catalog["books"]
+    pos = get_map_value(catalog["book_keys"]["book_id"],
+                        normalize_book_key("book_id", book["book_id"]))
+    if pos is None:
+        add_book(catalog, book)
+        return "added"
+    if books_lt.matches(pos, book):
+        return None
+    old_book = books_lt.get_element(pos)
+    old_keys = [(column, normalize_book_key(column, old_book[column]))
+                for column in BOOK_KEY_COLUMNS]
+    remove_book_keys(catalog, old_book, restore=False)
+    remove_book_indexes(catalog, old_book)
+    book = books_lt.update(pos, book)
+    touch_catalog(catalog)
+    add_book_keys(catalog, book)
+    add_book_indexes(catalog, book)
+    # las llaves que el libro ya no tiene pasan a los libros que las repetían
+    for column, key in old_keys:
+        if key is not None and \
+                get_map_value(catalog["book_keys"][column], key) is None:
+            restore_book_key(catalog, column, key)
+    return "updated"
+
+
+def remove_book_indexes(catalog: dict, book: dict) -> dict:
+    """remove_book_indexes retira un libro de los indices de rating, título,
+    año, idioma y autores, con los valores que tiene guardados. Los autores que
+    se quedan sin libros salen del catálogo.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro del almacén de libros.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    om.remove(catalog["rating_idx"], (-book["average_rating"], book.pos))
+    om.remove(catalog["weighted_idx"],
+              (-catalog["weighted_ratings"][book.pos], book.pos))
+    title_idx = catalog["title_idx"]
+    for term in get_title_terms(book):
+        remove_posting(title_idx, term, book.pos)
+    year = parse_year(book["original_publication_year"])
+    if year is not None:
+        om.remove(catalog["year_idx"], (year, book.pos))
+    remove_posting(catalog["language_idx"], book["language_code"], book.pos)
+    for author_name in book["authors"].split(","):
+        remove_book_author(catalog, author_name.strip(), book)
+    return catalog
+
+
+def add_posting(postings_idx: Map, key, pos: int) -> array:
+    """add_posting agrega una posición a la lista ordenada de posiciones de una
+    llave, y crea la lista si no existe. Al final si es la mayor, lo normal al
+    cargar, y si no en su lugar con búsqueda binaria.
+
+    Args:
+        postings_idx (Map): indice de llave -> arreglo de posiciones.
+        key (any): llave del indice.
+        pos (int): posición del libro.
+
+    Returns:
+        array: la lista de posiciones de la llave.
+    """
+    postings = get_map_value(postings_idx, key)
+    if postings is None:
+        postings = array("l")
+        postings_idx.put(key, postings)
+    if not postings or postings[-1] < pos:
+        postings.append(pos)
+    else:
+        postings.insert(bisect.bisect_left(postings, pos), pos)
+    return postings
+
+
+def remove_posting(postings_idx: Map, key, pos: int) -> None:
+    """remove_posting retira una posición de la lista ordenada de posiciones de
+    una llave, y la llave del indice si su lista queda vacía.
+
+    Args:
+        postings_idx (Map): indice de llave -> arreglo de posiciones.
+        key (any): llave del indice.
+        pos (int): posición del libro.
+    """
+    postings = get_map_value(postings_idx, key)
+    if postings is None:
+        return
+    idx = bisect.bisect_left(postings, pos)
+    if idx < len(postings) and postings[idx] == pos:
+        postings.pop(idx)
+    if not postings:
+        postings_idx.remove(key)
+
+
+def add_book_rating(catalog: dict, book: dict) -> dict:
+    """add_book_rating agrega un libro a los indices ordenados por
+    average_rating y por rating ponderado, y guarda su rating ponderado en la
+    columna catalog["weighted_ratings"]. La llave es (-rating, posición del
+    libro), así el recorrido en orden del RBT da los libros de mayor a menor
+    rating y los empates quedan en orden de carga, igual que un ordenamiento
+    estable.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro que ya se agregó al almacén de libros.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    rating_key = (-book["average_rating"], book.pos)
+    om.put(catalog["rating_idx"], rating_key, book)
+    score = weighted_rating(book, *catalog["weighted_prior"])
+    scores = catalog["weighted_ratings"]
+    if book.pos == len(scores):
+        scores.append(score)
+    else:
+        scores[book.pos] = score
+    om.put(catalog["weighted_idx"], (-score, book.pos), book)
+    return catalog
+
+
+def weighted_rating(book: dict,
+                    prior_mean: float = WEIGHTED_RATING_MEAN,
+                    prior_weight: float = WEIGHTED_RATING_WEIGHT) -> float:
+    """weighted_rating calcula el rating ponderado bayesiano de un libro:
+    (v * R + m * C) / (v + m), con R su average_rating, v su ratings_count,
+    C el rating prior_mean y m el peso prior_weight. Un libro con pocas
+    calificaciones queda cerca de C y uno con muchas cerca de su propio
+    average_rating, así tres calificaciones de 5 estrellas no superan a miles
+    de 4.8.
+
+    Args:
+        book (BookView): libro del almacén de libros.
+        prior_mean (float, optional): rating C. Por defecto
+            WEIGHTED_RATING_MEAN.
+        prior_weight (float, optional): peso m en número de calificaciones. Por
+            defecto WEIGHTED_RATING_WEIGHT.
+
+    Returns:
+        float: rating ponderado del libro.
+    """
+    votes = book["ratings_count"] or 0
+    if votes + prior_weight <= 0:
+        return prior_mean
+    return ((votes * book["average_rating"] + prior_weight * prior_mean)
+            / (votes + prior_weight))
+
+
+def get_weighted_rating(catalog: dict, book: dict) -> float:
+    """get_weighted_rating retorna el rating ponderado que el catálogo guardó
+    para un libro al agregarlo.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro del almacén de libros.
+
+    Returns:
+        float: rating ponderado del libro.
+    """
+    return catalog["weighted_ratings"][book.pos]
+
+
+def add_book_title(catalog: dict, book: dict) -> dict:
+    """add_book_title agrega la posición de un libro a la lista de posiciones
+    (posting list) de cada palabra de su title y original_title. Las posiciones
+    se guardan en arreglos de enteros y, como los libros se agregan en orden,
+    cada arreglo queda ordenado sin reordenarlo.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro que ya se agregó al almacén de libros.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    title_idx = catalog["title_idx"]
+    for term in get_title_terms(book):
+        add_posting(title_idx, term, book.pos)
+    return catalog
+
+
+def get_title_terms(book: dict) -> set:
+    """get_title_terms retorna las palabras distintas del title y
+    original_title de un libro.
+
+    Args:
+        book (BookView): libro del almacén de libros.
+
+    Returns:
+        set: palabras normalizadas del libro.
+    """
+    terms = set()
+    for column in TITLE_COLUMNS:
+        terms.update(tokenize_title(book[column] or ""))
+    return terms
+
+
+def add_book_facets(catalog: dict, book: dict) -> dict:
+    """add_book_facets agrega un libro al indice ordenado por año de
+    publicación y al facet de idioma. La llave del año es (año, posición del
+    libro), así el RBT cuenta los libros de un rango de años con rank() en
+    O(log n) y los recorre en orden de año y de carga. Los libros sin año no
+    entran al indice de años.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book (BookView): libro que ya se agregó al almacén de libros.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    year = parse_year(book["original_publication_year"])
+    if year is not None:
+        om.put(catalog["year_idx"], (year, book.pos), book.pos)
+    add_posting(catalog["language_idx"], book["language_code"], book.pos)
+    return catalog
+
 # def addBook(catalog, book):
 #     # Se adiciona el libro a la lista de libros
 #     lt.addLast(catalog['books'], book)
@@ -111,25 +656,73 @@ def add_book(catalog: dict, book: dict) -> dict:
 
 
 def add_book_author(catalog: dict, author_name: str, book: dict) -> dict:
-    """add_book_author _summary_
+    """add_book_author agrega un libro a la lista de libros de un autor. Si el
+    autor no existe lo crea y lo agrega al catálogo, en el Map de autores con
+    su llave canónica o al final de la lista de autores, y al indice de
+    prefijos. También suma el average_rating del libro al promedio del autor.
 
     Args:
-        catalog (dict): _description_
-        author_name (str): _description_
-        book (dict): _description_
+        catalog (dict): catálogo de libros.
+        author_name (str): nombre del autor, como aparece en el libro.
+        book (BookView): libro que ya se agregó al almacén de libros.
 
     Returns:
-        dict: _description_
+        dict: el catálogo actualizado.
     """
-    # TODO add docstring
-    authors_lt = catalog["authors"]
-    idx_author = authors_lt.find(author_name)
-    if idx_author > -1:
-        author = authors_lt.get_element(idx_author)
-    else:
-        author = new_author(author_name)
-        authors_lt.add_last(author)
+    author = find_author(catalog, author_name)
+    if author is None:
+        author = new_author(author_name, catalog["trusted"])
+        authors = catalog["authors"]
+        if is_author_map(catalog):
+            authors.put(author["key"], author)
+        else:
+            authors.add_last(author)
+        add_author_prefix(catalog, author)
     author["books"].add_last(book)
+    # promedio incremental, O(1) por libro
+    author["rating_sum"] += book["average_rating"]
+    author["rating_count"] += 1
+    author["average_rating"] = author["rating_sum"] / author["rating_count"]
+    return catalog
+
+
+def remove_book_author(catalog: dict, author_name: str, book: dict) -> dict:
+    """remove_book_author retira un libro de la lista de libros de un autor y
+    resta su average_rating de la suma y el conteo del autor, así el promedio
+    se actualiza sin recorrer los libros que le quedan. Si el autor se queda
+    sin libros sale del catálogo y del indice de prefijos.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        author_name (str): nombre del autor.
+        book (BookView): libro a retirar.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    author = find_author(catalog, author_name)
+    if author is None:
+        return catalog
+    author_books = author["books"]
+    for idx, author_book in enumerate(author_books):
+        if author_book == book:
+            author_books.remove_element(idx)
+            break
+    else:
+        # el libro no era del autor, su promedio no cambia
+        return catalog
+    if author_books.is_empty():
+        authors = catalog["authors"]
+        if is_author_map(catalog):
+            authors.remove(author["key"])
+        else:
+            authors.remove_element(authors.find(author["key"]))
+        remove_author_prefix(catalog, author)
+        return catalog
+    # promedio incremental, O(1) por libro
+    author["rating_sum"] -= book["average_rating"]
+    author["rating_count"] -= 1
+    author["average_rating"] = author["rating_sum"] / author["rating_count"]
     return catalog
 
 
@@ -163,6 +756,9 @@ def add_tag(catalog: dict, tag: dict) -> dict:
     tag = new_tag(tag["tag_name"],
                   tag["tag_id"])
     catalog["tags"].add_last(tag)
+    catalog["tag_names"].put(tag["name"], tag)
+    catalog["tag_ids"].put(tag["tag_id"], tag)
+    touch_catalog(catalog)
     return catalog
 
 
@@ -175,22 +771,200 @@ def add_tag(catalog: dict, tag: dict) -> dict:
 #     return catalog
 
 
+def update_tag(catalog: dict, tag: dict) -> str:
+    """update_tag agrega o actualiza en su lugar un tag del archivo de
+    tags. El tag_id es la llave: si ya existe con otro nombre, el tag se
+    renombra; si el nombre ya existe con otro tag_id, ese tag cambia de
+    id. En los dos casos la llave anterior sale de tag_names o tag_ids,
+    así el tag no se repite en la lista de tags.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        tag (dict): registro del archivo de tags.
+
+    Returns:
+        str: "added" si el tag es nuevo, "updated" si cambió su nombre o
+            su id, o None si ya existía igual.
+    """
+    tag_name = tag["tag_name"]
+    tag_id = int(tag["tag_id"])
+    tag_names = catalog["tag_names"]
+    tag_ids = catalog["tag_ids"]
+    by_name = get_map_value(tag_names, tag_name)
+    by_id = get_map_value(tag_ids, tag_id)
+    if by_name is None and by_id is None:
+        add_tag(catalog, tag)
+        return "added"
+    if by_name is not None and by_name is by_id:
+        return None
+    if by_id is not None:
+        # mismo id, nombre nuevo
+        if get_map_value(tag_names, by_id["name"]) is by_id:
+            tag_names.remove(by_id["name"])
+        by_id["name"] = tag_name
+        tag_names.put(tag_name, by_id)
+    else:
+        # mismo nombre, id nuevo
+        if get_map_value(tag_ids, by_name["tag_id"]) is by_name:
+            tag_ids.remove(by_name["tag_id"])
+        by_name["tag_id"] = tag_id
+        tag_ids.put(tag_id, by_name)
+    touch_catalog(catalog)
+    return "updated"
+
+
 def add_book_tag(catalog: dict, book_tag: dict) -> dict:
-    """add_book_tag _summary_
+    """add_book_tag agrega una asociación tag-libro del archivo, leída
+    como diccionario (ver add_book_tag_values).
 
     Args:
-        catalog (dict): _description_
-        book_tag (dict): _description_
+        catalog (dict): catálogo de libros.
+        book_tag (dict): registro del archivo de asociaciones tag-libro.
 
     Returns:
-        dict: _description_
-    """  
-    # TODO add docstring
-    book_tag = new_book_tag(book_tag["tag_id"],
-                            book_tag["goodreads_book_id"])
-    catalog["book_tags"].add_last(book_tag)
+        dict: el catálogo actualizado.
+    """
+    return add_book_tag_values(catalog,
+                               book_tag["goodreads_book_id"],
+                               book_tag["tag_id"],
+                               book_tag.get("count"))
+
+
+def add_book_tag_values(catalog: dict, goodreads_book_id: str,
+                        tag_id: str, count: str = None) -> dict:
+    """add_book_tag_values cruza una asociación tag-libro con el libro de
+    su goodreads_book_id (hash join con el indice único de
+    goodreads_book_id) y la agrega a la lista de libros del tag y a los
+    tags del libro. La asociación no se guarda, así la carga recorre el
+    archivo sin tener todas las parejas en memoria; las que no tienen
+    libro en el catálogo solo se cuentan.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        goodreads_book_id (str): id de Goodreads del libro.
+        tag_id (str): id del tag.
+        count (str, optional): número de veces que el libro fue marcado
+            con el tag. Por defecto 0.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    catalog["book_tags"] += 1
+    pos = get_map_value(catalog["book_keys"]["goodreads_book_id"],
+                        int(goodreads_book_id))
+    if pos is None:
+        catalog["book_tags_unmatched"] += 1
+    else:
+        add_tag_book(catalog, int(tag_id), int(count) if count else 0, pos)
+    touch_catalog(catalog)
     return catalog
 
+
+def update_book_tag(catalog: dict, goodreads_book_id: str, tag_id: str,
+                    count: str = None) -> str:
+    """update_book_tag agrega o reemplaza una asociación tag-libro de una
+    carga incremental. A diferencia de la carga completa, si el libro ya
+    tiene el tag su conteo se reemplaza por el nuevo en vez de sumarse.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        goodreads_book_id (str): id de Goodreads del libro.
+        tag_id (str): id del tag.
+        count (str, optional): número de veces que el libro fue marcado
+            con el tag. Por defecto 0.
+
+    Returns:
+        str: "added" si la asociación es nueva, "updated" si cambió su
+            conteo, "unmatched" si el libro no está en el catálogo o None
+            si ya estaba igual.
+    """
+    pos = get_map_value(catalog["book_keys"]["goodreads_book_id"],
+                        int(goodreads_book_id))
+    if pos is None:
+        catalog["book_tags"] += 1
+        catalog["book_tags_unmatched"] += 1
+        touch_catalog(catalog)
+        return "unmatched"
+    status = add_tag_book(catalog, int(tag_id), int(count) if count else 0,
+                          pos, replace=True)
+    if status == "added":
+        catalog["book_tags"] += 1
+    if status is not None:
+        touch_catalog(catalog)
+    return status
+
+
+def add_tag_book(catalog: dict, tag_id: int, count: int, pos: int,
+                 replace: bool = False) -> str:
+    """add_tag_book agrega el libro de una asociación a la lista ordenada
+    de posiciones de libros de su tag_id, y el tag con su conteo a los
+    arreglos de tags del libro. Si el libro ya tenía el tag el libro no
+    se repite en la lista del tag y el conteo se suma (el archivo
+    completo repite algunas parejas) o, si replace es True, se
+    reemplaza.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        tag_id (int): id del tag.
+        count (int): número de veces que el libro fue marcado con el tag.
+        pos (int): posición del libro en el almacén.
+        replace (bool, optional): reemplaza el conteo de una pareja que
+            ya existe en vez de sumarlo. Por defecto False.
+
+    Returns:
+        str: "added" si el libro no tenía el tag, "updated" si cambió el
+            conteo o None si ya tenía ese mismo conteo.
+    """
+    book_tag_counts = catalog["book_tag_counts"]
+    tag_counts = get_map_value(book_tag_counts, pos)
+    if tag_counts is None:
+        tag_counts = {
+            "tag_ids": array("l"),
+            "counts": array("l"),
+        }
+        book_tag_counts.put(pos, tag_counts)
+    tag_ids = tag_counts["tag_ids"]
+    counts = tag_counts["counts"]
+    for idx in range(len(tag_ids)):
+        if tag_ids[idx] == tag_id:
+            if not replace:
+                count += counts[idx]
+            if counts[idx] == count:
+                return None
+            counts[idx] = count
+            return "updated"
+    tag_ids.append(tag_id)
+    counts.append(count)
+    add_posting(catalog["tag_books"], tag_id, pos)
+    return "added"
+
+
+def touch_catalog(catalog: dict) -> int:
+    """touch_catalog incrementa la versión del catálogo. Se llama cada vez que
+    cambian sus datos, así los resultados de consultas guardados con una
+    versión anterior dejan de ser válidos.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        int: la nueva versión del catálogo.
+    """
+    catalog["version"] += 1
+    return catalog["version"]
+
+
+def catalog_version(catalog: dict) -> int:
+    """catalog_version retorna la versión actual del catálogo.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        int: versión del catálogo, 0 si está vacío.
+    """
+    return catalog["version"]
+
 # def addBookTag(catalog, booktag):
 #     """
 #     Adiciona un tag a la lista de tags
@@ -202,11 +976,13 @@ def add_book_tag(catalog: dict, book_tag: dict) -> dict:
 
 # Funciones para creacion de datos
 
-def new_author(author_name: str) -> dict:
+def new_author(author_name: str, trusted: bool = CATALOG_TRUSTED) -> dict:
     """new_author _summary_
 
     Args:
         author_name (str): _description_
+        trusted (bool, optional): modo confiable de la lista de libros del
+            autor. Por defecto CATALOG_TRUSTED.
 
     Returns:
         dict: _description_
@@ -214,11 +990,15 @@ def new_author(author_name: str) -> dict:
     # TODO add docstring
     author = {
         "name": "",
+        "key": "",
         "books": None,
         "average_rating": 0,
+        "rating_sum": 0.0,
+        "rating_count": 0,
     }
     author["name"] = author_name
-    author["books"] = List(dstruct="ArrayList")
+    author["key"] = normalize_author_name(author_name)
+    author["books"] = List(dstruct="ArrayList", trusted=trusted)
     return author
 
 
@@ -233,6 +1013,53 @@ def new_author(author_name: str) -> dict:
 #     return author
 
 
+def parse_year(text: str) -> int:
+    """parse_year convierte el año de publicación del archivo de libros (p.ej.
+    "1997.0" o "-750.0") en un entero.
+
+    Args:
+        text (str): año como aparece en el archivo.
+
+    Returns:
+        int: el año o None si está vacío.
+    """
+    if not text:
+        return None
+    return int(float(text))
+
+
+def tokenize_title(text: str) -> list:
+    """tokenize_title separa un título en palabras normalizadas (unicode NFKC y
+    casefold), las mismas para indexar y para buscar.
+
+    Args:
+        text (str): título o texto de la búsqueda.
+
+    Returns:
+        list: palabras del texto en orden.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return TITLE_TOKEN_RE.findall(text)
+
+
+def new_author_prefix_index() -> dict:
+    """new_author_prefix_index crea el indice de prefijos de autores vacío.
+    Guarda las llaves canónicas de los autores sin tildes (fold_author_key)
+    ordenadas y, en las mismas posiciones, los autores; los autores cuya llave
+    empieza por un prefijo quedan en un rango contiguo que se encuentra con
+    búsqueda binaria.
+
+    Returns:
+        dict: indice de prefijos vacío.
+    """
+    prefix_idx = {
+        "keys": [],
+        "authors": [],
+        "built": False,
+    }
+    return prefix_idx
+
+
 def new_tag(tag_name: str, tag_id: str) -> dict:
     """new_tag _summary_
 
@@ -249,7 +1076,7 @@ def new_tag(tag_name: str, tag_id: str) -> dict:
         "tag_id": ""
     }
     tag["name"] = tag_name
-    tag["tag_id"] = tag_id
+    tag["tag_id"] = int(tag_id)
     return tag
 
 
@@ -263,23 +1090,28 @@ def new_tag(tag_name: str, tag_id: str) -> dict:
 #     return tag
 
 
-def new_book_tag(tag_id: str, book_id: str) -> dict:
-    """new_book_tag _summary_
+def new_book_tag(tag_id: str, goodreads_book_id: str,
+                 count: str = None) -> dict:
+    """new_book_tag crea una asociación tag-libro con sus campos del archivo
+    convertidos a enteros.
 
     Args:
-        tag_id (str): _description_
-        book_id (str): _description_
+        tag_id (str): id del tag.
+        goodreads_book_id (str): id de Goodreads del libro.
+        count (str, optional): número de veces que el libro fue marcado con el
+            tag. Por defecto 0.
 
     Returns:
-        dict: _description_
+        dict: la asociación tag-libro.
     """
-    # TODO add docstring
     book_tag = {
-        "tag_id": "",
-        "book_id": "",
+        "tag_id": 0,
+        "goodreads_book_id": 0,
+        "count": 0,
     }
-    book_tag["tag_id"] = tag_id
-    book_tag["book_id"] = book_id
+    book_tag["tag_id"] = int(tag_id)
+    book_tag["goodreads_book_id"] = int(goodreads_book_id)
+    book_tag["count"] = int(count) if count else 0
     return book_tag
 
 
@@ -292,9 +1124,162 @@ def new_book_tag(tag_id: str, book_id: str) -> dict:
 #     return booktag
 
 
+def normalize_author_name(author_name: str) -> str:
+    """normalize_author_name calcula la llave canónica de un autor, con la que
+    se indexa en el Map de autores y se compara en cmp_authors. Aplica la
+    normalización unicode NFKC, ignora mayúsculas y minúsculas (casefold) y
+    reduce los espacios a uno solo entre palabras, así "J.K.  Rowling", "j.k.
+    rowling" y "Ｊ.Ｋ. Rowling" son el mismo autor.
+
+    Args:
+        author_name (str): nombre del autor.
+
+    Returns:
+        str: llave canónica del autor.
+    """
+    name = unicodedata.normalize("NFKC", author_name).casefold()
+    return " ".join(name.split())
+
+
+def fold_author_key(author_key: str) -> str:
+    """fold_author_key quita las tildes y demás marcas diacríticas de una
+    llave canónica de autor. El indice de prefijos se ordena por esta llave,
+    así "garcia" encuentra a "Gabriel García Márquez"; el Map de autores sigue
+    usando la llave canónica completa.
+
+    Args:
+        author_key (str): llave canónica del autor (normalize_author_name).
+
+    Returns:
+        str: llave sin marcas diacríticas.
+    """
+    decomposed = unicodedata.normalize("NFD", author_key)
+    return "".join(char for char in decomposed
+                   if not unicodedata.combining(char))
+
+
+def build_author_prefix_index(catalog: dict) -> dict:
+    """build_author_prefix_index construye el indice de prefijos con todos los
+    autores del catálogo, ordenados por su llave sin tildes y, en los empates,
+    por su llave canónica. Se llama al terminar de cargar los libros,
+    O(n log n) en el número de autores.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        dict: el catálogo actualizado.
+    """
+    authors = sorted(get_authors(catalog),
+                     key=lambda author: (fold_author_key(author["key"]),
+                                         author["key"]))
+    prefix_idx = catalog["author_prefix"]
+    prefix_idx["keys"] = [fold_author_key(author["key"])
+                          for author in authors]
+    prefix_idx["authors"] = authors
+    prefix_idx["built"] = True
+    return catalog
+
+
+def add_author_prefix(catalog: dict, author: dict) -> None:
+    """add_author_prefix agrega un autor nuevo al indice de prefijos en su
+    lugar, con búsqueda binaria. Mientras el indice no se ha construido no hace
+    nada, así la carga inicial lo construye una sola vez al final.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        author (dict): autor nuevo.
+    """
+    prefix_idx = catalog["author_prefix"]
+    if not prefix_idx["built"]:
+        return
+    keys = prefix_idx["keys"]
+    authors = prefix_idx["authors"]
+    folded = fold_author_key(author["key"])
+    idx = bisect.bisect_left(keys, folded)
+    # los empates sin tildes quedan en orden de la llave canónica
+    while (idx < len(keys) and keys[idx] == folded
+           and authors[idx]["key"] < author["key"]):
+        idx += 1
+    keys.insert(idx, folded)
+    authors.insert(idx, author)
+
+
+def remove_author_prefix(catalog: dict, author: dict) -> None:
+    """remove_author_prefix retira un autor del indice de prefijos.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        author (dict): autor a retirar.
+    """
+    prefix_idx = catalog["author_prefix"]
+    if not prefix_idx["built"]:
+        return
+    keys = prefix_idx["keys"]
+    folded = fold_author_key(author["key"])
+    idx = bisect.bisect_left(keys, folded)
+    while idx < len(keys) and keys[idx] == folded:
+        if prefix_idx["authors"][idx] is author:
+            keys.pop(idx)
+            prefix_idx["authors"].pop(idx)
+            return
+        idx += 1
+
+
 # Funciones de consulta
 
 
+def get_map_value(ht: Map, key: str):
+    """get_map_value retorna el valor asociado a una llave de un Map.
+
+    Args:
+        ht (Map): Map donde se busca la llave.
+        key (str): llave a buscar.
+
+    Returns:
+        any: el valor asociado a la llave o None si no existe.
+    """
+    if ht.is_empty():
+        return None
+    entry = ht.get(key)
+    if entry is not None:
+        return entry.get_value()
+    return None
+
+
+def is_author_map(catalog: dict) -> bool:
+    """is_author_map indica si los autores del catálogo están en un Map.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        bool: True si los autores están en un Map, False si están en una lista.
+    """
+    return isinstance(catalog["authors"], SeparateChaining)
+
+
+def find_author(catalog: dict, author_name: str) -> dict:
+    """find_author busca un autor por su nombre, en el Map de autores con una
+    sola consulta o recorriendo la lista de autores.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        author_name (str): nombre del autor a buscar.
+
+    Returns:
+        dict: el autor encontrado o None si no existe.
+    """
+    authors = catalog["authors"]
+    author_key = normalize_author_name(author_name)
+    if is_author_map(catalog):
+        return get_map_value(authors, author_key)
+    idx_author = authors.find(author_key)
+    if idx_author > -1:
+        return authors.get_element(idx_author)
+    return None
+
+
 def get_books_by_author(catalog: dict, author_name: str) -> List:
     """get_books_by_author _summary_
 
@@ -306,10 +1291,8 @@ def get_books_by_author(catalog: dict, author_name: str) -> List:
         List: _description_
     """
     # TODO add docstring
-    authors_lt = catalog["authors"]
-    idx_author = authors_lt.find(author_name)
-    if idx_author > -1:
-        author = authors_lt.get_element(idx_author)
+    author = find_author(catalog, author_name)
+    if author is not None:
         return author["books"]
     return None
 
@@ -324,25 +1307,295 @@ def get_books_by_author(catalog: dict, author_name: str) -> List:
 #         return author
 #     return None
 
-def get_best_books(catalog: dict, number: int) -> List:
-    """get_best_books _summary_
+def get_authors(catalog: dict):
+    """get_authors retorna los autores del catálogo, sin importar si están en
+    un Map o en una lista.
 
     Args:
-        catalog (dict): _description_
-        number (int): _description_
+        catalog (dict): catálogo de libros.
 
     Returns:
-        List: _description_
+        List: lista con los autores.
     """
-    # TODO add docstring
-    books_lt = catalog["books"]
-    best_books_lt = List()
-    i = 0
-    for book in books_lt:
-        if i < number:
-            best_books_lt.add_last(book)
+    authors = catalog["authors"]
+    if is_author_map(catalog):
+        return authors.values()
+    return authors
+
+
+def get_best_authors(catalog: dict, number: int, min_books: int = 1) -> List:
+    """get_best_authors retorna los autores con mayor promedio de
+    average_rating entre sus libros. Usa el promedio que add_book_author
+    mantiene en cada autor, así que no recorre los libros del catálogo. Los
+    empates se resuelven por número de libros y luego por nombre.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        number (int): número de autores a retornar.
+        min_books (int, optional): número mínimo de libros de un autor para
+            entrar en el ranking. Por defecto es 1.
+
+    Returns:
+        List: lista con los mejores autores.
+    """
+    candidates = (author for author in get_authors(catalog)
+                  if author["rating_count"] >= min_books)
+    best = heapq.nsmallest(number, candidates,
+                           key=lambda author: (-author["average_rating"],
+                                               -author["rating_count"],
+                                               author["key"]))
+    best_authors_lt = List()
+    for author in best:
+        best_authors_lt.add_last(author)
+    return best_authors_lt
+
+
+def get_authors_by_prefix(catalog: dict, prefix: str,
+                          number: int = 10) -> List:
+    """get_authors_by_prefix retorna los primeros autores, en orden de su llave
+    sin tildes, cuyo nombre empieza por prefix. El prefijo se normaliza igual
+    que los nombres (normalize_author_name y fold_author_key), así no importan
+    las mayúsculas ni las tildes; una búsqueda binaria encuentra el comienzo
+    del rango, O(log n + number). Si el indice no se ha construido, se
+    construye antes de buscar.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        prefix (str): comienzo del nombre del autor.
+        number (int, optional): número máximo de autores a retornar. Por
+            defecto es 10.
+
+    Returns:
+        List: lista con los autores encontrados.
+    """
+    prefix_idx = catalog["author_prefix"]
+    if not prefix_idx["built"]:
+        build_author_prefix_index(catalog)
+    keys = prefix_idx["keys"]
+    authors = prefix_idx["authors"]
+    prefix_key = fold_author_key(normalize_author_name(prefix))
+    start = bisect.bisect_left(keys, prefix_key)
+    end = min(start + max(number, 0), len(keys))
+    authors_lt = List()
+    for pos in range(start, end):
+        if not keys[pos].startswith(prefix_key):
+            break
+        authors_lt.add_last(authors[pos])
+    return authors_lt
+
+
+def intersect_postings(postings1: array, postings2: array) -> array:
+    """intersect_postings intersecta dos listas de posiciones ordenadas
+    recorriéndolas a la vez, O(n1 + n2).
+
+    Args:
+        postings1 (array): posiciones ordenadas.
+        postings2 (array): posiciones ordenadas.
+
+    Returns:
+        array: posiciones ordenadas que están en ambas listas.
+    """
+    result = array("l")
+    i, j = 0, 0
+    size1, size2 = len(postings1), len(postings2)
+    while i < size1 and j < size2:
+        pos1, pos2 = postings1[i], postings2[j]
+        if pos1 == pos2:
+            result.append(pos1)
             i += 1
-        # best_books_lt.add_last(book)
+            j += 1
+        elif pos1 < pos2:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def union_postings(postings_lt: list) -> array:
+    """union_postings une varias listas de posiciones ordenadas en una sola
+    lista ordenada y sin repetidos.
+
+    Args:
+        postings_lt (list): listas de posiciones ordenadas.
+
+    Returns:
+        array: posiciones ordenadas que están en alguna de las listas.
+    """
+    result = array("l")
+    last = None
+    for pos in heapq.merge(*postings_lt):
+        if pos != last:
+            result.append(pos)
+            last = pos
+    return result
+
+
+def search_books_by_title(catalog: dict, query: str, mode: str = "and",
+                          rank_by: str = "average_rating",
+                          number: int = 10) -> List:
+    """search_books_by_title busca los libros con las palabras de query en su
+    title u original_title, con el indice invertido. Con mode "and" el libro
+    debe tener todas las palabras (las listas se intersectan empezando por la
+    más corta), con "or" alguna de ellas. Los resultados se ordenan de mayor a
+    menor rank_by y los empates por orden de carga.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        query (str): palabras a buscar.
+        mode (str, optional): "and" u "or". Por defecto es "and".
+        rank_by (str, optional): columna para ordenar, "average_rating" o
+            "ratings_count". Por defecto es "average_rating".
+        number (int, optional): número máximo de libros a retornar. Por defecto
+            es 10.
+
+    Raises:
+        ValueError: error si mode o rank_by no son válidos.
+
+    Returns:
+        List: lista con los libros encontrados.
+    """
+    if mode not in ("and", "or"):
+        raise ValueError(f"Invalid search mode: {mode}")
+    if rank_by not in TITLE_RANK_COLUMNS:
+        raise ValueError(f"Invalid rank column: {rank_by}")
+    title_idx = catalog["title_idx"]
+    postings_lt = []
+    for term in set(tokenize_title(query)):
+        postings = get_map_value(title_idx, term)
+        if postings is None:
+            postings = array("l")
+        postings_lt.append(postings)
+    books_lt = List()
+    if not postings_lt:
+        return books_lt
+    if mode == "and":
+        postings_lt.sort(key=len)
+        matches = postings_lt[0]
+        for postings in postings_lt[1:]:
+            if not matches:
+                break
+            matches = intersect_postings(matches, postings)
+    else:
+        matches = union_postings(postings_lt)
+    books = catalog["books"]
+    rank = books.column(rank_by)
+    best = heapq.nsmallest(number, matches,
+                           key=lambda pos: (-rank[pos], pos))
+    for pos in best:
+        books_lt.add_last(books.get_element(pos))
+    return books_lt
+
+
+def count_books_by_years(catalog: dict, year_from: int = None,
+                         year_to: int = None) -> int:
+    """count_books_by_years cuenta los libros publicados entre year_from y
+    year_to (inclusive) con dos consultas rank() al RBT de años, O(log n) sin
+    recorrer el rango.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        year_from (int, optional): primer año del rango, None para no
+            limitarlo.
+        year_to (int, optional): último año del rango, None para no limitarlo.
+
+    Returns:
+        int: número de libros con año en el rango.
+    """
+    year_idx = catalog["year_idx"]
+    if om.isEmpty(year_idx):
+        return 0
+    low = (-math.inf if year_from is None else year_from, -math.inf)
+    high = (math.inf if year_to is None else year_to, math.inf)
+    # un rango invertido (year_from > year_to) no tiene libros
+    return max(om.rank(year_idx, high) - om.rank(year_idx, low), 0)
+
+
+def filter_books(catalog: dict, year_from: int = None, year_to: int = None,
+                 language: str = None, number: int = None) -> List:
+    """filter_books retorna los libros publicados entre year_from y year_to
+    (inclusive) en el idioma language; los filtros en None no se aplican. Cada
+    filtro tiene un conjunto de candidatos cuyo tamaño se conoce en O(log n) o
+    O(1); solo se recorre el más pequeño, O(log n + k), y sus libros se revisan
+    contra el otro filtro. Los libros se retornan en orden de año y de carga,
+    los que no tienen año al final.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        year_from (int, optional): primer año del rango.
+        year_to (int, optional): último año del rango.
+        language (str, optional): código del idioma, p.ej. "eng".
+        number (int, optional): número máximo de libros a retornar, None para
+            todos.
+
+    Returns:
+        List: lista con los libros que cumplen los filtros.
+    """
+    books = catalog["books"]
+    by_year = year_from is not None or year_to is not None
+    lang_postings = None
+    if language is not None:
+        lang_postings = get_map_value(catalog["language_idx"], language)
+        if lang_postings is None:
+            lang_postings = array("l")
+    if not by_year or (
+            lang_postings is not None and
+            len(lang_postings) < count_books_by_years(catalog, year_from,
+                                                      year_to)):
+        # el idioma es el filtro más pequeño, se revisa el año de cada libro
+        if lang_postings is None:
+            lang_postings = range(books.size())
+        low = -math.inf if year_from is None else year_from
+        high = math.inf if year_to is None else year_to
+        matches = []
+        for pos in lang_postings:
+            year = parse_year(books.value(pos, "original_publication_year"))
+            if not by_year or (year is not None and low <= year <= high):
+                matches.append((year is None, year or 0, pos))
+        matches.sort()
+        positions = [pos for _, _, pos in matches]
+    else:
+        # el rango de años es el filtro más pequeño, se recorre en el RBT
+        low = (-math.inf if year_from is None else year_from, -math.inf)
+        high = (math.inf if year_to is None else year_to, math.inf)
+        positions = om.values(catalog["year_idx"], low, high)
+        if language is not None:
+            positions = [pos for pos in positions
+                         if books.value(pos, "language_code") == language]
+    books_lt = List()
+    for pos in positions:
+        if number is not None and books_lt.size() >= number:
+            break
+        books_lt.add_last(books.get_element(pos))
+    return books_lt
+
+
+def get_best_books(catalog: dict, number: int,
+                   rank_by: str = "average_rating") -> List:
+    """get_best_books retorna los number libros con mayor rating, recorriendo
+    en orden el indice ordenado del modo rank_by. Con "average_rating" ordena
+    por el rating del archivo y con "weighted_rating" por el rating ponderado
+    (ver weighted_rating), que no premia a los libros con pocas calificaciones.
+    Los empates quedan en orden de carga.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        number (int): número de libros.
+        rank_by (str, optional): modo del ranking, una llave de
+            BEST_BOOKS_RANKINGS. Por defecto es "average_rating".
+
+    Raises:
+        ValueError: error si rank_by no es válido.
+
+    Returns:
+        List: libros de mayor a menor rating.
+    """
+    if rank_by not in BEST_BOOKS_RANKINGS:
+        raise ValueError(f"Invalid ranking: {rank_by}")
+    rating_idx = catalog[BEST_BOOKS_RANKINGS[rank_by]]
+    best_books_lt = List()
+    # el recorrido en orden se detiene en el libro number, O(log n + N)
+    for book in om.firstValues(rating_idx, number):
+        best_books_lt.add_last(book)
     return best_books_lt
 
 
@@ -359,26 +1612,171 @@ def get_best_books(catalog: dict, number: int) -> List:
 
 
 def count_books_by_tag(catalog: dict, tag: str) -> int:
-    """count_books_by_tag _summary_
+    """count_books_by_tag cuenta los libros del catálogo marcados con un tag.
+    Busca el tag por su nombre en catalog["tag_names"] y retorna el tamaño de
+    su lista de libros en catalog["tag_books"], dos consultas O(1) sin
+    recorrer los tags ni las asociaciones tag-libro.
 
     Args:
-        catalog (dict): _description_
-        tag (str): _description_
+        catalog (dict): catálogo de libros.
+        tag (str): nombre del tag.
 
     Returns:
-        int: _description_
+        int: número de libros con el tag, 0 si el tag no existe.
     """
-    # TODO add docstring
-    tags_lt = catalog["tags"]
-    book_tags_lt = catalog["book_tags"]
-    book_count = 0
-    idx_tag = tags_lt.find(tag)
-    if idx_tag > 0:
-        tag = tags_lt.get_element(idx_tag)
-        for book_tag in book_tags_lt:
-            if book_tag["tag_id"] == tag["tag_id"]:
-                book_count += 1
-    return book_count
+    tag = get_map_value(catalog["tag_names"], tag)
+    if tag is None:
+        return 0
+    postings = get_map_value(catalog["tag_books"], tag["tag_id"])
+    if postings is None:
+        return 0
+    return len(postings)
+
+
+def get_book_pos(catalog: dict, column: str, key) -> int:
+    """get_book_pos retorna la posición en el almacén del libro con una
+    llave, con una consulta O(1) a su indice. Si la llave no es única
+    (isbn13) retorna la del primer libro que la tiene.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str): columna de la llave: "book_id",
+            "goodreads_book_id", "isbn" o "isbn13".
+        key (any): valor de la llave.
+
+    Raises:
+        KeyError: error si la columna no tiene indice.
+
+    Returns:
+        int: posición del libro o None si no existe.
+    """
+    if column in BOOK_MULTI_KEY_COLUMNS:
+        postings = get_book_positions(catalog, column, key)
+        return postings[0] if postings else None
+    keys_idx = catalog["book_keys"][column]
+    return get_map_value(keys_idx, normalize_book_key(column, key))
+
+
+def get_book_positions(catalog: dict, column: str, key) -> array:
+    """get_book_positions retorna las posiciones en el almacén de todos
+    los libros con una llave.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str): columna de la llave, única o no.
+        key (any): valor de la llave.
+
+    Raises:
+        KeyError: error si la columna no tiene indice.
+
+    Returns:
+        array: posiciones de los libros en orden, vacío si no existe.
+    """
+    key = normalize_book_key(column, key)
+    if column in BOOK_MULTI_KEY_COLUMNS:
+        postings = get_map_value(catalog["book_multi_keys"][column], key)
+        return postings if postings is not None else array("l")
+    pos = get_map_value(catalog["book_keys"][column], key)
+    return array("l", [] if pos is None else [pos])
+
+
+def get_book_by_key(catalog: dict, column: str, key) -> dict:
+    """get_book_by_key retorna el libro con una llave de su indice
+    (book_id, goodreads_book_id, isbn o el primero con un isbn13).
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str): columna de la llave.
+        key (any): valor de la llave.
+
+    Raises:
+        KeyError: error si la columna no tiene indice.
+
+    Returns:
+        BookView: el libro o None si no existe.
+    """
+    pos = get_book_pos(catalog, column, key)
+    if pos is None:
+        return None
+    return catalog["books"].get_element(pos)
+
+
+def get_duplicate_keys(catalog: dict) -> List:
+    """get_duplicate_keys retorna las llaves repetidas que se encontraron al
+    agregar libros, cada una con la posición del libro repetido y la del
+    primero que la tenía, en orden de posición y de columna.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        List: lista de {"column", "key", "pos", "first_pos"}.
+    """
+    found = []
+    for duplicates in catalog["duplicate_keys"].values():
+        found.extend(duplicates)
+    found.sort(key=lambda duplicate: (
+        duplicate["pos"], BOOK_KEY_COLUMNS.index(duplicate["column"])))
+    duplicates_lt = List()
+    for duplicate in found:
+        duplicates_lt.add_last(duplicate)
+    return duplicates_lt
+
+
+def get_books_by_tag(catalog: dict, tag_name: str, number: int = None) -> List:
+    """get_books_by_tag retorna los libros marcados con un tag, en orden de
+    carga, con la lista de posiciones del tag que arma el join de add_book_tag.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        tag_name (str): nombre del tag.
+        number (int, optional): número máximo de libros a retornar, None para
+            todos.
+
+    Returns:
+        List: lista con los libros del tag.
+    """
+    books_lt = List()
+    tag = get_map_value(catalog["tag_names"], tag_name)
+    if tag is None:
+        return books_lt
+    postings = get_map_value(catalog["tag_books"], tag["tag_id"])
+    if postings is None:
+        return books_lt
+    books = catalog["books"]
+    for pos in postings[:number]:
+        books_lt.add_last(books.get_element(pos))
+    return books_lt
+
+
+def get_book_tags(catalog: dict, book_id: int) -> List:
+    """get_book_tags retorna los tags de un libro con el número de veces que
+    fue marcado con cada uno, de mayor a menor, desde los arreglos de tags del
+    libro.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book_id (int): book_id del libro.
+
+    Returns:
+        List: lista de {"name", "tag_id", "count"} o None si el libro no
+            existe.
+    """
+    pos = get_book_pos(catalog, "book_id", book_id)
+    if pos is None:
+        return None
+    tags_lt = List()
+    tag_counts = get_map_value(catalog["book_tag_counts"], pos)
+    if tag_counts is None:
+        return tags_lt
+    pairs = sorted(zip(tag_counts["counts"], tag_counts["tag_ids"]),
+                   key=lambda pair: -pair[0])
+    for count, tag_id in pairs:
+        tag = get_map_value(catalog["tag_ids"], tag_id)
+        tags_lt.add_last({"name": tag["name"] if tag else None,
+                          "tag_id": tag_id,
+                          "count": count})
+    return tags_lt
 
 
 # def countBooksByTag(catalog, tag):
@@ -440,17 +1838,16 @@ def tags_size(catalog: dict) -> int:
 
 
 def book_tags_size(catalog: dict) -> int:
-    """book_tags_size _summary_
+    """book_tags_size retorna el número de asociaciones tag-libro leídas,
+    incluidas las que no tienen libro en el catálogo.
 
     Args:
-        catalog (dict): _description_
+        catalog (dict): catálogo de libros.
 
     Returns:
-        int: _description_
+        int: número de asociaciones tag-libro.
     """
-    # TODO add docstring
-    book_tags_lt = catalog["book_tags"]
-    return book_tags_lt.size()
+    return catalog["book_tags"]
 
 
 # def bookSize(catalog):
@@ -499,7 +1896,7 @@ def rating_criteria(book1: dict, book2: dict) -> bool:
     Returns:
         bool: _description_
     """    
-    return (float(book1["average_rating"]) > float(book2["average_rating"]))
+    return book1["average_rating"] > book2["average_rating"]
 
 
 def sort_books(catalog: dict) -> dict:
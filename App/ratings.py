@@ -0,0 +1,298 @@
+"""
+Este módulo calcula estadísticas de calificaciones sobre todos los libros del
+catálogo a la vez, con NumPy sobre las columnas numéricas del almacén columnar
+(BookStore): histogramas de ratings_1..ratings_5, rating promedio ponderado
+bayesiano, percentiles y las mismas agregaciones agrupadas por autor o por
+idioma.
+
+Las columnas del almacén se copian a arreglos de NumPy en cada cálculo (no se
+comparte su memoria, así el almacén puede seguir creciendo) y las agregaciones
+por grupo se hacen con np.bincount, sin ciclos de Python sobre los libros.
+"""
+
+# native python modules
+from array import array
+
+# numpy for the vectorized aggregates
+import numpy as np
+
+# empty value of the integer columns of the book store
+from bookstore import MISSING_INT
+
+# star rating columns of the books file, 1 to 5 stars
+# :data: STAR_COLUMNS
+STAR_COLUMNS: tuple = (
+    "ratings_1",
+    "ratings_2",
+    "ratings_3",
+    "ratings_4",
+    "ratings_5",
+)
+"""
+Columnas con el número de calificaciones de 1 a 5 estrellas de cada libro.
+"""
+
+# value of each star column
+# :data: STARS
+STARS: np.ndarray = np.arange(1, 6, dtype=np.float64)
+"""
+Número de estrellas de cada columna de STAR_COLUMNS.
+"""
+
+# default percentiles for the rating distribution
+# :data: PERCENTILES
+PERCENTILES: tuple = (5, 25, 50, 75, 95)
+"""
+Percentiles que se calculan por defecto.
+"""
+
+
+def column_values(catalog: dict, column: str) -> np.ndarray:
+    """column_values copia una columna numérica del almacén de libros a un
+    arreglo de NumPy.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str): nombre de la columna numérica.
+
+    Returns:
+        np.ndarray: valores de la columna, uno por libro.
+    """
+    return np.array(catalog["books"].column(column))
+
+
+def rating_counts(catalog: dict) -> np.ndarray:
+    """rating_counts arma la matriz de calificaciones por estrella de todos los
+    libros, los valores vacíos cuentan como 0.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        np.ndarray: matriz (libros, 5) con las calificaciones de 1 a 5
+            estrellas.
+    """
+    counts = np.empty((catalog["books"].size(), len(STAR_COLUMNS)),
+                      dtype=np.int64)
+    for idx, column in enumerate(STAR_COLUMNS):
+        counts[:, idx] = column_values(catalog, column)
+    np.maximum(counts, 0, out=counts)
+    return counts
+
+
+def mean_ratings(counts: np.ndarray) -> np.ndarray:
+    """mean_ratings calcula el rating promedio de cada fila de una matriz de
+    calificaciones por estrella.
+
+    Args:
+        counts (np.ndarray): matriz (n, 5) de calificaciones por estrella.
+
+    Returns:
+        np.ndarray: promedio de cada fila, 0 si no tiene calificaciones.
+    """
+    totals = counts.sum(axis=1)
+    stars = counts @ STARS
+    return np.divide(stars, totals, out=np.zeros(len(counts)),
+                     where=totals > 0)
+
+
+def bayesian_ratings(counts: np.ndarray, prior_mean: float,
+                     prior_weight: float) -> np.ndarray:
+    """bayesian_ratings calcula el rating ponderado bayesiano de cada fila de
+    una matriz de calificaciones por estrella: (C * m + suma de estrellas) / (C
+    + número de calificaciones). Cada fila se acerca al promedio m en
+    proporción a las pocas calificaciones que tiene, así un libro con tres
+    calificaciones de 5 estrellas no supera a uno con miles de calificaciones
+    de 4.8.
+
+    Args:
+        counts (np.ndarray): matriz (n, 5) de calificaciones por estrella.
+        prior_mean (float): promedio m hacia el que se acercan las filas.
+        prior_weight (float): peso C del promedio, en número de
+            calificaciones.
+
+    Returns:
+        np.ndarray: rating ponderado de cada fila.
+    """
+    totals = counts.sum(axis=1)
+    stars = counts @ STARS
+    denominator = prior_weight + totals
+    return np.divide(prior_weight * prior_mean + stars, denominator,
+                     out=np.zeros(len(counts)), where=denominator > 0)
+
+
+def rating_histogram(catalog: dict) -> dict:
+    """rating_histogram suma las calificaciones de todos los libros por número
+    de estrellas.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        dict: "counts" con el total de calificaciones de 1 a 5 estrellas,
+            "share" con su proporción y "mean" con el promedio de todas las
+            calificaciones.
+    """
+    totals = rating_counts(catalog).sum(axis=0)
+    all_ratings = totals.sum()
+    histogram = {
+        "counts": totals,
+        "share": totals / all_ratings if all_ratings else totals * 0.0,
+        "mean": float(totals @ STARS / all_ratings) if all_ratings else 0.0,
+    }
+    return histogram
+
+
+def rating_percentiles(catalog: dict, column: str = "average_rating",
+                       percentiles: tuple = PERCENTILES) -> dict:
+    """rating_percentiles calcula percentiles de una columna numérica de los
+    libros (average_rating, ratings_count, ...).
+
+    Args:
+        catalog (dict): catálogo de libros.
+        column (str, optional): columna numérica. Por defecto es
+            "average_rating".
+        percentiles (tuple, optional): percentiles entre 0 y 100. Por defecto
+            PERCENTILES.
+
+    Returns:
+        dict: percentil -> valor, vacío si no hay libros.
+    """
+    values = column_values(catalog, column)
+    # the empty values of the integer columns are not ratings
+    values = values[values != MISSING_INT]
+    if not len(values):
+        return {}
+    result = np.percentile(values, percentiles)
+    return dict(zip(percentiles, result.tolist()))
+
+
+def group_ratings(catalog: dict, book_pos: np.ndarray, groups: np.ndarray,
+                  names: list, prior: tuple = None) -> dict:
+    """group_ratings agrega las calificaciones de los libros por grupo. Cada
+    pareja (book_pos[i], groups[i]) pone un libro en un grupo; un libro puede
+    estar en varios grupos (p.ej. un libro con dos autores). Las sumas se hacen
+    con np.bincount.
+
+    Args:
+        catalog (dict): catálogo de libros.
+        book_pos (np.ndarray): posición del libro de cada pareja.
+        groups (np.ndarray): número de grupo de cada pareja, entre 0 y
+            len(names) - 1.
+        names (list): nombre de cada grupo.
+        prior (tuple, optional): promedio m y peso C del rating bayesiano
+            de los grupos. Por defecto el prior del rating ponderado de
+            los libros, catalog["weighted_prior"] (ver
+            model.weighted_rating), así un grupo y un libro con las
+            mismas calificaciones tienen el mismo rating.
+
+    Returns:
+        dict: arreglos alineados con "names": "books" (número de libros),
+            "ratings" (matriz (grupos, 5) de calificaciones por estrella),
+            "mean_rating" (promedio de las calificaciones),
+            "mean_average_rating" (promedio del average_rating de sus libros) y
+            "bayesian_rating".
+    """
+    size = len(names)
+    counts = rating_counts(catalog)
+    book_counts = counts[book_pos]
+    group_counts = np.empty((size, len(STAR_COLUMNS)), dtype=np.int64)
+    for idx in range(len(STAR_COLUMNS)):
+        group_counts[:, idx] = np.bincount(groups,
+                                           weights=book_counts[:, idx],
+                                           minlength=size)
+    books = np.bincount(groups, minlength=size)
+    averages = column_values(catalog, "average_rating")[book_pos]
+    average_sums = np.bincount(groups, weights=averages, minlength=size)
+    if prior is None:
+        prior = catalog["weighted_prior"]
+    prior_mean, prior_weight = prior
+    grouped = {
+        "names": names,
+        "books": books,
+        "ratings": group_counts,
+        "mean_rating": mean_ratings(group_counts),
+        "mean_average_rating": np.divide(average_sums, books,
+                                         out=np.zeros(size),
+                                         where=books > 0),
+        "bayesian_rating": bayesian_ratings(group_counts, prior_mean,
+                                            prior_weight),
+    }
+    return grouped
+
+
+def ratings_by_language(catalog: dict) -> dict:
+    """ratings_by_language agrega las calificaciones por language_code, con los
+    códigos de la columna codificada del almacén como números de grupo. Ver
+    group_ratings.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        dict: agregados por idioma.
+    """
+    codes, values = catalog["books"].codes("language_code")
+    groups = np.array(codes, dtype=np.int64)
+    book_pos = np.arange(len(groups))
+    return group_ratings(catalog, book_pos, groups, list(values))
+
+
+def ratings_by_author(catalog: dict) -> dict:
+    """ratings_by_author agrega las calificaciones por autor, con las parejas
+    libro-autor de la lista de libros de cada autor. Ver group_ratings.
+
+    Args:
+        catalog (dict): catálogo de libros.
+
+    Returns:
+        dict: agregados por autor.
+    """
+    # importado aquí, el modelo no depende de este módulo
+    from model import get_authors
+    names = []
+    book_pos = array("q")
+    groups = array("q")
+    for group, author in enumerate(get_authors(catalog)):
+        names.append(author["name"])
+        for book in author["books"]:
+            book_pos.append(book.pos)
+            groups.append(group)
+    return group_ratings(catalog,
+                         np.array(book_pos, dtype=np.int64),
+                         np.array(groups, dtype=np.int64),
+                         names)
+
+
+def top_groups(grouped: dict, number: int = 10, by: str = "bayesian_rating",
+               min_books: int = 1) -> list:
+    """top_groups retorna los grupos con mayor valor en una de las métricas de
+    group_ratings, entre los que tienen al menos min_books libros.
+
+    Args:
+        grouped (dict): resultado de group_ratings.
+        number (int, optional): número de grupos. Por defecto es 10.
+        by (str, optional): métrica para ordenar. Por defecto es
+            "bayesian_rating".
+        min_books (int, optional): número mínimo de libros del grupo. Por
+            defecto es 1.
+
+    Returns:
+        list: diccionarios {"name", "books", "ratings", "mean_rating",
+            "mean_average_rating", "bayesian_rating"} de mayor a menor.
+    """
+    metric = np.where(grouped["books"] >= min_books, grouped[by], -np.inf)
+    order = np.argsort(-metric, kind="stable")[:number]
+    top = []
+    for idx in order:
+        if metric[idx] == -np.inf:
+            break
+        top.append({
+            "name": grouped["names"][idx],
+            "books": int(grouped["books"][idx]),
+            "ratings": int(grouped["ratings"][idx].sum()),
+            "mean_rating": float(grouped["mean_rating"][idx]),
+            "mean_average_rating": float(grouped["mean_average_rating"][idx]),
+            "bayesian_rating": float(grouped["bayesian_rating"][idx]),
+        })
+    return top
@@ -0,0 +1,225 @@
+# Purpose: Curvas de escalamiento de la carga y las consultas
+import config as cf
+import sys
+import argparse
+import json
+import os
+import random
+import time
+import controller
+import metrics
+import synthetic
+assert cf
+
+
+"""
+Genera catálogos sintéticos de varios tamaños (ver synthetic.py), mide
+en cada uno controller.loadData y las consultas principales, y escribe
+los resultados en JSON y las curvas de escalamiento en una imagen.
+
+Los archivos de cada tamaño se guardan en --data y se reutilizan en
+las siguientes ejecuciones con la misma semilla. Las consultas se
+miden con el cache de consultas apagado, cada una con argumentos
+distintos tomados del mismo catálogo.
+
+Uso:
+    python App/scaling.py --sizes 10000 100000 1000000 --plot scaling.png
+"""
+
+# tamaños por defecto, en número de libros
+SIZES = (10000, 30000, 100000)
+
+# carpeta por defecto de los archivos sintéticos, dentro de cf.data_dir
+DATA_DIR = 'Synthetic'
+
+# veces que se ejecuta cada consulta en cada tamaño
+REPEAT = 50
+
+# número de resultados de las consultas top-N
+TOP = 10
+
+
+def datasetDir(datadir, size, seed, tags_per_book):
+    """
+    Carpeta de los archivos sintéticos de un tamaño
+    """
+    return os.path.join(datadir, 'books-' + str(size) + '-seed' +
+                        str(seed) + '-tpb' + str(tags_per_book))
+
+
+def ensureDataset(datadir, size, seed, tags_per_book):
+    """
+    Retorna las rutas de los archivos sintéticos de un tamaño, y los
+    genera si no existen
+    """
+    directory = datasetDir(datadir, size, seed, tags_per_book)
+    files = [os.path.join(directory, name)
+             for name in ('books.csv', 'tags.csv', 'book_tags.csv')]
+    if not all(os.path.exists(filename) for filename in files):
+        dataset = synthetic.write_dataset(directory, size,
+                                          tags_per_book=tags_per_book,
+                                          seed=seed)
+        files = dataset['files']
+    return files
+
+
+def queryArguments(control, rng, repeat):
+    """
+    Escoge los argumentos de cada consulta entre los libros, autores y
+    tags del catálogo cargado
+    """
+    catalog = control['model']
+    books = catalog['books']
+    picked = [books.get_element(rng.randrange(books.size()))
+              for _ in range(repeat)]
+    authors = [book['authors'].split(',')[0].strip() for book in picked]
+    words = [book['title'].split()[0] for book in picked]
+    tags = [tag['name'] for tag in catalog['tags']]
+    queries = {
+        'best': [(TOP,)] * repeat,
+        'best_weighted': [(TOP, 'weighted_rating')] * repeat,
+        'author': [(author,) for author in authors],
+        'tag': [(rng.choice(tags),) for _ in range(repeat)],
+        'prefix': [(author[:3], TOP) for author in authors],
+        'title': [(word, 'and', 'average_rating', TOP) for word in words],
+        'filter': [(year, year + 5, 'eng', TOP)
+                   for year in (rng.randrange(1950, 2012)
+                                for _ in range(repeat))],
+    }
+    return queries
+
+
+# consulta del controlador de cada nombre de queryArguments
+QUERIES = {
+    'best': controller.getBestBooks,
+    'best_weighted': controller.getBestBooks,
+    'author': controller.getBooksByAuthor,
+    'tag': controller.countBooksByTag,
+    'prefix': controller.getAuthorsByPrefix,
+    'title': controller.searchBooksByTitle,
+    'filter': controller.filterBooks,
+}
+
+
+def measureSize(files, seed, repeat):
+    """
+    Carga un catálogo con los archivos y mide sus consultas. Retorna
+    los tiempos de carga y los percentiles de latencia de cada
+    consulta en milisegundos
+    """
+    control = controller.newController()
+    # sin cache, cada consulta se calcula
+    control['cache'] = controller.newQueryCache(0)
+    start = time.perf_counter()
+    sizes = controller.loadData(control, False, *files)
+    load_seconds = time.perf_counter() - start
+    recorder = metrics.new_recorder()
+    rng = random.Random(seed)
+    for name, args_lt in queryArguments(control, rng, repeat).items():
+        query = QUERIES[name]
+        for args in args_lt:
+            start = time.perf_counter()
+            query(control, *args)
+            metrics.record(recorder, name, time.perf_counter() - start)
+    result = {
+        'catalog': dict(zip(('books', 'authors', 'tags', 'book_tags'),
+                            sizes)),
+        'load_seconds': load_seconds,
+        'load_stats': controller.getLoadStats(control),
+        'queries': metrics.summary(recorder),
+    }
+    return result
+
+
+def runScaling(sizes, seed=0, tags_per_book=synthetic.TAGS_PER_BOOK,
+               repeat=REPEAT, datadir=None):
+    """
+    Mide la carga y las consultas en cada tamaño. Retorna un
+    diccionario tamaño -> resultados de measureSize
+    """
+    if datadir is None:
+        datadir = cf.data_dir + DATA_DIR
+    results = {}
+    for size in sizes:
+        print('Tamaño ' + str(size) + ': generando archivos ....')
+        files = ensureDataset(datadir, size, seed, tags_per_book)
+        print('Tamaño ' + str(size) + ': midiendo ....')
+        results[size] = measureSize(files, seed, repeat)
+        print('Tamaño ' + str(size) + ': carga ' +
+              '{:.2f}'.format(results[size]['load_seconds']) + ' s')
+    return results
+
+
+def plotScaling(results, filename):
+    """
+    Dibuja las curvas de escalamiento en escala log-log: el tiempo de
+    carga y la latencia p50 de cada consulta contra el número de
+    libros. Retorna False si matplotlib no está instalado
+    """
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+    sizes = sorted(results)
+    fig, (load_ax, query_ax) = plt.subplots(1, 2, figsize=(12, 5))
+    load_ax.plot(sizes, [results[size]['load_seconds'] for size in sizes],
+                 marker='o')
+    load_ax.set_title('controller.loadData')
+    load_ax.set_ylabel('segundos')
+    for name in results[sizes[0]]['queries']:
+        query_ax.plot(sizes,
+                      [results[size]['queries'][name]['p50_ms']
+                       for size in sizes],
+                      marker='o', label=name)
+    query_ax.set_title('Consultas (p50)')
+    query_ax.set_ylabel('milisegundos')
+    query_ax.legend()
+    for ax in (load_ax, query_ax):
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('libros')
+        ax.grid(True, which='both', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+    return True
+
+
+def parseArgs(argv):
+    """
+    Lee los argumentos de la línea de comandos
+    """
+    parser = argparse.ArgumentParser(
+        description='Curvas de escalamiento sobre catálogos sintéticos')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='números de libros')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tags-per-book', type=int,
+                        default=synthetic.TAGS_PER_BOOK)
+    parser.add_argument('--repeat', type=int, default=REPEAT,
+                        help='ejecuciones de cada consulta')
+    parser.add_argument('--data', default=None,
+                        help='carpeta de los archivos sintéticos')
+    parser.add_argument('--output', default=None,
+                        help='archivo JSON con los resultados')
+    parser.add_argument('--plot', default=None,
+                        help='imagen con las curvas (requiere matplotlib)')
+    return parser.parse_args(argv)
+
+
+# main de las curvas de escalamiento
+if __name__ == "__main__":
+
+    args = parseArgs(sys.argv[1:])
+    results = runScaling(args.sizes, args.seed, args.tags_per_book,
+                         args.repeat, args.data)
+    data = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(data)
+    else:
+        print(data)
+    if args.plot and not plotScaling(results, args.plot):
+        print('matplotlib no está instalado, no se dibujan las curvas')
@@ -0,0 +1,333 @@
+# Purpose: Servidor local de consultas sobre el catálogo
+import config as cf
+import sys
+import argparse
+import concurrent.futures
+import http.server
+import json
+import time
+import traceback
+import urllib.parse
+import controller
+import metrics
+assert cf
+
+
+"""
+El servidor carga el catálogo una sola vez y atiende consultas HTTP
+locales sobre él. Cada conexión se atiende en un pool de hilos de
+tamaño fijo y la ruta /batch permite enviar varias consultas en una
+sola petición. Las latencias de cada consulta quedan en /metrics.
+
+Rutas:
+    GET  /author?name=NOMBRE          libros de un autor
+    GET  /best?n=N&rank=average_rating|weighted_rating
+                                      los N libros mejor calificados
+    GET  /tag?name=TAG                número de libros con el tag
+    GET  /book?col=COLUMNA&key=LLAVE  libro por book_id, goodreads_book_id,
+                                      isbn o isbn13
+    GET  /tagbooks?name=TAG&n=N       libros marcados con el tag
+    GET  /booktags?id=BOOK_ID         tags de un libro con sus conteos
+    GET  /prefix?q=COMIENZO&n=N       autores cuyo nombre empieza por q
+    GET  /title?q=PALABRAS&mode=and|or&rank=COLUMNA&n=N
+                                      libros con las palabras en el título
+    GET  /filter?from=AÑO&to=AÑO&lang=IDIOMA&n=N
+                                      libros por rango de años e idioma
+    POST /batch                       lista JSON de consultas, p.ej.
+         [{"query": "best", "n": 5}, {"query": "tag", "name": "fantasy"}]
+    GET  /metrics                     percentiles de latencia
+    GET  /cache                       contadores del cache de consultas
+"""
+
+# dirección y tamaño del pool por defecto
+HOST = '127.0.0.1'
+PORT = 8000
+WORKERS = 8
+
+# número máximo de consultas en una petición /batch
+MAX_BATCH = 1000
+
+
+# Funciones de consulta
+
+def queryAuthor(control, params):
+    """
+    Retorna los libros de un autor
+    """
+    books = controller.getBooksByAuthor(control, params['name'])
+    if books is None:
+        return None
+    return [bookSummary(book) for book in books]
+
+
+def queryBest(control, params):
+    """
+    Retorna los n libros mejor calificados
+    """
+    books = controller.getBestBooks(control, int(params['n']),
+                                    params.get('rank', 'average_rating'))
+    return [bookSummary(book) for book in books]
+
+
+def queryTag(control, params):
+    """
+    Retorna el número de libros etiquetados con el tag
+    """
+    return controller.countBooksByTag(control, params['name'])
+
+
+def queryPrefix(control, params):
+    """
+    Retorna los nombres de los autores que empiezan por el prefijo q
+    """
+    authors = controller.getAuthorsByPrefix(control, params['q'],
+                                            int(params.get('n', 10)))
+    return [author['name'] for author in authors]
+
+
+def queryTitle(control, params):
+    """
+    Retorna los libros con las palabras de q en el título
+    """
+    books = controller.searchBooksByTitle(
+        control, params['q'], params.get('mode', 'and'),
+        params.get('rank', 'average_rating'), int(params.get('n', 10)))
+    return [bookSummary(book) for book in books]
+
+
+def queryFilter(control, params):
+    """
+    Retorna los libros del rango de años y el idioma pedidos
+    """
+    books = controller.filterBooks(
+        control,
+        int(params['from']) if 'from' in params else None,
+        int(params['to']) if 'to' in params else None,
+        params.get('lang'),
+        int(params['n']) if 'n' in params else None)
+    return [bookSummary(book) for book in books]
+
+
+def queryBook(control, params):
+    """
+    Retorna el libro con la llave pedida
+    """
+    book = controller.getBook(control, params.get('col', 'book_id'),
+                              params['key'])
+    return dict(book) if book is not None else None
+
+
+def queryTagBooks(control, params):
+    """
+    Retorna los libros marcados con el tag
+    """
+    books = controller.getBooksByTag(
+        control, params['name'],
+        int(params['n']) if 'n' in params else None)
+    return [bookSummary(book) for book in books]
+
+
+def queryBookTags(control, params):
+    """
+    Retorna los tags de un libro con sus conteos
+    """
+    tags = controller.getBookTags(control, int(params['id']))
+    if tags is None:
+        return None
+    return list(tags)
+
+
+def bookSummary(book):
+    """
+    Campos de un libro que se envían en las respuestas
+    """
+    return {'book_id': book['book_id'],
+            'title': book['title'],
+            'authors': book['authors'],
+            'average_rating': book['average_rating']}
+
+
+QUERIES = {
+    'author': queryAuthor,
+    'best': queryBest,
+    'tag': queryTag,
+    'book': queryBook,
+    'tagbooks': queryTagBooks,
+    'booktags': queryBookTags,
+    'prefix': queryPrefix,
+    'title': queryTitle,
+    'filter': queryFilter,
+}
+
+
+def runQuery(server, name, params):
+    """
+    Ejecuta una consulta y registra su latencia. Retorna el código
+    HTTP y el cuerpo de la respuesta: {"result": ...} o {"error": ...}.
+    Los parámetros inválidos son un error 400 y cualquier otra
+    excepción de la consulta un error 500
+    """
+    query = QUERIES.get(name)
+    if query is None:
+        return 400, {'error': 'unknown query: ' + str(name)}
+    start = time.perf_counter()
+    try:
+        status, response = 200, {'result': query(server.control, params)}
+    except (KeyError, ValueError, TypeError) as exp:
+        status, response = 400, {'error': type(exp).__name__ + ': ' +
+                                 str(exp)}
+    except Exception as exp:
+        # error del servidor, no de la petición: se deja en el log
+        traceback.print_exc()
+        status, response = 500, {'error': 'internal error: ' +
+                                 type(exp).__name__ + ': ' + str(exp)}
+    metrics.record(server.recorder, name, time.perf_counter() - start)
+    return status, response
+
+
+# Servidor
+
+class QueryHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Atiende las peticiones HTTP del servidor de consultas
+    """
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        name = url.path.strip('/')
+        if name == 'metrics':
+            self.sendJson(200, metrics.summary(self.server.recorder))
+            return
+        if name == 'cache':
+            self.sendJson(200, controller.getCacheStats(self.server.control))
+            return
+        if name not in QUERIES:
+            self.sendJson(404, {'error': 'not found: ' + url.path})
+            return
+        params = dict(urllib.parse.parse_qsl(url.query))
+        status, response = runQuery(self.server, name, params)
+        self.sendJson(status, response)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/batch':
+            self.sendJson(404, {'error': 'not found: ' + self.path})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            queries = json.loads(self.rfile.read(length) or b'null')
+        except ValueError as exp:
+            self.sendJson(400, {'error': 'invalid JSON: ' + str(exp)})
+            return
+        if not isinstance(queries, list) or len(queries) > MAX_BATCH:
+            self.sendJson(400, {'error': 'expected a JSON list of at most '
+                                         + str(MAX_BATCH) + ' queries'})
+            return
+        start = time.perf_counter()
+        results = []
+        for params in queries:
+            if not isinstance(params, dict):
+                results.append({'error': 'query must be a JSON object'})
+                continue
+            results.append(runQuery(self.server, params.get('query'),
+                                    params)[1])
+        metrics.record(self.server.recorder, 'batch',
+                       time.perf_counter() - start)
+        self.sendJson(200, {'results': results})
+
+    def sendJson(self, status, body):
+        """
+        Envía body como respuesta JSON
+        """
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class QueryServer(http.server.HTTPServer):
+    """
+    Servidor HTTP que atiende cada conexión en un pool de hilos de
+    tamaño fijo, sobre un catálogo ya cargado
+    """
+    daemon_threads = True
+
+    def __init__(self, control, address=(HOST, PORT), workers=WORKERS,
+                 verbose=False):
+        super().__init__(address, QueryHandler)
+        self.control = control
+        self.recorder = metrics.new_recorder()
+        self.verbose = verbose
+        self.pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='query')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.processRequest, request, client_address)
+
+    def processRequest(self, request, client_address):
+        """
+        Atiende una conexión dentro de un hilo del pool
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def newServer(control, host=HOST, port=PORT, workers=WORKERS,
+              verbose=False):
+    """
+    Crea el servidor de consultas sobre el catálogo de control. Con
+    port=0 el sistema asigna un puerto libre (ver server.server_address)
+    """
+    return QueryServer(control, (host, port), workers, verbose)
+
+
+def parseArgs(argv):
+    """
+    Lee los argumentos de la línea de comandos
+    """
+    parser = argparse.ArgumentParser(
+        description='Servidor local de consultas sobre el catálogo')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help='hilos que atienden las peticiones')
+    parser.add_argument('--nosnapshot', action='store_true',
+                        help='carga los archivos sin usar el snapshot')
+    parser.add_argument('--trusted', action='store_true',
+                        help='crea las estructuras del catálogo en modo '
+                             'confiable, sin verificar sus datos')
+    parser.add_argument('--verbose', action='store_true',
+                        help='muestra cada petición')
+    return parser.parse_args(argv)
+
+
+# main del servidor
+if __name__ == "__main__":
+
+    args = parseArgs(sys.argv[1:])
+    control = controller.newController(args.trusted)
+    print("Cargando información de los archivos ....")
+    controller.loadData(control, not args.nosnapshot)
+    server = newServer(control, args.host, args.port, args.workers,
+                       args.verbose)
+    host, port = server.server_address[:2]
+    print('Atendiendo consultas en http://' + host + ':' + str(port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
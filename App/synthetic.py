@@ -0,0 +1,481 @@
+"""
+Este módulo genera archivos sintéticos de libros, tags y asociaciones tag-libro
+con las mismas columnas que los archivos de GoodReads, para probar la carga y
+las consultas con catálogos de cualquier tamaño (p.ej. 1M o 10M de libros).
+
+Los archivos son deterministas: la misma semilla y los mismos tamaños producen
+siempre los mismos archivos. Las distribuciones imitan el sesgo de los datos
+reales: pocos autores, palabras y tags concentran la mayoría de los libros
+(distribución tipo Zipf), el número de calificaciones es log-normal y la
+mayoría de los libros está en inglés.
+
+Uso desde la línea de comandos:
+    python App/synthetic.py --books 1000000 --output Data/Synthetic/1M
+"""
+
+# native python modules
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+
+# columns of the books file, in the order of the real file
+# :data: BOOKS_COLUMNS
+BOOKS_COLUMNS: tuple = (
+    "book_id",
+    "goodreads_book_id",
+    "best_book_id",
+    "work_id",
+    "books_count",
+    "isbn",
+    "isbn13",
+    "authors",
+    "original_publication_year",
+    "original_title",
+    "title",
+    "language_code",
+    "average_rating",
+    "ratings_count",
+    "work_ratings_count",
+    "work_text_reviews_count",
+    "ratings_1",
+    "ratings_2",
+    "ratings_3",
+    "ratings_4",
+    "ratings_5",
+    "image_url",
+    "small_image_url",
+)
+"""
+Columnas del archivo de libros, en el orden del archivo real.
+"""
+
+# columns of the tags file
+# :data: TAGS_COLUMNS
+TAGS_COLUMNS: tuple = ("tag_id", "tag_name")
+"""
+Columnas del archivo de tags.
+"""
+
+# columns of the book_tags file
+# :data: BOOK_TAGS_COLUMNS
+BOOK_TAGS_COLUMNS: tuple = ("goodreads_book_id", "tag_id", "count")
+"""
+Columnas del archivo de asociaciones tag-libro.
+"""
+
+# number of tags of the real tags file
+# :data: TAGS
+TAGS: int = 34252
+"""
+Número de tags por defecto, el mismo del archivo real.
+"""
+
+# tags per book, the real file has 100 per book
+# :data: TAGS_PER_BOOK
+TAGS_PER_BOOK: int = 20
+"""
+Número de tags por libro por defecto. El archivo real tiene 100 por libro, con
+menos el archivo de asociaciones de 10M de libros cabe en disco.
+"""
+
+# languages and their weights in the real books file
+# :data: LANGUAGES
+LANGUAGES: tuple = (
+    ("eng", 6341),
+    ("en-US", 2070),
+    ("", 1084),
+    ("en-GB", 257),
+    ("ara", 64),
+    ("en-CA", 58),
+    ("fre", 25),
+    ("ind", 21),
+    ("spa", 20),
+    ("ger", 13),
+    ("jpn", 7),
+    ("per", 7),
+    ("pol", 6),
+    ("por", 6),
+    ("ita", 5),
+)
+"""
+Códigos de idioma y su frecuencia en el archivo real de libros.
+"""
+
+# share of ratings of each star in the real file, 1 to 5 stars
+# :data: STAR_SHARES
+STAR_SHARES: tuple = (0.023, 0.052, 0.192, 0.335, 0.398)
+"""
+Proporción de calificaciones de 1 a 5 estrellas en el archivo real.
+"""
+
+# syllables of the generated words and names
+_SYLLABLES: tuple = (
+    "ka", "lo", "mi", "ra", "ne", "to", "sa", "vi", "du", "re",
+    "an", "el", "or", "is", "um", "ba", "ce", "fi", "go", "hu",
+    "ja", "ke", "li", "mo", "nu", "pa", "qui", "ro", "si", "te",
+    "ul", "ve", "wa", "xi", "yo", "ze", "br", "ch", "st", "th",
+)
+
+_FIRST_NAMES: tuple = (
+    "Anna", "John", "Maria", "James", "Laura", "David", "Sofia", "Peter",
+    "Elena", "Michael", "Clara", "Robert", "Julia", "Thomas", "Emma",
+    "Daniel", "Lucia", "George", "Alice", "Henry", "Nora", "Samuel",
+    "Irene", "Oscar", "Rosa", "Victor", "Helen", "Paul", "Olga", "Mark",
+)
+
+_LAST_NAMES: tuple = (
+    "Smith", "Garcia", "Brown", "Martin", "Lopez", "Wilson", "Moore",
+    "Taylor", "Anderson", "Thomas", "Jackson", "White", "Harris", "Clark",
+    "Lewis", "Walker", "Young", "Allen", "King", "Wright", "Scott",
+    "Green", "Baker", "Adams", "Nelson", "Hill", "Campbell", "Mitchell",
+    "Roberts", "Carter", "Phillips", "Evans", "Turner", "Torres", "Parker",
+    "Collins", "Edwards", "Stewart", "Flores", "Morris",
+)
+
+
+def new_generator(seed: int, name: str) -> random.Random:
+    """new_generator crea el generador de números aleatorios de un archivo.
+    Cada archivo tiene su propio generador, así cada uno se puede generar solo
+    y sale igual.
+
+    Args:
+        seed (int): semilla del conjunto de datos.
+        name (str): nombre del archivo.
+
+    Returns:
+        random.Random: generador de números aleatorios.
+    """
+    return random.Random(f"{seed}:{name}")
+
+
+def zipf_index(rng: random.Random, size: int) -> int:
+    """zipf_index escoge un número entre 0 y size - 1 con probabilidad
+    aproximadamente proporcional a 1 / (número + 1), como la popularidad de
+    autores, palabras y tags: los primeros números salen mucho más que los
+    últimos. Usa la inversa de la distribución log-uniforme, sin tablas de
+    pesos, así cuesta O(1) para cualquier size.
+
+    Args:
+        rng (random.Random): generador de números aleatorios.
+        size (int): número de elementos.
+
+    Returns:
+        int: número escogido.
+    """
+    return min(int(math.exp(rng.random() * math.log(size + 1))) - 1,
+               size - 1)
+
+
+def power_index(rng: random.Random, size: int, skew: float) -> int:
+    """power_index escoge un número entre 0 y size - 1 con una distribución de
+    potencia más suave que zipf_index: con skew 1 es uniforme y con skew mayor
+    los primeros números salen más. Con skew 1.8 el autor más común tiene cerca
+    del 1% de los libros y la mayoría de autores uno o dos, como en el archivo
+    real.
+
+    Args:
+        rng (random.Random): generador de números aleatorios.
+        size (int): número de elementos.
+        skew (float): exponente de la distribución, mayor o igual a 1.
+
+    Returns:
+        int: número escogido.
+    """
+    return int(size * rng.random() ** skew)
+
+
+def make_word(idx: int) -> str:
+    """make_word construye una palabra distinta para cada número, juntando
+    sílabas.
+
+    Args:
+        idx (int): número de la palabra.
+
+    Returns:
+        str: palabra en minúsculas.
+    """
+    base = len(_SYLLABLES)
+    word = _SYLLABLES[idx % base]
+    idx //= base
+    word += _SYLLABLES[idx % base]
+    idx //= base
+    while idx:
+        idx -= 1
+        word += _SYLLABLES[idx % base]
+        idx //= base
+    return word
+
+
+def make_author(idx: int) -> str:
+    """make_author construye un nombre de autor distinto para cada número, con
+    nombre, apellido y, si hace falta, iniciales.
+
+    Args:
+        idx (int): número del autor.
+
+    Returns:
+        str: nombre del autor.
+    """
+    first = _FIRST_NAMES[idx % len(_FIRST_NAMES)]
+    idx //= len(_FIRST_NAMES)
+    last = _LAST_NAMES[idx % len(_LAST_NAMES)]
+    idx //= len(_LAST_NAMES)
+    initials = ""
+    while idx:
+        idx -= 1
+        initials += chr(ord("A") + idx % 26) + ". "
+        idx //= 26
+    return f"{first} {initials}{last}"
+
+
+def goodreads_id(idx: int) -> int:
+    """goodreads_id retorna el goodreads_book_id del libro número idx. Es
+    creciente y no se repite, y lo calculan igual el archivo de libros y el de
+    asociaciones.
+
+    Args:
+        idx (int): número del libro, desde 0.
+
+    Returns:
+        int: goodreads_book_id del libro.
+    """
+    return 1 + idx * 3 + (idx * 2654435761 >> 7) % 3
+
+
+def isbn_numbers(idx: int) -> tuple:
+    """isbn_numbers construye un isbn de 10 dígitos y su isbn13 para el libro
+    número idx, con sus dígitos de verificación. Los 9 dígitos del libro no se
+    repiten para menos de mil millones de libros.
+
+    Args:
+        idx (int): número del libro, desde 0.
+
+    Returns:
+        tuple: (isbn, isbn13) con los textos como en el archivo real, el isbn
+            sin ceros a la izquierda y el isbn13 en notación científica.
+    """
+    core = (idx * 7919 + 123456789) % 10 ** 9
+    digits = f"{core:09d}"
+    check = sum((10 - pos) * int(d) for pos, d in enumerate(digits)) % 11
+    check = (11 - check) % 11
+    isbn = digits + ("X" if check == 10 else str(check))
+    digits13 = "978" + digits
+    check13 = sum((3 if pos % 2 else 1) * int(d)
+                  for pos, d in enumerate(digits13))
+    isbn13 = int(digits13 + str((10 - check13 % 10) % 10))
+    return isbn.lstrip("0"), format(float(isbn13), ".12g")
+
+
+def generate_books(count: int, seed: int = 0, authors: int = None,
+                   vocabulary: int = 20000):
+    """generate_books genera los registros del archivo de libros.
+
+    Args:
+        count (int): número de libros.
+        seed (int, optional): semilla. Por defecto es 0.
+        authors (int, optional): número de autores posibles. Por defecto 80%
+            del número de libros, así resultan tantos autores distintos como en
+            el archivo real (58% del número de libros).
+        vocabulary (int, optional): número de palabras distintas de los
+            títulos. Por defecto es 20000.
+
+    Returns:
+        iterator: listas con los valores de BOOKS_COLUMNS.
+    """
+    rng = new_generator(seed, "books")
+    if authors is None:
+        authors = max(1, int(count * 0.8))
+    languages = [code for code, _ in LANGUAGES]
+    language_weights = [weight for _, weight in LANGUAGES]
+    alphas = [20 * share for share in STAR_SHARES]
+    for idx in range(count):
+        gid = goodreads_id(idx)
+        isbn, isbn13 = isbn_numbers(idx)
+        if rng.random() < 0.06:
+            isbn = ""
+        if rng.random() < 0.06:
+            isbn13 = ""
+        names = [make_author(power_index(rng, authors, 1.8))]
+        while rng.random() < 0.2 and len(names) < 4:
+            names.append(make_author(power_index(rng, authors, 1.8)))
+        words = [make_word(zipf_index(rng, vocabulary)).capitalize()
+                 for _ in range(1 + int(rng.expovariate(0.5)) % 8)]
+        original_title = " ".join(words)
+        title = original_title
+        if rng.random() < 0.25:
+            series = make_word(zipf_index(rng, vocabulary)).capitalize()
+            title += f" ({series}, #{1 + int(rng.expovariate(0.4))})"
+        if rng.random() < 0.06:
+            original_title = ""
+        year = ""
+        if rng.random() > 0.002:
+            year = f"{2017 - int(rng.expovariate(1 / 18.0))}.0"
+        # calificaciones: total log-normal y reparto por estrellas
+        ratings_count = max(1, int(rng.lognormvariate(9.96, 1.27)))
+        shares = [rng.gammavariate(alpha, 1.0) for alpha in alphas]
+        total = sum(shares)
+        stars = [int(ratings_count * share / total) for share in shares]
+        stars[4] += ratings_count - sum(stars)
+        average = sum((s + 1) * n for s, n in enumerate(stars))
+        average_rating = round(average / ratings_count, 2)
+        work_ratings = ratings_count + int(ratings_count
+                                           * rng.random() * 0.05)
+        image = f"https://images.gr-assets.com/books/{1300000000 + gid}"
+        yield [
+            idx + 1,
+            gid,
+            gid,
+            2 * gid + 1000003,
+            1 + int(rng.paretovariate(1.2)) % 3000,
+            isbn,
+            isbn13,
+            ", ".join(names),
+            year,
+            original_title,
+            title,
+            rng.choices(languages, language_weights)[0],
+            average_rating,
+            ratings_count,
+            work_ratings,
+            int(work_ratings * rng.random() * 0.08),
+            *stars,
+            f"{image}m/{gid}.jpg",
+            f"{image}s/{gid}.jpg",
+        ]
+
+
+def generate_tags(count: int = TAGS, seed: int = 0):
+    """generate_tags genera los registros del archivo de tags, con nombres
+    distintos hechos de palabras separadas por guiones como los del archivo
+    real.
+
+    Args:
+        count (int, optional): número de tags. Por defecto TAGS.
+        seed (int, optional): semilla. Por defecto es 0.
+
+    Returns:
+        iterator: listas con los valores de TAGS_COLUMNS.
+    """
+    rng = new_generator(seed, "tags")
+    for idx in range(count):
+        words = [make_word(idx)]
+        if rng.random() < 0.6:
+            words.append(make_word(rng.randrange(2000)))
+        yield [idx, "-".join(words)]
+
+
+def generate_book_tags(books: int, tags: int = TAGS,
+                       tags_per_book: int = TAGS_PER_BOOK, seed: int = 0):
+    """generate_book_tags genera los registros del archivo de asociaciones
+    tag-libro: tags_per_book tags distintos por libro, con popularidad
+    sesgada hacia los ids bajos, y sus conteos de mayor a menor, en orden de
+    goodreads_book_id como el archivo real. Los tags de cada libro son una
+    muestra sin repetición (random.sample) de los primeros tags_per_book + k
+    ids, con k tipo Zipf: los ids bajos marcan muchos más libros que los altos
+    y el costo por libro es O(tags_per_book), sin descartar tags repetidos.
+
+    Args:
+        books (int): número de libros.
+        tags (int, optional): número de tags. Por defecto TAGS.
+        tags_per_book (int, optional): tags de cada libro. Por defecto
+            TAGS_PER_BOOK.
+        seed (int, optional): semilla. Por defecto es 0.
+
+    Returns:
+        iterator: listas con los valores de BOOK_TAGS_COLUMNS.
+    """
+    rng = new_generator(seed, "book_tags")
+    tags_per_book = min(tags_per_book, tags)
+    for idx in range(books):
+        gid = goodreads_id(idx)
+        span = tags_per_book + zipf_index(rng, tags - tags_per_book + 1)
+        chosen = rng.sample(range(span), tags_per_book)
+        top = 1 + int(rng.lognormvariate(6.0, 1.5))
+        for rank, tag_id in enumerate(chosen):
+            yield [gid, tag_id, max(1, int(top / (rank + 1) ** 1.1))]
+
+
+def write_csv(filename: str, columns: tuple, rows) -> int:
+    """write_csv escribe un archivo CSV con su encabezado.
+
+    Args:
+        filename (str): ruta del archivo.
+        columns (tuple): nombres de las columnas.
+        rows (iterator): registros a escribir.
+
+    Returns:
+        int: número de registros escritos.
+    """
+    count = 0
+    with open(filename, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_dataset(directory: str, books: int, tags: int = TAGS,
+                  tags_per_book: int = TAGS_PER_BOOK, seed: int = 0) -> dict:
+    """write_dataset escribe en directory los archivos books.csv, tags.csv y
+    book_tags.csv de un conjunto de datos sintético.
+
+    Args:
+        directory (str): carpeta de los archivos, se crea si no existe.
+        books (int): número de libros.
+        tags (int, optional): número de tags. Por defecto TAGS.
+        tags_per_book (int, optional): tags de cada libro. Por defecto
+            TAGS_PER_BOOK.
+        seed (int, optional): semilla. Por defecto es 0.
+
+    Returns:
+        dict: "files" con las rutas de los archivos de libros, tags y
+            asociaciones (en el orden de controller.loadData) y "rows" con el
+            número de registros de cada uno.
+    """
+    os.makedirs(directory, exist_ok=True)
+    files = [os.path.join(directory, name)
+             for name in ("books.csv", "tags.csv", "book_tags.csv")]
+    rows = [
+        write_csv(files[0], BOOKS_COLUMNS, generate_books(books, seed)),
+        write_csv(files[1], TAGS_COLUMNS, generate_tags(tags, seed)),
+        write_csv(files[2], BOOK_TAGS_COLUMNS,
+                  generate_book_tags(books, tags, tags_per_book, seed)),
+    ]
+    dataset = {
+        "files": files,
+        "rows": rows,
+    }
+    return dataset
+
+
+def parse_args(argv: list) -> argparse.Namespace:
+    """parse_args lee los argumentos de la línea de comandos.
+
+    Args:
+        argv (list): argumentos.
+
+    Returns:
+        argparse.Namespace: argumentos leídos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Genera archivos sintéticos de GoodReads")
+    parser.add_argument("--books", type=int, required=True)
+    parser.add_argument("--tags", type=int, default=TAGS)
+    parser.add_argument("--tags-per-book", type=int, default=TAGS_PER_BOOK)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True,
+                        help="carpeta de los archivos")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    dataset = write_dataset(args.output, args.books, args.tags,
+                            args.tags_per_book, args.seed)
+    for filename, rows in zip(dataset["files"], dataset["rows"]):
+        print(f"{filename}: {rows} registros")
@@ -0,0 +1,61 @@
+import csv
+import os
+import sys
+import pytest
+
+"""
+Fixtures de las pruebas: los módulos de App se importan como lo hace
+view.py y el catálogo se carga con los archivos pequeños de
+Data/GoodReads, sin usar el snapshot.
+"""
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, APP_DIR)
+
+import controller  # noqa: E402
+
+DATA_DIR = os.path.join(APP_DIR, '..', 'Data', 'GoodReads')
+
+
+def writeCsv(path, header, rows):
+    """
+    Escribe un archivo CSV con el encabezado y las filas, y retorna
+    su ruta como texto
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def dataFiles(tmp_path_factory):
+    """
+    Archivos de libros, tags y asociaciones tag-libro de las pruebas.
+    El archivo de tags solo trae los tags que usan las asociaciones de
+    book_tags-small.csv, así cada carga toma pocos milisegundos
+    """
+    booktagsfile = os.path.join(DATA_DIR, 'book_tags-small.csv')
+    with open(booktagsfile, encoding='utf-8', newline='') as data:
+        used = {row['tag_id'] for row in csv.DictReader(data)}
+    tagsfile = str(tmp_path_factory.mktemp('data') / 'tags.csv')
+    with open(os.path.join(DATA_DIR, 'tags.csv'), encoding='utf-8',
+              newline='') as data, \
+            open(tagsfile, 'w', encoding='utf-8', newline='') as output:
+        reader = csv.reader(data)
+        writer = csv.writer(output)
+        writer.writerow(next(reader))
+        writer.writerows(row for row in reader if row[0] in used)
+    return [os.path.join(DATA_DIR, 'books-small.csv'), tagsfile,
+            booktagsfile]
+
+
+@pytest.fixture
+def control(dataFiles):
+    """
+    Controlador con el catálogo de los archivos pequeños
+    """
+    control = controller.newController()
+    controller.loadData(control, False, *dataFiles)
+    return control
@@ -0,0 +1,159 @@
+import csv
+import os
+import pytest
+import controller
+import model
+from conftest import DATA_DIR, writeCsv
+
+BOOKS_FILE = os.path.join(DATA_DIR, 'books.csv')
+
+
+def listController(dataFiles):
+    """
+    Controlador con los autores en una lista SingleLinked en vez del Map,
+    cargado con los archivos pequeños
+    """
+    control = controller.newController()
+    control['model'] = model.new_catalog(author_dstruct='SingleLinked')
+    controller.loadData(control, False, *dataFiles)
+    return control
+
+
+def authorBooks(catalog):
+    """
+    Llave canónica de cada autor -> nombre y book_id de sus libros
+    """
+    return {author['key']: (author['name'],
+                            [book['book_id'] for book in author['books']])
+            for author in model.get_authors(catalog)}
+
+
+def test_map_and_list_authors_match(control, dataFiles):
+    listed = listController(dataFiles)
+    catalog = control['model']
+    assert model.is_author_map(catalog)
+    assert not model.is_author_map(listed['model'])
+    assert controller.catalogSizes(listed['model']) == \
+        controller.catalogSizes(catalog)
+    assert authorBooks(listed['model']) == authorBooks(catalog)
+    for name in ('Suzanne Collins', 'J.K. Rowling', 'Mary GrandPré',
+                 'Gabriel García Márquez'):
+        expected = controller.getBooksByAuthor(control, name)
+        assert expected.size() > 0
+        assert [book['book_id']
+                for book in controller.getBooksByAuthor(listed, name)] == \
+            [book['book_id'] for book in expected]
+    assert controller.getBooksByAuthor(listed, 'nobody at all') is None
+    assert [author['name']
+            for author in controller.getBestAuthors(listed, 10)] == \
+        [author['name'] for author in controller.getBestAuthors(control, 10)]
+
+
+def scanAverages(catalog):
+    """
+    Llave canónica de cada autor -> promedio de average_rating de sus
+    libros, revisando todos los libros del catálogo
+    """
+    ratings = {}
+    for book in catalog['books']:
+        for name in book['authors'].split(','):
+            key = model.normalize_author_name(name.strip())
+            ratings.setdefault(key, []).append(book['average_rating'])
+    return {key: (sum(values) / len(values), len(values))
+            for key, values in ratings.items()}
+
+
+def assertAverages(catalog):
+    expected = scanAverages(catalog)
+    authors = list(model.get_authors(catalog))
+    assert len(authors) == len(expected)
+    for author in authors:
+        average, count = expected[author['key']]
+        assert author['rating_count'] == count
+        assert author['average_rating'] == pytest.approx(average)
+
+
+def test_running_averages_match_a_scan(control):
+    assertAverages(control['model'])
+    rowling = controller.getBooksByAuthor(control, 'J.K. Rowling')
+    ratings = [book['average_rating'] for book in rowling]
+    author = model.find_author(control['model'], 'J.K. Rowling')
+    assert author['average_rating'] == pytest.approx(
+        sum(ratings) / len(ratings))
+
+
+def test_running_averages_follow_a_delta(control, dataFiles, tmp_path):
+    with open(dataFiles[0], encoding='utf-8', newline='') as data:
+        reader = csv.DictReader(data)
+        header = reader.fieldnames
+        rows = {row['book_id']: row for row in reader}
+    # el libro 18 pierde dos autores y el 3 baja su rating
+    rows['18']['authors'] = 'J.K. Rowling'
+    rows['18']['average_rating'] = '3.0'
+    rows['3']['average_rating'] = '1.0'
+    booksfile = writeCsv(tmp_path / 'books.csv', header,
+                         [[rows[book_id][column] for column in header]
+                          for book_id in ('18', '3')])
+    assert controller.loadDelta(control, booksfile=booksfile)[
+        'books_updated'] == 2
+    catalog = control['model']
+    assertAverages(catalog)
+    assert model.find_author(catalog, 'Rufus Beck') is None
+    assert model.find_author(catalog, 'Mary GrandPré')['rating_count'] == 6
+    averages = scanAverages(catalog)
+    expected = sorted(averages, key=lambda key: (-averages[key][0],
+                                                 -averages[key][1], key))
+    assert [author['key']
+            for author in controller.getBestAuthors(control, 20)] == \
+        expected[:20]
+
+
+def test_author_names_are_canonical(control):
+    key = model.normalize_author_name('Suzanne Collins')
+    assert key == 'suzanne collins'
+    # mayúsculas, espacios repetidos o no separables y letras de ancho
+    # completo dan la misma llave
+    for name in ('SUZANNE COLLINS', '  Suzanne\t  Collins ',
+                 'Suzanne Collins', 'Ｓｕｚａｎｎｅ Ｃｏｌｌｉｎｓ'):
+        assert model.normalize_author_name(name) == key
+        assert model.find_author(control['model'], name)['name'] == \
+            'Suzanne Collins'
+    # NFKC compone las tildes escritas con marcas combinantes
+    assert model.normalize_author_name('Gabriel Garci\u0301a') == \
+        model.normalize_author_name('Gabriel Garc\u00eda')
+    assert model.normalize_author_name('Straße') == 'strasse'
+
+
+def test_canonical_names_join_authors(control, dataFiles, tmp_path):
+    with open(dataFiles[0], encoding='utf-8', newline='') as data:
+        reader = csv.reader(data)
+        header = next(reader)
+        row = next(reader)
+    for column, value in (('book_id', '9999'),
+                          ('goodreads_book_id', '99999999'),
+                          ('isbn', '999999999'),
+                          ('isbn13', '9.99999999999e+12'),
+                          ('authors', 'SUZANNE   collins')):
+        row[header.index(column)] = value
+    size = model.authors_size(control['model'])
+    booksfile = writeCsv(tmp_path / 'books.csv', header, [row])
+    controller.loadDelta(control, booksfile=booksfile)
+    assert model.authors_size(control['model']) == size
+    books = controller.getBooksByAuthor(control, 'Suzanne Collins')
+    assert [book['book_id'] for book in books][-1] == 9999
+
+
+@pytest.mark.skipif(not os.path.exists(BOOKS_FILE),
+                    reason='sin el archivo completo de libros')
+def test_full_books_file_author_count():
+    control = controller.newController()
+    assert controller.loadBooks(control['model'], BOOKS_FILE, {}) == \
+        (10000, 5833)
+    # antes de las llaves canónicas se comparaba con lower() y los nombres
+    # con espacios repetidos (p.ej. "William  Gibson") eran otro autor
+    names = set()
+    with open(BOOKS_FILE, encoding='utf-8', newline='') as data:
+        for book in csv.DictReader(data):
+            names.update(name.strip().lower()
+                         for name in book['authors'].split(','))
+    assert len(names) == 5841
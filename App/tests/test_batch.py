@@ -0,0 +1,56 @@
+import json
+import controller
+import view
+
+
+def runBatch(tmp_path, lines, control=None):
+    """
+    Ejecuta las operaciones de lines en el modo por lotes y retorna el
+    reporte y el JSON que quedó en el archivo de salida
+    """
+    if control is None:
+        control = controller.newController()
+    opsfile = tmp_path / 'ops.txt'
+    opsfile.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    outfile = tmp_path / 'out.json'
+    report = view.runBatch(control, str(opsfile), str(outfile))
+    with open(outfile, encoding='utf-8') as output:
+        return report, json.load(output)
+
+
+def test_batch_runs_every_operation(tmp_path, dataFiles, control):
+    report, written = runBatch(tmp_path, [
+        '# carga sin snapshot',
+        'load nosnapshot ' + ' '.join(dataFiles),
+        '',
+        'top 3',
+        'top 3',
+        'author Suzanne Collins',
+        'tag to-read'])
+    assert written == json.loads(json.dumps(report))
+    operations = report['operations']
+    assert [op['op'] for op in operations] == \
+        ['load', 'top', 'top', 'author', 'tag']
+    assert [op['line'] for op in operations] == [2, 4, 5, 6, 7]
+    assert all(op['error'] is None for op in operations)
+    assert list(operations[0]['result'].values()) == \
+        list(controller.catalogSizes(control['model']))
+    assert [book['book_id'] for book in operations[1]['result']] == \
+        [book['book_id'] for book in operations[2]['result']]
+    assert operations[3]['result']['book_ids'][0] == 1
+    assert operations[4]['result'] > 0
+    latency = report['latency']
+    assert latency['top']['count'] == 2
+    assert set(latency['load']) >= {'p50_ms', 'p90_ms', 'p95_ms',
+                                    'p99_ms', 'max_ms'}
+    assert report['cache']['hits'] == 1
+
+
+def test_batch_records_errors_and_continues(tmp_path, control):
+    report, _ = runBatch(tmp_path, ['unknown 1', 'top x', 'top 1'],
+                         control)
+    errors = [op['error'] for op in report['operations']]
+    assert errors[0] == 'Unknown operation: unknown'
+    assert errors[1] is not None
+    assert errors[2] is None
+    assert report['latency']['top']['count'] == 2
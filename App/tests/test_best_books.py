@@ -0,0 +1,69 @@
+import csv
+import controller
+import model
+from conftest import writeCsv
+
+
+def bestBookIds(control, number, rank_by='average_rating'):
+    return [book['book_id']
+            for book in controller.getBestBooks(control, number, rank_by)]
+
+
+def sortedBookIds(catalog, score):
+    """
+    book_id de todos los libros ordenados por score de mayor a menor,
+    con los empates en orden de carga
+    """
+    books = list(catalog['books'])
+    books.sort(key=lambda book: (-score(book), book.pos))
+    return [book['book_id'] for book in books]
+
+
+def test_best_books_match_a_full_sort(control):
+    catalog = control['model']
+    expected = sortedBookIds(catalog, lambda book: book['average_rating'])
+    ratings = [book['average_rating'] for book in catalog['books']]
+    # el archivo tiene empates, que quedan en orden de carga
+    assert len(set(ratings)) < len(ratings)
+    assert bestBookIds(control, 30) == expected[:30]
+    assert bestBookIds(control, len(expected) + 5) == expected
+    assert bestBookIds(control, 0) == []
+
+
+def test_weighted_best_books_match_a_full_sort(control):
+    catalog = control['model']
+    prior = catalog['weighted_prior']
+    expected = sortedBookIds(
+        catalog, lambda book: model.weighted_rating(book, *prior))
+    assert bestBookIds(control, 30, 'weighted_rating') == expected[:30]
+    assert bestBookIds(control, len(expected),
+                       'weighted_rating') == expected
+
+
+def test_prior_overtakes_a_book_with_few_ratings(control, dataFiles,
+                                                 tmp_path):
+    with open(dataFiles[0], encoding='utf-8', newline='') as data:
+        reader = csv.reader(data)
+        header = next(reader)
+        row = next(reader)
+    # un libro nuevo con tres calificaciones de 5 estrellas
+    for column, value in (('book_id', '9999'),
+                          ('goodreads_book_id', '99999999'),
+                          ('isbn', '999999999'),
+                          ('isbn13', '9.99999999999e+12'),
+                          ('average_rating', '5.0'),
+                          ('ratings_count', '3')):
+        row[header.index(column)] = value
+    booksfile = writeCsv(tmp_path / 'books.csv', header, [row])
+    assert controller.loadDelta(control, booksfile=booksfile)[
+        'books_added'] == 1
+    assert bestBookIds(control, 1) == [9999]
+    weighted = bestBookIds(control, 200, 'weighted_rating')
+    assert weighted[0] != 9999
+    catalog = control['model']
+    book = controller.getBook(control, 'book_id', 9999)
+    assert controller.getWeightedRating(control, book) == \
+        model.weighted_rating(book, *catalog['weighted_prior'])
+    prior = catalog['weighted_prior']
+    assert weighted == sortedBookIds(
+        catalog, lambda book: model.weighted_rating(book, *prior))
@@ -0,0 +1,54 @@
+import controller
+from conftest import writeCsv
+
+
+def test_repeated_query_hits_the_cache(control):
+    controller.clearCache(control)
+    first = controller.getBestBooks(control, 5)
+    assert controller.getBestBooks(control, 5) is first
+    controller.getBestBooks(control, 6)
+    stats = controller.getCacheStats(control)
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 2, 2)
+
+
+def test_delta_invalidates_the_cache(control, tmp_path):
+    controller.clearCache(control)
+    before = controller.countBooksByTag(control, 'english')
+    # goodreads_book_id 2 es el libro 21, sin el tag english
+    booktagsfile = writeCsv(tmp_path / 'book_tags.csv',
+                            ('goodreads_book_id', 'tag_id', 'count'),
+                            [(2, 10644, 7)])
+    controller.loadDelta(control, booktagsfile=booktagsfile)
+    assert controller.countBooksByTag(control, 'english') == before + 1
+    stats = controller.getCacheStats(control)
+    assert stats['invalidations'] == 1
+    assert (stats['hits'], stats['misses'], stats['size']) == (0, 2, 1)
+
+
+def test_new_catalog_invalidates_the_cache(control):
+    controller.clearCache(control)
+    controller.getBestBooks(control, 5)
+    control['model'] = controller.newController()['model']
+    assert controller.getBestBooks(control, 5).size() == 0
+    assert controller.getCacheStats(control)['invalidations'] == 1
+
+
+def test_cache_evicts_the_least_recent(control):
+    control['cache'] = controller.newQueryCache(2)
+    for number in (1, 2, 1, 3):
+        controller.getBestBooks(control, number)
+    stats = controller.getCacheStats(control)
+    assert (stats['hits'], stats['evictions'], stats['size']) == (1, 1, 2)
+    # el 2 salió del cache y el 1 sigue en él
+    controller.getBestBooks(control, 1)
+    controller.getBestBooks(control, 2)
+    stats = controller.getCacheStats(control)
+    assert (stats['hits'], stats['misses']) == (2, 4)
+
+
+def test_disabled_cache_keeps_nothing(control):
+    control['cache'] = controller.newQueryCache(0)
+    controller.getBestBooks(control, 5)
+    controller.getBestBooks(control, 5)
+    stats = controller.getCacheStats(control)
+    assert (stats['hits'], stats['size']) == (0, 0)
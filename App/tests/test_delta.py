@@ -0,0 +1,94 @@
+import controller
+from conftest import writeCsv
+
+BOOK_TAGS_HEADER = ('goodreads_book_id', 'tag_id', 'count')
+TAGS_HEADER = ('tag_id', 'tag_name')
+
+# libro 27 (goodreads_book_id 1) marcado 167697 veces con to-read
+BOOK_ID = 27
+GOODREADS_ID = 1
+TO_READ_ID = 30574
+ENGLISH_ID = 10644
+
+
+def tagCount(control, book_id, tag_id):
+    for tag in controller.getBookTags(control, book_id):
+        if tag['tag_id'] == tag_id:
+            return tag['count']
+    return None
+
+
+def loadBookTags(control, tmp_path, rows):
+    booktagsfile = writeCsv(tmp_path / 'book_tags.csv', BOOK_TAGS_HEADER,
+                            rows)
+    return controller.loadDelta(control, booktagsfile=booktagsfile)
+
+
+def loadTags(control, tmp_path, rows):
+    tagsfile = writeCsv(tmp_path / 'tags.csv', TAGS_HEADER, rows)
+    return controller.loadDelta(control, tagsfile=tagsfile)
+
+
+def test_existing_book_tag_count_is_replaced(control, tmp_path):
+    assert tagCount(control, BOOK_ID, TO_READ_ID) == 167697
+    sizes = controller.catalogSizes(control['model'])
+    delta = loadBookTags(control, tmp_path,
+                         [(GOODREADS_ID, TO_READ_ID, 5)])
+    assert delta['book_tags_updated'] == 1
+    assert delta['book_tags_added'] == 0
+    assert tagCount(control, BOOK_ID, TO_READ_ID) == 5
+    assert controller.catalogSizes(control['model']) == sizes
+    delta = loadBookTags(control, tmp_path,
+                         [(GOODREADS_ID, TO_READ_ID, 5)])
+    assert delta['book_tags_unchanged'] == 1
+    assert delta['rows_touched'] == 0
+
+
+def test_new_and_unmatched_book_tags(control, tmp_path):
+    before = controller.countBooksByTag(control, 'english')
+    # goodreads_book_id 2 es el libro 21, sin el tag english
+    assert tagCount(control, 21, ENGLISH_ID) is None
+    delta = loadBookTags(control, tmp_path,
+                         [(2, ENGLISH_ID, 7), (999999999, ENGLISH_ID, 1)])
+    assert delta['book_tags_added'] == 1
+    assert delta['book_tags_unmatched'] == 1
+    assert tagCount(control, 21, ENGLISH_ID) == 7
+    assert controller.countBooksByTag(control, 'english') == before + 1
+
+
+def test_tag_renamed_in_place(control, tmp_path):
+    books = controller.countBooksByTag(control, 'to-read')
+    tags = controller.catalogSizes(control['model'])[2]
+    delta = loadTags(control, tmp_path, [(TO_READ_ID, 'want-to-read')])
+    assert delta['tags_updated'] == 1
+    assert controller.catalogSizes(control['model'])[2] == tags
+    assert controller.countBooksByTag(control, 'to-read') == 0
+    assert controller.countBooksByTag(control, 'want-to-read') == books
+
+
+def test_tag_id_changed_in_place(control, tmp_path):
+    tags = controller.catalogSizes(control['model'])[2]
+    delta = loadTags(control, tmp_path, [(999999, 'to-read')])
+    assert delta['tags_updated'] == 1
+    assert controller.catalogSizes(control['model'])[2] == tags
+    catalog = control['model']
+    assert catalog['tag_ids'].get(TO_READ_ID) is None
+    assert catalog['tag_ids'].get(999999).get_value()['name'] == 'to-read'
+    delta = loadTags(control, tmp_path, [(999999, 'to-read')])
+    assert delta['tags_unchanged'] == 1
+
+
+def test_book_updated_in_place(control, dataFiles, tmp_path):
+    with open(dataFiles[0], encoding='utf-8') as data:
+        header = data.readline().strip().split(',')
+    book = dict(controller.getBook(control, 'book_id', BOOK_ID))
+    record = [book[column] if book[column] is not None else ''
+              for column in header]
+    record[header.index('average_rating')] = 1.5
+    booksfile = writeCsv(tmp_path / 'books.csv', header, [record])
+    sizes = controller.catalogSizes(control['model'])
+    delta = controller.loadDelta(control, booksfile=booksfile)
+    assert delta['books_updated'] == 1
+    assert controller.catalogSizes(control['model']) == sizes
+    assert controller.getBook(control, 'book_id',
+                              BOOK_ID)['average_rating'] == 1.5
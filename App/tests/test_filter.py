@@ -0,0 +1,75 @@
+import math
+import pytest
+import controller
+import model
+
+
+def scanBooks(control, year_from=None, year_to=None, language=None):
+    """
+    book_id de los libros que cumplen los filtros, revisando todos los
+    libros, en orden de año y de carga
+    """
+    low = -math.inf if year_from is None else year_from
+    high = math.inf if year_to is None else year_to
+    matches = []
+    for book in control['model']['books']:
+        year = model.parse_year(book['original_publication_year'])
+        if year_from is not None or year_to is not None:
+            if year is None or not low <= year <= high:
+                continue
+        if language is not None and book['language_code'] != language:
+            continue
+        matches.append((year is None, year or 0, book.pos, book['book_id']))
+    matches.sort()
+    return [book_id for _, _, _, book_id in matches]
+
+
+def filterBooks(control, year_from=None, year_to=None, language=None,
+                number=None):
+    books = controller.filterBooks(control, year_from, year_to, language,
+                                   number)
+    return [book['book_id'] for book in books]
+
+
+@pytest.mark.parametrize('year_from, year_to', [
+    (None, None), (2000, None), (None, 1900), (1990, 2005), (2005, 2005),
+    (-1000, -500), (2100, None), (2010, 2000)])
+def test_year_ranges_match_a_scan(control, year_from, year_to):
+    expected = scanBooks(control, year_from, year_to)
+    assert filterBooks(control, year_from, year_to) == expected
+    if year_from is not None or year_to is not None:
+        assert model.count_books_by_years(control['model'], year_from,
+                                          year_to) == len(expected)
+
+
+@pytest.mark.parametrize('year_from, year_to, language', [
+    (1990, 2005, 'eng'), (1990, 2005, 'en-US'), (None, 1950, 'spa'),
+    (2000, None, 'en-CA'), (None, None, 'eng'), (-1000, 2020, 'en-US')])
+def test_year_and_language_match_a_scan(control, year_from, year_to,
+                                        language):
+    expected = scanBooks(control, year_from, year_to, language)
+    assert filterBooks(control, year_from, year_to, language) == expected
+    assert filterBooks(control, year_from, year_to, language,
+                       number=2) == expected[:2]
+
+
+def test_unknown_language(control):
+    assert filterBooks(control, language='xx') == []
+    assert filterBooks(control, 1990, 2005, 'xx') == []
+
+
+def test_open_bounds_count_every_dated_book(control):
+    catalog = control['model']
+    dated = len(scanBooks(control, -math.inf, math.inf))
+    assert model.count_books_by_years(catalog) == dated
+    assert model.count_books_by_years(catalog, -math.inf,
+                                      math.inf) == dated
+    # los bordes en ±inf incluyen los años extremos del indice
+    years = [model.parse_year(book['original_publication_year'])
+             for book in catalog['books']]
+    assert model.count_books_by_years(catalog, None, min(years)) == \
+        years.count(min(years))
+    assert model.count_books_by_years(catalog, max(years), None) == \
+        years.count(max(years))
+    empty = controller.newController()['model']
+    assert model.count_books_by_years(empty) == 0
@@ -0,0 +1,53 @@
+import sys
+from DISClib.ADT.lists import List
+from DISClib.ADT.maps import Map
+from DISClib.ADT import orderedmap as om
+from DISClib.Utils import footprint
+
+
+def records(number):
+    return [{'id': idx, 'name': 'author %d' % idx} for idx in range(number)]
+
+
+def test_shared_objects_are_counted_once():
+    shared = records(200)
+    linked = List(dstruct='SingleLinked')
+    array = List(dstruct='ArrayList')
+    for record in shared:
+        linked.add_last(record)
+        array.add_last(record)
+    alone = footprint.footprint(array)['bytes']
+    results = footprint.footprints({'linked': linked, 'array': array})
+    # los registros se cuentan en la primera estructura que los alcanza
+    shared_bytes = footprint.deep_sizeof(shared, {id(shared)})
+    assert results['array']['bytes'] <= alone - shared_bytes
+    assert results['linked']['bytes'] > shared_bytes
+    seen = set()
+    together = footprint.deep_sizeof(linked, seen) + \
+        footprint.deep_sizeof(array, seen)
+    assert sum(result['bytes'] for result in results.values()) == together
+    assert footprint.footprints({'first': array, 'again': array})[
+        'again']['bytes'] == 0
+
+
+def test_empty_structures_have_no_bytes_per_element():
+    for structure in (List(), List(dstruct='SingleLinked'),
+                      Map(dstruct='SeparateChaining'),
+                      om.newMap(omaptype='RBT'), [], {}):
+        result = footprint.footprint(structure)
+        assert result['elements'] == 0
+        assert result['bytes'] > 0
+        assert result['bytes_per_element'] is None
+    assert footprint.footprint(3)['bytes_per_element'] is None
+
+
+def test_deep_linked_list_does_not_recurse():
+    number = sys.getrecursionlimit() * 5
+    linked = List(dstruct='SingleLinked')
+    for idx in range(number):
+        linked.add_last(idx)
+    result = footprint.footprint(linked)
+    assert result['elements'] == number
+    assert result['bytes_per_element'] == result['bytes'] / number
+    nodes = max(result['types'].values(), key=lambda stats: stats['count'])
+    assert nodes['count'] >= number
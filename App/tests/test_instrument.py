@@ -0,0 +1,48 @@
+import config as cf
+import controller
+import view
+from DISClib.DataStructures import heap
+from DISClib.Utils import instrument
+
+
+def rbtComparisons(report):
+    return sum(method['comparisons']
+               for method in report['instrumentation']['methods']
+               if method['method'].startswith('RBT.'))
+
+
+def test_heap_operations_are_counted():
+    instrument.reset()
+    instrument.enable()
+    try:
+        minheap = heap.newHeap(lambda a, b: (a > b) - (a < b))
+        for element in (5, 3, 8, 1):
+            heap.insert(minheap, element)
+        smallest = heap.delMin(minheap)
+    finally:
+        instrument.disable()
+    assert smallest == 1
+    methods = {method['method']: method
+               for method in instrument.report(number=None)}
+    assert methods['Heap.insert']['calls'] == 4
+    assert methods['Heap.delMin']['calls'] == 1
+    assert methods['Heap.greater']['comparisons'] > 0
+
+
+def test_catalog_loaded_from_snapshot_is_watched(tmp_path, dataFiles,
+                                                 monkeypatch):
+    # el snapshot se escribe en un data_dir temporal
+    (tmp_path / 'GoodReads').mkdir()
+    monkeypatch.setattr(cf, 'data_dir', str(tmp_path) + '/')
+    controller.loadData(controller.newController(), True, *dataFiles)
+    control = controller.newController()
+    catalog = control['model']
+    opsfile = tmp_path / 'ops.txt'
+    opsfile.write_text('load ' + ' '.join(dataFiles) + '\n'
+                       'filter from=1990 to=2000\n', encoding='utf-8')
+    report = view.runBatch(control, str(opsfile),
+                           str(tmp_path / 'out.json'),
+                           str(tmp_path / 'stacks.txt'))
+    assert control['model'] is not catalog
+    assert [op['error'] for op in report['operations']] == [None, None]
+    assert rbtComparisons(report) > 0
@@ -0,0 +1,109 @@
+import csv
+import pytest
+import controller
+from conftest import writeCsv
+
+
+@pytest.fixture
+def books(dataFiles):
+    """
+    Encabezado y primeras filas del archivo de libros pequeño
+    """
+    with open(dataFiles[0], encoding='utf-8', newline='') as data:
+        reader = csv.reader(data)
+        header = next(reader)
+        rows = [next(reader) for _ in range(3)]
+    return header, rows
+
+
+def loadBooks(tmp_path, dataFiles, header, rows):
+    """
+    Controlador con un catálogo de los libros de rows
+    """
+    control = controller.newController()
+    booksfile = writeCsv(tmp_path / 'books.csv', header, rows)
+    controller.loadData(control, False, booksfile, *dataFiles[1:])
+    return control
+
+
+def updateBook(control, tmp_path, header, row):
+    booksfile = writeCsv(tmp_path / 'delta.csv', header, [row])
+    return controller.loadDelta(control, booksfile=booksfile)
+
+
+def test_isbn13_is_not_unique(tmp_path, dataFiles, books):
+    header, rows = books
+    isbn13 = header.index('isbn13')
+    rows[1][isbn13] = rows[0][isbn13]
+    control = loadBooks(tmp_path, dataFiles, header, rows)
+    catalog = control['model']
+    key = rows[0][isbn13]
+    assert list(controller.model.get_book_positions(catalog, 'isbn13',
+                                                    key)) == [0, 1]
+    assert controller.getBook(control, 'isbn13', key)['book_id'] == 1
+    assert controller.getDuplicateKeys(control).size() == 0
+
+
+def test_shadowed_key_is_restored(tmp_path, dataFiles, books):
+    header, rows = books
+    isbn = header.index('isbn')
+    rows[2][isbn] = rows[0][isbn]
+    control = loadBooks(tmp_path, dataFiles, header, rows)
+    key = rows[0][isbn]
+    assert controller.getBook(control, 'isbn', key)['book_id'] == 1
+    assert controller.getDuplicateKeys(control).size() == 1
+    # un cambio que no toca la llave no se la quita al primer libro
+    rows[0][header.index('average_rating')] = '1.5'
+    assert updateBook(control, tmp_path, header,
+                      rows[0])['books_updated'] == 1
+    assert controller.getBook(control, 'isbn', key)['book_id'] == 1
+    assert controller.getDuplicateKeys(control).size() == 1
+    # el libro cambia de isbn y la llave pasa al libro que la repetía
+    rows[0][isbn] = '0000000001'
+    assert updateBook(control, tmp_path, header,
+                      rows[0])['books_updated'] == 1
+    assert controller.getBook(control, 'isbn', key)['book_id'] == 3
+    assert controller.getBook(control, 'isbn',
+                              '0000000001')['book_id'] == 1
+    assert controller.getDuplicateKeys(control).size() == 0
+
+
+def test_duplicate_record_is_not_repeated(tmp_path, dataFiles, books):
+    header, rows = books
+    isbn = header.index('isbn')
+    rows[2][isbn] = rows[0][isbn]
+    control = loadBooks(tmp_path, dataFiles, header, rows)
+    rows[2][header.index('average_rating')] = '1.5'
+    assert updateBook(control, tmp_path, header,
+                      rows[2])['books_updated'] == 1
+    duplicates = controller.getDuplicateKeys(control)
+    assert duplicates.size() == 1
+    assert duplicates.get_element(0)['pos'] == 2
+
+
+def test_key_passes_down_the_repetitions(tmp_path, dataFiles, books):
+    header, rows = books
+    isbn = header.index('isbn')
+    goodreads = header.index('goodreads_book_id')
+    rows[1][isbn] = rows[2][isbn] = rows[0][isbn]
+    rows[2][goodreads] = rows[1][goodreads]
+    control = loadBooks(tmp_path, dataFiles, header, rows)
+    key = rows[0][isbn]
+    duplicates = controller.getDuplicateKeys(control)
+    assert [(duplicate['pos'], duplicate['column'], duplicate['first_pos'])
+            for duplicate in duplicates] == \
+        [(1, 'isbn', 0), (2, 'goodreads_book_id', 1), (2, 'isbn', 0)]
+    # la llave pasa al segundo libro y el tercero la repite ahora de él
+    rows[0][isbn] = '0000000001'
+    updateBook(control, tmp_path, header, rows[0])
+    assert controller.getBook(control, 'isbn', key)['book_id'] == 2
+    assert [(duplicate['pos'], duplicate['column'], duplicate['first_pos'])
+            for duplicate in controller.getDuplicateKeys(control)] == \
+        [(2, 'goodreads_book_id', 1), (2, 'isbn', 1)]
+    # el tercer libro deja de repetir el isbn
+    rows[2][isbn] = '0000000003'
+    updateBook(control, tmp_path, header, rows[2])
+    assert controller.getBook(control, 'isbn', key)['book_id'] == 2
+    assert [(duplicate['pos'], duplicate['column'])
+            for duplicate in controller.getDuplicateKeys(control)] == \
+        [(2, 'goodreads_book_id')]
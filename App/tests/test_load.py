@@ -0,0 +1,46 @@
+import controller
+from conftest import writeCsv
+
+
+def test_malformed_rows_are_counted(tmp_path):
+    tagsfile = writeCsv(tmp_path / 'tags.csv', ('tag_id', 'tag_name'),
+                        [(1, 'a'), (2, 'b', 'extra'), (3,), (4, 'd')])
+    counters = {}
+    rows = list(controller.readRows(tagsfile, ('tag_name', 'tag_id'),
+                                    counters, records=False))
+    assert rows == [('a', '1'), ('d', '4')]
+    assert counters == {'malformed': 2}
+
+
+def test_chunks_keep_quoted_newlines(tmp_path):
+    rows = [(idx, 'line\nbreak "%d"' % idx) for idx in range(7)]
+    tagsfile = writeCsv(tmp_path / 'tags.csv', ('tag_id', 'tag_name'), rows)
+    chunks = list(controller.readChunks(tagsfile, chunk_rows=2))
+    assert chunks[0] == 'tag_id,tag_name\r\n'
+    # cada fila ocupa dos líneas, que quedan en el mismo bloque
+    assert len(chunks) == 1 + len(rows)
+    header = ['tag_id', 'tag_name']
+    parsed = []
+    for text in chunks[1:]:
+        records, malformed, seconds = controller.parseChunk(text, header)
+        assert malformed == 0
+        parsed.extend(records)
+    assert parsed == list(controller.readRows(tagsfile))
+
+
+def test_parallel_load_matches_sequential(dataFiles, monkeypatch):
+    monkeypatch.setattr(controller, 'PARALLEL_CHUNK_ROWS', 100)
+    sequential = controller.newController()
+    parallel = controller.newController()
+    sizes = controller.loadData(sequential, False, *dataFiles)
+    assert controller.loadData(parallel, False, *dataFiles,
+                               parallel=True, workers=2) == sizes
+    stats = controller.getLoadStats(parallel)
+    assert stats['book_tags']['rows'] == sizes[3]
+    assert stats['book_tags']['malformed'] == 0
+    best = [book['book_id']
+            for book in controller.getBestBooks(sequential, 10)]
+    assert [book['book_id']
+            for book in controller.getBestBooks(parallel, 10)] == best
+    assert controller.countBooksByTag(parallel, 'to-read') == \
+        controller.countBooksByTag(sequential, 'to-read')
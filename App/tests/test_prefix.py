@@ -0,0 +1,105 @@
+import csv
+import unicodedata
+import pytest
+import controller
+import model
+from conftest import writeCsv
+
+
+def foldName(name):
+    """
+    Nombre en minúsculas, con espacios simples y sin tildes, como lo
+    compara el indice de prefijos
+    """
+    name = ' '.join(unicodedata.normalize('NFKC', name).casefold().split())
+    return ''.join(char for char in unicodedata.normalize('NFD', name)
+                   if not unicodedata.combining(char))
+
+
+def scanAuthors(control, prefix, number=10):
+    """
+    Nombres de los autores cuyo nombre empieza por prefix, revisando todos
+    los autores, en orden de su nombre sin tildes
+    """
+    prefix = foldName(prefix)
+    authors = [(foldName(author['name']), author['key'], author['name'])
+               for author in model.get_authors(control['model'])]
+    authors.sort()
+    return [name for folded, _, name in authors
+            if folded.startswith(prefix)][:max(number, 0)]
+
+
+def prefixAuthors(control, prefix, number=10):
+    authors = controller.getAuthorsByPrefix(control, prefix, number)
+    return [author['name'] for author in authors]
+
+
+@pytest.mark.parametrize('prefix', ['s', 'Suzanne', 'j.k.', 'stephen ', 'a',
+                                    'Gabriel García', 'Charlotte Br'])
+def test_prefixes_match_a_scan(control, prefix):
+    expected = scanAuthors(control, prefix, 200)
+    assert expected
+    assert prefixAuthors(control, prefix, 200) == expected
+
+
+def test_prefix_ignores_case_and_accents(control):
+    expected = prefixAuthors(control, 'suz')
+    assert expected == ['Suzanne Collins']
+    assert prefixAuthors(control, 'SUZ') == expected
+    # letras de ancho completo, NFKC las convierte en ASCII
+    assert prefixAuthors(control, 'ＳＵＺ') == expected
+    assert prefixAuthors(control, '  suzanne   col') == expected
+    garcia = ['Gabriel García Márquez']
+    assert prefixAuthors(control, 'gabriel garcia m') == garcia
+    assert prefixAuthors(control, 'GABRIEL GARCÍA MÁ') == garcia
+    assert prefixAuthors(control, 'emily bronte') == ['Emily Brontë']
+    assert prefixAuthors(control, 'celal u') == ['Celâl Üster']
+
+
+def test_empty_prefix_returns_the_first_authors(control):
+    expected = scanAuthors(control, '', 10)
+    assert len(expected) == 10
+    assert prefixAuthors(control, '') == expected
+    assert prefixAuthors(control, '', 1000) == \
+        scanAuthors(control, '', 1000)
+    assert len(prefixAuthors(control, '', 1000)) == \
+        model.authors_size(control['model'])
+
+
+def test_number_limits_the_authors(control):
+    expected = scanAuthors(control, 'a', 200)
+    assert len(expected) > 3
+    for number in (0, 1, 3, len(expected), len(expected) + 5):
+        assert prefixAuthors(control, 'a', number) == expected[:number]
+    assert prefixAuthors(control, 'a', -1) == []
+
+
+def test_prefix_past_the_last_author(control):
+    last = scanAuthors(control, '', 1000)[-1]
+    assert prefixAuthors(control, last) == [last]
+    assert prefixAuthors(control, last + 'z') == []
+    assert prefixAuthors(control, 'zzzz') == []
+    assert prefixAuthors(control, '￿') == []
+
+
+def test_prefix_index_follows_a_delta(control, dataFiles, tmp_path):
+    with open(dataFiles[0], encoding='utf-8', newline='') as data:
+        reader = csv.reader(data)
+        header = next(reader)
+        row = next(reader)
+    for column, value in (('book_id', '9999'),
+                          ('goodreads_book_id', '99999999'),
+                          ('isbn', '999999999'),
+                          ('isbn13', '9.99999999999e+12'),
+                          ('authors', 'Gabriel Garcia, Émile Zola')):
+        row[header.index(column)] = value
+    # la consulta queda en la cache antes del delta
+    prefixAuthors(control, 'gabriel')
+    booksfile = writeCsv(tmp_path / 'books.csv', header, [row])
+    controller.loadDelta(control, booksfile=booksfile)
+    expected = scanAuthors(control, 'gabriel')
+    assert expected == ['Gabriel Garcia', 'Gabriel García Márquez']
+    assert prefixAuthors(control, 'gabriel') == expected
+    assert prefixAuthors(control, 'emile') == ['Émile Zola']
+    assert prefixAuthors(control, '', 1000) == \
+        scanAuthors(control, '', 1000)
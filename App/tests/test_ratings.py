@@ -0,0 +1,52 @@
+import subprocess
+import sys
+import numpy as np
+import pytest
+import controller
+import ratings
+from conftest import APP_DIR
+
+
+def test_app_imports_without_numpy():
+    # numpy en None hace fallar cualquier "import numpy"
+    code = ('import sys; sys.modules["numpy"] = None; '
+            'import controller, view, server')
+    subprocess.run([sys.executable, '-c', code], cwd=APP_DIR, check=True)
+
+
+def test_percentiles_skip_missing_values(control):
+    catalog = control['model']
+    books = catalog['books']
+    counts = books.column('ratings_count')
+    # vacía el ratings_count de la mitad de los libros
+    for pos in range(0, books.size(), 2):
+        counts[pos] = ratings.MISSING_INT
+    present = [value for value in counts if value != ratings.MISSING_INT]
+    result = ratings.rating_percentiles(catalog, 'ratings_count', (0, 50))
+    assert result[0] == min(present)
+    assert result[50] == pytest.approx(float(np.median(present)))
+
+
+def test_groups_use_the_catalog_prior(control):
+    catalog = control['model']
+    grouped = ratings.ratings_by_language(catalog)
+    prior_mean, prior_weight = catalog['weighted_prior']
+    totals = grouped['ratings'].sum(axis=1)
+    stars = grouped['ratings'] @ ratings.STARS
+    expected = (prior_weight * prior_mean + stars) / (prior_weight + totals)
+    assert np.allclose(grouped['bayesian_rating'], expected)
+    # sin peso el rating bayesiano es el promedio de las calificaciones
+    grouped = ratings.group_ratings(
+        catalog, np.arange(catalog['books'].size()),
+        np.zeros(catalog['books'].size(), dtype=np.int64), ['all'],
+        prior=(prior_mean, 0))
+    assert grouped['bayesian_rating'][0] == \
+        pytest.approx(grouped['mean_rating'][0])
+
+
+def test_rating_queries(control):
+    stats = controller.getRatingStats(control)
+    assert set(stats) == {'histogram', 'average_rating', 'ratings_count'}
+    top = controller.getRatingsByAuthor(control, 3)
+    assert len(top) == 3
+    assert top[0]['bayesian_rating'] >= top[-1]['bayesian_rating']
@@ -0,0 +1,88 @@
+import re
+import unicodedata
+import pytest
+import controller
+
+
+def words(text):
+    """
+    Palabras de un texto en minúsculas, como las compara la búsqueda
+    """
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return set(re.findall(r'\w+', text))
+
+
+def scanTitles(control, query, mode='and', rank_by='average_rating'):
+    """
+    book_id de los libros cuyo título tiene las palabras de query,
+    revisando todos los libros, de mayor a menor rank_by
+    """
+    terms = words(query)
+    matches = []
+    for book in control['model']['books']:
+        titles = words(book['title']) | words(book['original_title'])
+        found = terms <= titles if mode == 'and' else terms & titles
+        if terms and found:
+            matches.append(book)
+    matches.sort(key=lambda book: (-book[rank_by], book.pos))
+    return [book['book_id'] for book in matches]
+
+
+def searchTitles(control, query, mode='and', rank_by='average_rating',
+                 number=200):
+    books = controller.searchBooksByTitle(control, query, mode, rank_by,
+                                          number)
+    return [book['book_id'] for book in books]
+
+
+@pytest.mark.parametrize('query', ['harry potter', 'the', 'the hobbit',
+                                   'of the', 'games hunger'])
+def test_and_search_matches_a_scan(control, query):
+    expected = scanTitles(control, query)
+    assert expected
+    assert searchTitles(control, query) == expected
+
+
+@pytest.mark.parametrize('query', ['harry twilight', 'hobbit gatsby rye'])
+def test_or_search_matches_a_scan(control, query):
+    expected = scanTitles(control, query, 'or')
+    assert len(expected) > 1
+    assert searchTitles(control, query, 'or') == expected
+    # ninguno de los libros tiene todas las palabras
+    assert searchTitles(control, query) == []
+
+
+def test_query_is_normalized(control):
+    expected = searchTitles(control, 'harry potter')
+    assert searchTitles(control, '  HARRY, Potter!! ') == expected
+    # letras de ancho completo, NFKC las convierte en ASCII
+    assert searchTitles(control, 'ＨＡＲＲＹ ＰＯＴＴＥＲ') == expected
+    assert searchTitles(control, 'harry harry potter') == expected
+
+
+def test_unknown_words(control):
+    assert searchTitles(control, 'harry zzzqx') == []
+    assert searchTitles(control, 'harry zzzqx', 'or') == \
+        scanTitles(control, 'harry', 'or')
+    assert searchTitles(control, '') == []
+    assert searchTitles(control, '!!!', 'or') == []
+
+
+def test_ranking_by_column(control):
+    expected = scanTitles(control, 'the', rank_by='ratings_count')
+    assert expected != scanTitles(control, 'the')
+    assert searchTitles(control, 'the', rank_by='ratings_count') == expected
+
+
+def test_number_cuts_the_ranked_results(control):
+    expected = scanTitles(control, 'the', 'or')
+    for number in (0, 1, 5, len(expected)):
+        assert searchTitles(control, 'the', 'or',
+                            number=number) == expected[:number]
+
+
+def test_invalid_arguments(control):
+    with pytest.raises(ValueError):
+        controller.searchBooksByTitle(control, 'the', mode='xor')
+    with pytest.raises(ValueError):
+        controller.searchBooksByTitle(control, 'the', rank_by='title')
@@ -0,0 +1,70 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+import server
+
+
+@pytest.fixture
+def address(control):
+    """
+    Servidor de consultas en un puerto libre, atendiendo en un hilo
+    """
+    httpd = server.newServer(control, port=0, workers=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    host, port = httpd.server_address[:2]
+    yield 'http://' + host + ':' + str(port)
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+
+def request(url, body=None):
+    """
+    Envía una petición y retorna el código y el cuerpo JSON
+    """
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    try:
+        with urllib.request.urlopen(url, data, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exp:
+        return exp.code, json.loads(exp.read())
+
+
+def test_best_books(address):
+    status, body = request(address + '/best?n=2')
+    assert status == 200
+    assert len(body['result']) == 2
+    ratings = [book['average_rating'] for book in body['result']]
+    assert ratings == sorted(ratings, reverse=True)
+
+
+def test_invalid_parameter_is_400(address):
+    status, body = request(address + '/best?n=abc')
+    assert status == 400
+    assert body['error'].startswith('ValueError')
+
+
+def test_unknown_route_is_404(address):
+    status, body = request(address + '/nothing')
+    assert status == 404
+    assert 'error' in body
+
+
+def test_unexpected_error_is_500(address, monkeypatch):
+    def broken(control, params):
+        raise RuntimeError('broken query')
+
+    monkeypatch.setitem(server.QUERIES, 'tag', broken)
+    status, body = request(address + '/tag?name=fantasy')
+    assert status == 500
+    assert body == {'error': 'internal error: RuntimeError: broken query'}
+    # el error queda en la respuesta de su consulta dentro de un batch
+    status, body = request(address + '/batch',
+                           [{'query': 'tag', 'name': 'fantasy'},
+                            {'query': 'best', 'n': 1}])
+    assert status == 200
+    assert 'error' in body['results'][0]
+    assert len(body['results'][1]['result']) == 1
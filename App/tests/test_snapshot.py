@@ -0,0 +1,50 @@
+import shutil
+import controller
+
+
+def bestBooks(control):
+    return [book['book_id'] for book in controller.getBestBooks(control, 10)]
+
+
+def test_snapshot_round_trip(control, dataFiles, tmp_path):
+    snapshot = str(tmp_path / 'catalog.snapshot')
+    controller.saveSnapshot(control, snapshot, dataFiles)
+    loaded = controller.newController()
+    assert controller.loadSnapshot(loaded, snapshot, dataFiles)
+    assert loaded['model'] is not control['model']
+    assert controller.catalogSizes(loaded['model']) == \
+        controller.catalogSizes(control['model'])
+    assert bestBooks(loaded) == bestBooks(control)
+    assert controller.countBooksByTag(loaded, 'to-read') == \
+        controller.countBooksByTag(control, 'to-read')
+    assert controller.getBook(loaded, 'isbn', '439023483')['book_id'] == 1
+
+
+def test_stale_snapshot_is_not_loaded(control, dataFiles, tmp_path):
+    snapshot = str(tmp_path / 'catalog.snapshot')
+    files = [str(tmp_path / 'books.csv')] + dataFiles[1:]
+    shutil.copyfile(dataFiles[0], files[0])
+    controller.saveSnapshot(control, snapshot, files)
+    # otros archivos de datos o un archivo que cambió
+    assert not controller.loadSnapshot(controller.newController(), snapshot,
+                                       dataFiles)
+    with open(files[0], 'a', encoding='utf-8') as data:
+        data.write('\n')
+    assert not controller.loadSnapshot(controller.newController(), snapshot,
+                                       files)
+
+
+def test_snapshot_only_replaces_an_empty_catalog(control, dataFiles,
+                                                 tmp_path, monkeypatch):
+    (tmp_path / 'GoodReads').mkdir()
+    monkeypatch.setattr(controller.cf, 'data_dir', str(tmp_path) + '/')
+    catalog = control['model']
+    controller.loadData(control, True, *dataFiles)
+    assert control['model'] is catalog
+    assert not (tmp_path / controller.SNAPSHOT_FILE).exists()
+    fresh = controller.newController()
+    sizes = controller.loadData(fresh, True, *dataFiles)
+    assert (tmp_path / controller.SNAPSHOT_FILE).exists()
+    loaded = controller.newController()
+    assert controller.loadData(loaded, True, *dataFiles) == sizes
+    assert 'snapshot' in controller.getLoadStats(loaded)
@@ -0,0 +1,55 @@
+import collections
+import controller
+import synthetic
+
+
+def readFiles(dataset):
+    contents = []
+    for filename in dataset['files']:
+        with open(filename, encoding='utf-8') as data:
+            contents.append(data.read())
+    return contents
+
+
+def test_generator_is_deterministic(tmp_path):
+    first = synthetic.write_dataset(str(tmp_path / 'first'), 60, tags=300,
+                                    tags_per_book=20, seed=7)
+    again = synthetic.write_dataset(str(tmp_path / 'again'), 60, tags=300,
+                                    tags_per_book=20, seed=7)
+    other = synthetic.write_dataset(str(tmp_path / 'other'), 60, tags=300,
+                                    tags_per_book=20, seed=8)
+    assert first['rows'] == again['rows'] == [60, 300, 60 * 20]
+    assert readFiles(first) == readFiles(again)
+    assert readFiles(first)[2] != readFiles(other)[2]
+    control = controller.newController()
+    assert controller.loadData(control, False, *first['files']) == \
+        (60, controller.model.authors_size(control['model']), 300, 1200)
+
+
+def test_book_tags_are_distinct_and_skewed():
+    rows = list(synthetic.generate_book_tags(200, tags=500,
+                                             tags_per_book=30, seed=1))
+    books = collections.defaultdict(list)
+    for gid, tag_id, count in rows:
+        books[gid].append((tag_id, count))
+    assert len(books) == 200
+    for chosen in books.values():
+        tag_ids = [tag_id for tag_id, _ in chosen]
+        assert len(set(tag_ids)) == 30
+        assert all(0 <= tag_id < 500 for tag_id in tag_ids)
+        counts = [count for _, count in chosen]
+        assert counts == sorted(counts, reverse=True)
+    # los ids bajos marcan muchos más libros que los altos
+    popularity = collections.Counter(tag_id for _, tag_id, _ in rows)
+    first = sum(popularity[tag_id] for tag_id in range(30))
+    last = sum(popularity[tag_id] for tag_id in range(470, 500))
+    assert first > 10 * last
+
+
+def test_book_tags_use_every_tag_when_there_are_few():
+    rows = list(synthetic.generate_book_tags(5, tags=10, tags_per_book=50))
+    assert len(rows) == 5 * 10
+    for idx in range(5):
+        gid = synthetic.goodreads_id(idx)
+        assert sorted(tag_id for book, tag_id, _ in rows
+                      if book == gid) == list(range(10))
@@ -0,0 +1,41 @@
+import csv
+import controller
+
+
+def scanTagCounts(dataFiles):
+    """
+    Nombre de cada tag -> número de libros distintos del archivo de libros
+    marcados con él, revisando todas las asociaciones tag-libro
+    """
+    booksfile, tagsfile, booktagsfile = dataFiles
+    with open(booksfile, encoding='utf-8', newline='') as data:
+        books = {row['goodreads_book_id'] for row in csv.DictReader(data)}
+    with open(tagsfile, encoding='utf-8', newline='') as data:
+        names = {row['tag_id']: row['tag_name']
+                 for row in csv.DictReader(data)}
+    tagged = {}
+    with open(booktagsfile, encoding='utf-8', newline='') as data:
+        for row in csv.DictReader(data):
+            if row['goodreads_book_id'] in books:
+                tagged.setdefault(names[row['tag_id']], set()).add(
+                    row['goodreads_book_id'])
+    return {name: len(books) for name, books in tagged.items()}
+
+
+def test_tag_counts_match_a_scan(control, dataFiles):
+    expected = scanTagCounts(dataFiles)
+    assert len(expected) > 100
+    assert max(expected.values()) > 1
+    for name, count in expected.items():
+        assert controller.countBooksByTag(control, name) == count
+
+
+def test_unused_and_unknown_tags(control, dataFiles):
+    assert controller.countBooksByTag(control, 'no-such-tag') == 0
+    with open(dataFiles[1], encoding='utf-8', newline='') as data:
+        names = {row['tag_name'] for row in csv.DictReader(data)}
+    # tags que solo marcan libros que no están en el catálogo
+    unused = names - set(scanTagCounts(dataFiles))
+    assert unused
+    for name in unused:
+        assert controller.countBooksByTag(control, name) == 0
@@ -0,0 +1,56 @@
+import pytest
+import controller
+import model
+
+
+def catalogModes(catalog):
+    """
+    Modo confiable de las listas y mapas del catálogo que lo tienen
+    """
+    structures = [catalog['authors'], catalog['tags'],
+                  catalog['tag_names'], catalog['tag_ids'],
+                  catalog['duplicate_keys'], catalog['title_idx']]
+    structures.extend(catalog['book_keys'].values())
+    return {structure.trusted for structure in structures}
+
+
+def test_catalog_is_checked_by_default(control):
+    catalog = control['model']
+    assert model.CATALOG_TRUSTED is False
+    assert catalog['trusted'] is False
+    assert catalogModes(catalog) == {False}
+    author = model.get_authors(catalog).get_element(0)
+    assert author['books'].trusted is False
+    listed = model.new_catalog(author_dstruct='SingleLinked')
+    assert listed['authors'].trusted is False
+
+
+@pytest.mark.parametrize('author_dstruct', ['SeparateChaining',
+                                            'SingleLinked'])
+def test_trusted_catalog_matches_checked(control, dataFiles,
+                                         author_dstruct):
+    trusted = controller.newController(trusted=True)
+    trusted['model'] = model.new_catalog(author_dstruct=author_dstruct,
+                                         trusted=True)
+    sizes = controller.loadData(trusted, False, *dataFiles)
+    catalog = trusted['model']
+    assert catalog['trusted'] is True
+    assert catalogModes(catalog) == {True}
+    author = model.get_authors(catalog).get_element(0)
+    assert author['books'].trusted is True
+    assert sizes == controller.catalogSizes(control['model'])
+    best = [book['book_id'] for book in controller.getBestBooks(control, 10)]
+    assert [book['book_id']
+            for book in controller.getBestBooks(trusted, 10)] == best
+
+
+def test_snapshot_keeps_the_trusted_mode(tmp_path, dataFiles):
+    snapshot = str(tmp_path / 'catalog.snapshot')
+    trusted = controller.newController(trusted=True)
+    controller.loadData(trusted, False, *dataFiles)
+    controller.saveSnapshot(trusted, snapshot, dataFiles)
+    checked = controller.newController()
+    assert not controller.loadSnapshot(checked, snapshot, dataFiles)
+    trusted = controller.newController(trusted=True)
+    assert controller.loadSnapshot(trusted, snapshot, dataFiles)
+    assert trusted['model']['trusted'] is True
@@ -1,7 +1,14 @@
 # Purpose: Vista del programa
 import config as cf
 import sys
+import argparse
+import json
+import os
+import time
 import controller
+import metrics
+from DISClib.Utils import instrument
+from DISClib.Utils import footprint
 # from DISClib.ADT import list as lt
 assert cf
 
@@ -13,12 +20,15 @@ se hace la solicitud al controlador para ejecutar la
 operación solicitada
 """
 
+# métodos de DISClib que se incluyen en el reporte de instrumentación
+INSTRUMENT_TOP = 50
 
-def newController():
+
+def newController(trusted=False):
     """
     Se crea una instancia del controlador
     """
-    control = controller.newController()
+    control = controller.newController(trusted)
     return control
 
 
@@ -31,6 +41,11 @@ def printMenu():
     print("2- Consultar los Top x libros por promedio")
     print("3- Consultar los libros de un autor")
     print("4- Libros por género")
+    print("5- Consultar los Top x autores por promedio")
+    print("6- Buscar autores por el comienzo de su nombre")
+    print("7- Buscar libros por palabras del título")
+    print("8- Filtrar libros por año de publicación e idioma")
+    print("9- Consultar los Top x libros por rating ponderado")
     print("0- Salir")
 
 
@@ -42,6 +57,33 @@ def loadData(control):
     return books, authors, tags, book_tags
 
 
+def printLoadStats(control):
+    """
+    Imprime el tiempo y la velocidad de carga de cada archivo
+    """
+    stats = controller.getLoadStats(control)
+    for name, stat in stats.items():
+        msg = name + ': ' + str(stat['rows']) + ' registros en '
+        msg += '{:.3f}'.format(stat['seconds']) + ' s ('
+        msg += '{:.0f}'.format(stat['rows_per_second']) + ' registros/s)'
+        if stat.get('malformed'):
+            msg += ', ' + str(stat['malformed']) + ' filas ignoradas'
+        if 'parse_seconds' in stat:
+            msg += ', lectura en paralelo: '
+            msg += '{:.3f}'.format(stat['parse_seconds']) + ' s'
+        print(msg)
+    duplicates = controller.getDuplicateKeys(control)
+    if duplicates.size():
+        print('Llaves de libros repetidas: ' + str(duplicates.size()))
+
+
+def printFootprint(control):
+    """
+    Imprime la memoria que ocupa cada estructura del catálogo
+    """
+    print(footprint.format_footprints(controller.getFootprint(control)))
+
+
 def printAuthorData(author):
     """
     Recorre la lista de libros de un autor, imprimiendo
@@ -71,11 +113,272 @@ def printBestBooks(books):
         # for book in lt.iterator(books):
         for book in books:
             print('Titulo: ' + book['title'] + '  ISBN: ' +
-                  book['isbn'] + ' Rating: ' + book['average_rating'])
+                  book['isbn'] + ' Rating: ' + str(book['average_rating']))
     else:
         print('No se encontraron libros')
 
 
+def printBestAuthors(authors):
+    """
+    Imprime los mejores autores solicitados
+    """
+    size = authors.size()
+    if size:
+        print(' Estos son los mejores autores: ')
+        for author in authors:
+            print('Autor: ' + author['name'] + '  Libros: ' +
+                  str(author['rating_count']) + ' Promedio: ' +
+                  '{:.2f}'.format(author['average_rating']))
+    else:
+        print('No se encontraron autores')
+
+
+# Funciones del modo por lotes
+
+def dataPath(filename):
+    """
+    Retorna la ruta de un archivo de datos, relativa a cf.data_dir si
+    no es una ruta absoluta
+    """
+    if os.path.isabs(filename):
+        return filename
+    return cf.data_dir + filename
+
+
+def runOperation(control, op, arg):
+    """
+    Ejecuta una operación del modo por lotes sobre el catálogo y
+    retorna su resultado en un formato que se puede escribir en JSON.
+    Las operaciones son:
+        load [nosnapshot] [parallel] [libros tags asociaciones]
+        top [average_rating|weighted_rating] N
+        author NOMBRE DEL AUTOR
+        tag NOMBRE DEL TAG
+        authors N [MINIMO DE LIBROS]
+        prefix N COMIENZO DEL NOMBRE
+        title [and|or] [average_rating|ratings_count] N PALABRAS
+        filter [from=AÑO] [to=AÑO] [lang=IDIOMA] [n=N]
+        delta [books=ARCHIVO] [tags=ARCHIVO] [book_tags=ARCHIVO]
+        book book_id|goodreads_book_id|isbn|isbn13 LLAVE
+        tagbooks N NOMBRE DEL TAG
+        booktags BOOK_ID
+        ratings [author|language N [MINIMO DE LIBROS]]
+    """
+    if op == 'load':
+        tokens = arg.split()
+        files = [dataPath(t) for t in tokens
+                 if t not in ('nosnapshot', 'parallel')]
+        if len(files) not in (0, 3):
+            raise ValueError('load needs 0 or 3 files, got ' +
+                             str(len(files)))
+        sizes = controller.loadData(control,
+                                    'nosnapshot' not in tokens,
+                                    *files,
+                                    parallel='parallel' in tokens)
+        return dict(zip(('books', 'authors', 'tags', 'book_tags'), sizes))
+    elif op == 'top':
+        tokens = arg.split()
+        rank_by = tokens.pop(0) if len(tokens) > 1 else 'average_rating'
+        books = controller.getBestBooks(control, int(tokens[0]), rank_by)
+        return [{'book_id': book['book_id'],
+                 'title': book['title'],
+                 'average_rating': book['average_rating'],
+                 'ratings_count': book['ratings_count'],
+                 'weighted_rating': controller.getWeightedRating(control,
+                                                                 book)}
+                for book in books]
+    elif op == 'author':
+        books = controller.getBooksByAuthor(control, arg)
+        if books is None:
+            return None
+        return {'books': books.size(),
+                'book_ids': [book['book_id'] for book in books]}
+    elif op == 'tag':
+        return controller.countBooksByTag(control, arg)
+    elif op == 'authors':
+        tokens = arg.split()
+        min_books = int(tokens[1]) if len(tokens) > 1 else 1
+        authors = controller.getBestAuthors(control, int(tokens[0]),
+                                            min_books)
+        return [{'name': author['name'],
+                 'books': author['rating_count'],
+                 'average_rating': author['average_rating']}
+                for author in authors]
+    elif op == 'prefix':
+        number, _, prefix = arg.partition(' ')
+        authors = controller.getAuthorsByPrefix(control, prefix,
+                                                int(number))
+        return [author['name'] for author in authors]
+    elif op == 'title':
+        tokens = arg.split()
+        mode = 'and'
+        rank_by = 'average_rating'
+        if tokens and tokens[0] in ('and', 'or'):
+            mode = tokens.pop(0)
+        if tokens and tokens[0] in ('average_rating', 'ratings_count'):
+            rank_by = tokens.pop(0)
+        if not tokens:
+            raise ValueError('title needs N and the words to search')
+        books = controller.searchBooksByTitle(control, ' '.join(tokens[1:]),
+                                              mode, rank_by, int(tokens[0]))
+        return [{'book_id': book['book_id'],
+                 'title': book['title'],
+                 rank_by: book[rank_by]}
+                for book in books]
+    elif op == 'filter':
+        params = dict(token.split('=', 1) for token in arg.split())
+        books = controller.filterBooks(
+            control,
+            int(params['from']) if 'from' in params else None,
+            int(params['to']) if 'to' in params else None,
+            params.get('lang'),
+            int(params['n']) if 'n' in params else None)
+        return [book['book_id'] for book in books]
+    elif op == 'delta':
+        params = dict(token.split('=', 1) for token in arg.split())
+        files = [dataPath(params[name]) if name in params else None
+                 for name in ('books', 'tags', 'book_tags')]
+        return controller.loadDelta(control, *files)
+    elif op == 'book':
+        column, _, key = arg.partition(' ')
+        book = controller.getBook(control, column, key)
+        return dict(book) if book is not None else None
+    elif op == 'tagbooks':
+        number, _, tag = arg.partition(' ')
+        books = controller.getBooksByTag(control, tag, int(number))
+        return [book['book_id'] for book in books]
+    elif op == 'booktags':
+        tags = controller.getBookTags(control, int(arg))
+        if tags is None:
+            return None
+        return [[tag['name'], tag['count']] for tag in tags]
+    elif op == 'ratings':
+        tokens = arg.split()
+        if not tokens:
+            stats = controller.getRatingStats(control)
+            histogram = stats['histogram']
+            return {'counts': histogram['counts'].tolist(),
+                    'share': histogram['share'].tolist(),
+                    'mean': histogram['mean'],
+                    'average_rating': stats['average_rating'],
+                    'ratings_count': stats['ratings_count']}
+        group = {'author': controller.getRatingsByAuthor,
+                 'language': controller.getRatingsByLanguage}[tokens[0]]
+        min_books = int(tokens[2]) if len(tokens) > 2 else 1
+        return group(control, int(tokens[1]), min_books)
+    raise ValueError('Unknown operation: ' + op)
+
+
+def runBatch(control, opsfile, outfile=None, stacksfile=None,
+             withFootprint=False):
+    """
+    Ejecuta sobre un mismo catálogo las operaciones de un archivo, una
+    por línea (ver runOperation); las líneas vacías y las que empiezan
+    con '#' se ignoran. Escribe en outfile (o en la salida estándar)
+    un JSON con el resultado y la latencia de cada operación y los
+    percentiles de latencia por tipo de operación. Si hay stacksfile,
+    las operaciones se ejecutan con la instrumentación de DISClib: el
+    JSON incluye los contadores por método y las pilas de llamados se
+    escriben en stacksfile en formato folded (para flamegraph.pl). Con
+    withFootprint el JSON incluye la memoria de cada estructura del
+    catálogo al final de las operaciones
+    """
+    recorder = metrics.new_recorder()
+    results = []
+    if stacksfile:
+        instrument.reset()
+        instrument.enable()
+        # los mapas ordenados del catálogo se crearon antes de enable()
+        watchCatalog(control)
+    try:
+        runOperations(control, opsfile, recorder, results)
+    finally:
+        instrument.disable()
+    report = {'operations': results,
+              'latency': metrics.summary(recorder),
+              'cache': controller.getCacheStats(control)}
+    if stacksfile:
+        report['instrumentation'] = {
+            'methods': instrument.report(number=INSTRUMENT_TOP),
+            'nodes': instrument.node_counts()}
+        instrument.export_folded(stacksfile)
+    if withFootprint:
+        report['footprint'] = controller.getFootprint(control)
+    if outfile is None:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        with open(outfile, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+    return report
+
+
+def watchCatalog(control):
+    """
+    Cuenta las comparaciones de los mapas ordenados del catálogo si la
+    instrumentación de DISClib está encendida (ver instrument.watch)
+    """
+    for structure in control['model'].values():
+        instrument.watch(structure)
+
+
+def runOperations(control, opsfile, recorder, results):
+    """
+    Ejecuta las operaciones de un archivo del modo por lotes y agrega
+    a results el resultado y la latencia de cada una
+    """
+    with open(opsfile, encoding='utf-8') as ops:
+        for lineno, line in enumerate(ops, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            op, _, arg = line.partition(' ')
+            arg = arg.strip()
+            error = None
+            result = None
+            start = time.perf_counter()
+            catalog = control['model']
+            try:
+                result = runOperation(control, op, arg)
+            except Exception as exp:
+                error = str(exp)
+            elapsed = time.perf_counter() - start
+            if control['model'] is not catalog:
+                # p.ej. un load desde el snapshot reemplaza el catálogo
+                watchCatalog(control)
+            metrics.record(recorder, op, elapsed)
+            results.append({'line': lineno,
+                            'op': op,
+                            'arg': arg,
+                            'latency_ms': 1000.0 * elapsed,
+                            'result': result,
+                            'error': error})
+
+
+def parseArgs(argv):
+    """
+    Lee los argumentos de la línea de comandos
+    """
+    parser = argparse.ArgumentParser(
+        description='Catálogo de libros de GoodReads')
+    parser.add_argument('--batch', metavar='OPSFILE',
+                        help='ejecuta las operaciones del archivo sin '
+                             'mostrar el menú')
+    parser.add_argument('--output', metavar='FILE',
+                        help='archivo JSON para los resultados del modo '
+                             'por lotes (por defecto la salida estándar)')
+    parser.add_argument('--instrument', metavar='STACKSFILE',
+                        help='mide las estructuras de DISClib en el modo '
+                             'por lotes y escribe sus pilas de llamados')
+    parser.add_argument('--footprint', action='store_true',
+                        help='muestra la memoria de cada estructura del '
+                             'catálogo después de cargarlo')
+    parser.add_argument('--trusted', action='store_true',
+                        help='crea las estructuras del catálogo en modo '
+                             'confiable, sin verificar sus datos')
+    return parser.parse_args(argv)
+
+
 # Se crea el controlador asociado a la vista
 control = newController()
 
@@ -83,6 +386,14 @@ control = newController()
 # main del ejercicio
 if __name__ == "__main__":
 
+    args = parseArgs(sys.argv[1:])
+    if args.trusted:
+        control = newController(trusted=True)
+    if args.batch:
+        runBatch(control, args.batch, args.output, args.instrument,
+                 args.footprint)
+        sys.exit(0)
+
     """
     Menu principal
     """
@@ -99,6 +410,9 @@ if __name__ == "__main__":
             print('Géneros cargados: ' + str(tg))
             print('Asociación de Géneros a Libros cargados: ' +
                   str(bktg))
+            printLoadStats(control)
+            if args.footprint:
+                printFootprint(control)
 
         elif int(inputs[0]) == 2:
             number = input("Buscando los TOP ?: ")
@@ -115,6 +429,56 @@ if __name__ == "__main__":
             book_count = controller.countBooksByTag(control, label)
             print('Se encontraron: ', book_count, ' Libros')
 
+        elif int(inputs[0]) == 5:
+            number = input("Buscando los TOP ?: ")
+            min_books = input("Mínimo de libros por autor: ")
+            authors = controller.getBestAuthors(control, int(number),
+                                                int(min_books))
+            printBestAuthors(authors)
+
+        elif int(inputs[0]) == 6:
+            prefix = input("Comienzo del nombre del autor: ")
+            authors = controller.getAuthorsByPrefix(control, prefix)
+            for author in authors:
+                print('Autor: ' + author['name'] + '  Libros: ' +
+                      str(author['rating_count']))
+
+        elif int(inputs[0]) == 7:
+            words = input("Palabras del título: ")
+            mode = input("¿Todas las palabras (and) o alguna (or)?: ")
+            number = input("Número de libros: ")
+            books = controller.searchBooksByTitle(control, words,
+                                                  mode.strip() or 'and',
+                                                  number=int(number))
+            printBestBooks(books)
+
+        elif int(inputs[0]) == 8:
+            year_from = input("Desde el año (vacío para no filtrar): ")
+            year_to = input("Hasta el año (vacío para no filtrar): ")
+            language = input("Idioma, p.ej. eng (vacío para no filtrar): ")
+            number = input("Número de libros: ")
+            books = controller.filterBooks(
+                control,
+                int(year_from) if year_from.strip() else None,
+                int(year_to) if year_to.strip() else None,
+                language.strip() or None,
+                int(number))
+            for book in books:
+                print('Titulo: ' + book['title'] + '  Año: ' +
+                      book['original_publication_year'] + '  Idioma: ' +
+                      book['language_code'])
+
+        elif int(inputs[0]) == 9:
+            number = input("Buscando los TOP ?: ")
+            books = controller.getBestBooks(control, int(number),
+                                            'weighted_rating')
+            for book in books:
+                print('Titulo: ' + book['title'] + '  Rating: ' +
+                      str(book['average_rating']) + '  Calificaciones: ' +
+                      str(book['ratings_count']) + '  Ponderado: ' +
+                      '{:.3f}'.format(
+                          controller.getWeightedRating(control, book)))
+
         elif int(inputs[0]) == 0:
             working = False
             print("\nGracias por utilizar el programa.")